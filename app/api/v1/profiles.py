@@ -0,0 +1,65 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import Response
+
+from app.core.auth import verify_token
+from app.core.profiling import profiler
+
+router = APIRouter()
+
+
+@router.get(
+    '/admin/profiles',
+    tags=['Admin'],
+    summary='Request profiles captured by this API process',
+    description="""
+        Lists the cProfile captures kept in this process's ring buffer, newest
+        first. Profile a request by sending it with an `X-Profile: 1` header (or
+        `?profile=1`); its capture ID is returned in the `X-Profile-Id` header.
+        """,
+)
+async def list_profiles(_: str = Depends(verify_token)) -> list[dict]:
+    """
+    List the stored request profiles.
+
+    Returns:
+        list[dict]: ID, capture time, method, path, status, duration, trigger and
+        call count of each capture.
+    """
+    return profiler.list()
+
+
+@router.get(
+    '/admin/profiles/{profile_id}',
+    tags=['Admin'],
+    summary='One request profile',
+    description="""
+        Returns the capture with its report of the functions with the highest
+        cumulative time, or the raw stats (`format=pstats`) for pstats or snakeviz.
+        """,
+)
+async def get_profile(
+    profile_id: str,
+    format: str = Query('json', pattern='^(json|pstats)$'),
+    _: str = Depends(verify_token),
+):
+    """
+    Return a stored request profile.
+
+    Args:
+        profile_id (str): The capture ID.
+        format (str): `json` for the summary and text report, `pstats` for the raw
+            stats file.
+
+    Raises:
+        HTTPException: 404 if the capture is unknown or has left the buffer.
+    """
+    capture = profiler.get(profile_id)
+    if capture is None:
+        raise HTTPException(status_code=404, detail='Profile not found')
+    if format == 'pstats':
+        return Response(
+            capture['pstats'],
+            media_type='application/octet-stream',
+            headers={'Content-Disposition': f'attachment; filename="{profile_id}.prof"'},
+        )
+    return {key: value for key, value in capture.items() if key != 'pstats'}
@@ -0,0 +1,42 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+
+from app.cache.singleton import sentiment_history
+from app.core.auth import verify_token
+
+router = APIRouter()
+
+
+@router.get(
+    '/sentiment/{netuid}',
+    tags=['Sentiment'],
+    summary='Smoothed sentiment signal and recent scores of a subnet',
+    description="""
+        Returns the exponential moving average and volatility of the subnet's
+        sentiment scores, maintained incrementally as scores are computed, and the
+        latest scores (newest first).
+        """,
+)
+async def get_sentiment(
+    netuid: int,
+    limit: int = Query(50, ge=0, le=1000, description='Number of recent scores'),
+    _: str = Depends(verify_token),
+) -> dict:
+    """
+    Return the sentiment signal of a subnet.
+
+    Args:
+        netuid (int): The subnet ID.
+        limit (int): Number of recent scores to include.
+
+    Returns:
+        dict: The `signal` (EMA, volatility, last score, count, update time) and the
+        recent `history`.
+
+    Raises:
+        HTTPException: 404 if no score has been recorded for the subnet.
+    """
+    signal = await sentiment_history.signal(netuid)
+    if signal is None:
+        raise HTTPException(status_code=404, detail='No sentiment recorded for this netuid')
+    history = await sentiment_history.history(netuid, limit) if limit else []
+    return {'netuid': netuid, 'signal': signal, 'history': history}
@@ -0,0 +1,91 @@
+from datetime import datetime
+from typing import Annotated, Literal, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.auth import verify_token
+from app.db.session import get_session
+from app.services.stake_history_service import StakeHistoryService
+from app.services.stake_stats_service import StakeStatsService
+
+router = APIRouter()
+
+
+@router.get(
+    '/stake_actions',
+    tags=['Stake Actions'],
+    summary='History of stake and unstake operations',
+    description="""
+        Lists recorded stake actions, newest first, filtered by subnet, hotkey,
+        status, type and time range. Pass the returned `next_cursor` as `cursor` to
+        get the next page.
+        """,
+)
+async def get_stake_actions(
+    session: Annotated[AsyncSession, Depends(get_session)],
+    netuid: Optional[int] = Query(None, description='The subnet ID'),
+    hotkey: Optional[str] = Query(None, description='The wallet hotkey address'),
+    status: Optional[str] = Query(
+        None, description='Action status (`success`, `failed`, `pending`, `netted`)'
+    ),
+    stake_type: Optional[Literal['stake', 'unstake']] = Query(None, description='Action type'),
+    since: Annotated[
+        Optional[datetime], Query(description='Only actions at or after (UTC)')
+    ] = None,
+    until: Annotated[Optional[datetime], Query(description='Only actions before (UTC)')] = None,
+    cursor: Optional[str] = Query(None, description='`next_cursor` of the previous page'),
+    limit: int = Query(100, ge=1, le=500, description='Page size'),
+    _: str = Depends(verify_token),
+) -> dict:
+    """
+    List stake actions with keyset pagination.
+
+    Returns:
+        dict: The page of `items` and the `next_cursor` (null on the last page).
+    """
+    try:
+        actions, next_cursor = await StakeHistoryService.list_actions(
+            session,
+            netuid=netuid,
+            hotkey=hotkey,
+            status=status,
+            stake_type=stake_type,
+            since=since,
+            until=until,
+            cursor=cursor,
+            limit=limit,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e)) from e
+    return {
+        'items': [action.model_dump() for action in actions],
+        'next_cursor': next_cursor,
+    }
+
+
+@router.get(
+    '/stake_actions/stats',
+    tags=['Stake Actions'],
+    summary='Stake action totals per subnet and status',
+    description="""
+        Returns the number of actions, staked and unstaked TAO and average
+        sentiment per subnet and status, read from the hourly rollups (refreshed
+        every `STAKE_ROLLUP_INTERVAL` seconds) rather than from the raw rows.
+        """,
+)
+async def get_stake_action_stats(
+    session: Annotated[AsyncSession, Depends(get_session)],
+    netuid: Optional[int] = Query(None, description='The subnet ID'),
+    since: Annotated[Optional[datetime], Query(description='First hour included (UTC)')] = None,
+    until: Annotated[Optional[datetime], Query(description='Only hours before (UTC)')] = None,
+    _: str = Depends(verify_token),
+) -> dict:
+    """
+    Aggregate the hourly stake action rollups.
+
+    Returns:
+        dict: Totals per netuid and status under `results`.
+    """
+    results = await StakeStatsService.stats(session, netuid=netuid, since=since, until=until)
+    return {'results': results}
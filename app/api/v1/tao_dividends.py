@@ -1,13 +1,22 @@
-from typing import Optional
+import uuid
+from typing import Literal, Optional
 
 from bittensor.utils import is_valid_ss58_address
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from httpx import TimeoutException
 
-from app.cache.singleton import redis_cache
+from app.cache.singleton import (
+    dividend_snapshot,
+    netuid_demand,
+    redis_cache,
+    trade_backpressure,
+    trade_dedup,
+)
 from app.core.auth import verify_token
+from app.core.config import settings
+from app.core.metrics import tao_dividends_duration
 from app.services.singleton import substrate_service
-from app.tasks import analyze_and_stake
+from app.tasks import analyze_and_stake, trade_pipeline
 
 router = APIRouter()
 
@@ -21,6 +30,45 @@ def validate_hotkey(hotkey: str) -> str:
     return hotkey
 
 
+# Lookups in the cached `dividends:all` results (one entry per netuid, each with
+# its hotkeys), shared by the response paths below and by the microbenchmarks.
+
+
+def netuid_hotkeys(results: list, netuid: int) -> list:
+    """
+    Return the hotkeys and dividends of one netuid.
+    """
+    for entry in results:
+        if entry['netuid'] == netuid:
+            return entry['hotkeys']
+    return []
+
+
+def hotkey_dividends(results: list, hotkey: str) -> list:
+    """
+    Return the dividend of a hotkey on every netuid it is registered on.
+    """
+    return [
+        {'netuid': netuid_entry['netuid'], 'dividend': hotkey_entry['dividends']}
+        for netuid_entry in results
+        for hotkey_entry in netuid_entry['hotkeys']
+        if hotkey_entry['hotkey'] == hotkey
+    ]
+
+
+def pair_dividend(results: list, netuid: int, hotkey: str) -> float:
+    """
+    Return the dividend of a hotkey on one netuid.
+
+    Raises:
+        HTTPException: 500 if the pair is not in the results.
+    """
+    for hotkey_entry in netuid_hotkeys(results, netuid):
+        if hotkey_entry['hotkey'] == hotkey:
+            return hotkey_entry['dividends']
+    raise HTTPException(status_code=500, detail='Unable to fetch dividend')
+
+
 @router.get(
     '/tao_dividends',
     tags=['TAO Dividends'],
@@ -40,6 +88,10 @@ async def get_tao_dividends(
         max_length=48,
     ),
     trade: bool = False,
+    engine: Optional[Literal['llm', 'lexicon', 'auto']] = Query(
+        None,
+        description='Sentiment engine used when `trade=true` (defaults to the configured one)',
+    ),
     _: str = Depends(verify_token),
 ):
     async def _get_cache_all() -> list | None:
@@ -75,9 +127,17 @@ async def get_tao_dividends(
         key = f'dividends:{netuid}:netuid:{hotkey}:hotkey'
         await redis_cache.set(key, {'results': results})
 
-    # Responses
+    # Responses. With DIVIDEND_SNAPSHOT on, lookups are answered from the shared
+    # memory-mapped snapshot first and fall back to Redis when it is missing or stale.
 
-    async def _response_all() -> dict:
+    async def _response_all() -> dict | Response:
+        if settings.dividend_snapshot:
+            blob = dividend_snapshot.all_json()
+            if blob is not None:
+                # Already-serialized results, copied straight into the response body.
+                return Response(
+                    b'{"results":' + blob + b',"cached":true}', media_type='application/json'
+                )
         cached = await _get_cache_all()
         if cached:
             return {'results': cached, 'cached': True}
@@ -86,12 +146,10 @@ async def get_tao_dividends(
         return {'results': results, 'cached': False}
 
     async def _response_netuid(netuid: int) -> dict:
-        def process_all_data(cached: list) -> list:
-            for entry in cached:
-                if entry['netuid'] == netuid:
-                    return entry['hotkeys']
-            return []
-
+        if settings.dividend_snapshot:
+            hotkeys = dividend_snapshot.netuid(netuid)
+            if hotkeys is not None:
+                return {'netuid': netuid, 'hotkeys': hotkeys, 'cached': True}
         cached = await _get_cache_netuid(netuid)
         if cached:
             return {
@@ -103,7 +161,7 @@ async def get_tao_dividends(
         if cached:
             return {
                 'netuid': netuid,
-                'hotkeys': process_all_data(cached),
+                'hotkeys': netuid_hotkeys(cached, netuid),
                 'cached': True,
             }
         results = await substrate_service.get_dividends_for_netuid(netuid)
@@ -117,45 +175,30 @@ async def get_tao_dividends(
         }
 
     async def _response_hotkey(hotkey: str) -> dict:
-        def process_all_data(cached: list) -> list:
-            results = []
-            netuid: int = 0
-            hotkeys: list = []
-            for netuid_entry in cached:
-                netuid = netuid_entry['netuid']
-                hotkeys = netuid_entry['hotkeys']
-                for hotkey_entry in hotkeys:
-                    if hotkey_entry['hotkey'] == hotkey:
-                        results.append({
-                            'netuid': netuid,
-                            'dividend': hotkey_entry['dividends'],
-                        })
-            return results
-
+        if settings.dividend_snapshot:
+            netuids = dividend_snapshot.hotkey(hotkey)
+            if netuids is not None:
+                return {'hotkey': hotkey, 'netuids': netuids, 'cached': True}
         cached = await _get_cache_all()
         if cached is not None:
             return {
                 'hotkey': hotkey,
-                'netuids': process_all_data(cached),
+                'netuids': hotkey_dividends(cached, hotkey),
                 'cached': True,
             }
         results = await substrate_service.get_all_dividends()
         await _set_cache_all(results)
         return {
             'hotkey': hotkey,
-            'netuids': process_all_data(results),
+            'netuids': hotkey_dividends(results, hotkey),
             'cached': False,
         }
 
     async def _response_netuid_hotkey(netuid: int, hotkey: str) -> dict:
-        def process_all_data(cached: list) -> float:
-            for netuid_entry in cached:
-                if hasattr(netuid_entry, 'netuid') and netuid_entry['netuid'] == netuid:
-                    for hotkey_entry in netuid_entry['hotkeys']:
-                        if hasattr(hotkey_entry, 'hotkey') and hotkey_entry['hotkey'] == hotkey:
-                            return hotkey_entry['dividends']
-            raise HTTPException(status_code=500, detail='Unable to fetch dividend')
-
+        if settings.dividend_snapshot:
+            dividend = dividend_snapshot.pair(netuid, hotkey)
+            if dividend is not None:
+                return {'netuid': netuid, 'hotkey': hotkey, 'dividend': dividend, 'cached': True}
         cached = await _get_cache_netuid_hotkey(netuid, hotkey)
         if cached is not None:
             return {
@@ -169,7 +212,7 @@ async def get_tao_dividends(
             return {
                 'netuid': netuid,
                 'hotkey': hotkey,
-                'dividend': process_all_data(cached),
+                'dividend': pair_dividend(cached, netuid, hotkey),
                 'cached': True,
             }
         results = await substrate_service.get_dividends_for_netuid_hotkey(netuid, hotkey)
@@ -191,27 +234,69 @@ async def get_tao_dividends(
         netuid (int): The subnet ID. Default is 18.
         hotkey (str): The wallet hotkey address.
         trade (bool): Whether to trigger a stake/unstake operation based on sentiment.
+        engine (str | None): Sentiment engine to use for the trade.
 
     Returns:
-        dict: Dividend data, cache status, and trade trigger status.
+        dict: Dividend data, cache status, and trade trigger status. Trade requests
+        also return the `task_id` of the analysis and whether it was `deduplicated`
+        onto a task enqueued by an earlier request. New trades are rejected with 429
+        and `Retry-After` while the trade queues are over their limits.
     """
 
+    if netuid is not None:
+        await netuid_demand.record(netuid)
+
     if netuid is not None and hotkey is not None:
-        stake_tx_triggered = False
-        if trade:
-            try:
-                analyze_and_stake.delay(netuid, hotkey)
+        mode = 'pair'
+    elif netuid is not None:
+        mode = 'netuid'
+    elif hotkey is not None:
+        mode = 'hotkey'
+    else:
+        mode = 'all'
+
+    with tao_dividends_duration.time(mode=mode, trade=str(trade).lower()):
+        if netuid is not None and hotkey is not None:
+            stake_tx_triggered = False
+            trade_info: dict = {}
+            if trade:
+                task_id, deduplicated = await trade_dedup.claim(
+                    netuid, hotkey, str(uuid.uuid4()), engine
+                )
+                if not deduplicated:
+                    retry_after = await trade_backpressure.retry_after()
+                    if retry_after is not None:
+                        await trade_dedup.release(netuid, hotkey, task_id, engine)
+                        raise HTTPException(
+                            status_code=429,
+                            detail='Trade queue is full, retry later',
+                            headers={'Retry-After': str(retry_after)},
+                        )
+                    try:
+                        if settings.trade_pipeline == 'staged':
+                            trade_pipeline(netuid, hotkey, engine).apply_async(task_id=task_id)
+                        else:
+                            analyze_and_stake.apply_async(
+                                args=(netuid, hotkey, engine), task_id=task_id
+                            )
+                    except TimeoutException as e:
+                        await trade_dedup.release(netuid, hotkey, task_id, engine)
+                        raise HTTPException(
+                            status_code=500, detail='Sentiment analysis timed out'
+                        ) from e
+                    except Exception:
+                        await trade_dedup.release(netuid, hotkey, task_id, engine)
+                        raise
                 stake_tx_triggered = True
-            except TimeoutException as e:
-                raise HTTPException(status_code=500, detail='Sentiment analysis timed out') from e
+                trade_info = {'task_id': task_id, 'deduplicated': deduplicated}
 
-        response = await _response_netuid_hotkey(netuid, hotkey)
-        return {**response, 'stake_tx_triggered': stake_tx_triggered}
+            response = await _response_netuid_hotkey(netuid, hotkey)
+            return {**response, 'stake_tx_triggered': stake_tx_triggered, **trade_info}
 
-    if netuid is not None:
-        return await _response_netuid(netuid)
+        if netuid is not None:
+            return await _response_netuid(netuid)
 
-    if hotkey is not None:
-        return await _response_hotkey(hotkey)
+        if hotkey is not None:
+            return await _response_hotkey(hotkey)
 
-    return await _response_all()
+        return await _response_all()
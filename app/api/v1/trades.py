@@ -0,0 +1,94 @@
+from typing import AsyncIterator
+
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
+
+from app.cache.singleton import redis_cache, task_results
+from app.core.auth import verify_token
+from app.core.config import settings
+
+router = APIRouter()
+
+SSE_KEEPALIVE = 15
+
+
+def ensure_result_backend() -> None:
+    """
+    Fails with 503 when the Redis result backend is not connected.
+    """
+    if getattr(redis_cache, 'redis', None) is None:
+        raise HTTPException(status_code=503, detail='Result backend unavailable')
+
+
+@router.get(
+    '/trades/{task_id}',
+    tags=['Trades'],
+    summary='Status and result of a trade task',
+    description="""
+        Returns the state of the task enqueued by a `trade=true` request and, once
+        it succeeded, its result: the stake action it led to (type, TAO amount,
+        status, error and extrinsic hash). With `wait`, the request is held until
+        the task finishes or `wait` seconds pass.
+        """,
+)
+async def get_trade(
+    task_id: str,
+    wait: int = Query(
+        0,
+        ge=0,
+        le=settings.trade_status_max_wait,
+        description='Seconds to wait for the task to finish before answering',
+    ),
+    _: str = Depends(verify_token),
+) -> dict:
+    """
+    Return the status of a trade task, optionally long-polling for its result.
+
+    Args:
+        task_id (str): The `task_id` returned by `/tao_dividends?trade=true`.
+        wait (int): Maximum number of seconds to wait for a final state.
+
+    Returns:
+        dict: Task ID, state (`PENDING`, `STARTED`, `SUCCESS`, `FAILURE`, ...),
+        whether it is final, result, error and completion time.
+    """
+    ensure_result_backend()
+    return await task_results.wait(task_id, wait)
+
+
+@router.get(
+    '/trades/{task_id}/events',
+    tags=['Trades'],
+    summary='Stream the status of a trade task (Server-Sent Events)',
+    description="""
+        Streams a `status` event with the current state of the task and one per
+        change until it finishes, then closes the stream.
+        """,
+)
+async def stream_trade(task_id: str, _: str = Depends(verify_token)) -> StreamingResponse:
+    """
+    Stream the status of a trade task as Server-Sent Events.
+
+    Args:
+        task_id (str): The `task_id` returned by `/tao_dividends?trade=true`.
+
+    Returns:
+        StreamingResponse: A `text/event-stream` of `status` events.
+    """
+    ensure_result_backend()
+
+    async def events() -> AsyncIterator[bytes]:
+        async for status in task_results.updates(
+            task_id, settings.trade_events_timeout, idle=SSE_KEEPALIVE
+        ):
+            if status is None:
+                yield b': keep-alive\n\n'
+            else:
+                yield b'event: status\ndata: ' + orjson.dumps(status) + b'\n\n'
+
+    return StreamingResponse(
+        events(),
+        media_type='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'},
+    )
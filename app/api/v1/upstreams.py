@@ -0,0 +1,41 @@
+from fastapi import APIRouter, Depends
+
+from app.cache.singleton import (
+    chutes_breaker,
+    chutes_limiter,
+    datura_breaker,
+    datura_limiter,
+    substrate_breaker,
+)
+from app.core.auth import verify_token
+
+router = APIRouter()
+
+
+@router.get(
+    '/upstreams',
+    tags=['Upstreams'],
+    summary='Outbound rate limit and circuit breaker status',
+    description="""
+        Returns the shared remaining request budget for each upstream API, the
+        permit wait times observed by this process and the state of each circuit.
+        """,
+)
+async def get_upstreams(_: str = Depends(verify_token)) -> dict:
+    """
+    Report the state of the outbound rate limiters and circuit breakers.
+
+    Returns:
+        dict: Rate limiter and circuit status keyed by upstream name.
+    """
+    return {
+        'rate_limits': {
+            'datura': await datura_limiter.status(),
+            'chutes': await chutes_limiter.status(),
+        },
+        'circuits': {
+            'datura': await datura_breaker.status(),
+            'chutes': await chutes_breaker.status(),
+            'substrate': await substrate_breaker.status(),
+        },
+    }
@@ -0,0 +1,113 @@
+import asyncio
+import logging
+import time
+
+from app.cache.redis import RedisCache
+
+logger = logging.getLogger(__name__)
+
+# Tasks in flight per worker process (`{host}:{pid}`), and when each process last
+# reported; processes silent for IN_FLIGHT_TTL seconds are considered dead.
+IN_FLIGHT_KEY = 'worker:in_flight'
+IN_FLIGHT_SEEN_KEY = 'worker:in_flight:seen'
+IN_FLIGHT_TTL = 300
+IN_FLIGHT_HEARTBEAT = 60
+
+
+class TradeBackpressure:
+    """
+    Sheds new trade triggers while the workers are behind.
+
+    Samples the depth of the broker queues trade tasks are sent to (the Redis
+    lists Celery uses as queues) and the number of tasks in flight reported by
+    each worker process in the `worker:in_flight` hash. Processes whose
+    heartbeat is older than `IN_FLIGHT_TTL` are dropped. A sample is reused
+    for `sample_interval` seconds, so the check costs no Redis round-trip on
+    most requests. Fails open: without Redis, or when sampling fails, nothing
+    is shed.
+    """
+
+    def __init__(
+        self,
+        cache: RedisCache,
+        queues: list[str],
+        max_queue_depth: int,
+        max_in_flight: int,
+        sample_interval: float,
+        retry_after: int,
+    ):
+        self.cache = cache
+        self.queues = queues
+        self.max_queue_depth = max_queue_depth
+        self.max_in_flight = max_in_flight
+        self.sample_interval = sample_interval
+        self.retry_after_seconds = retry_after
+        self._sample: dict | None = None
+        self._sampled_at = 0.0
+        self._refresh: asyncio.Task | None = None
+
+    async def sample(self) -> dict:
+        """
+        Read the current queue depths and in-flight count from Redis.
+
+        Returns:
+            dict: Depth per queue and total tasks in flight.
+        """
+        redis = self.cache.redis
+        async with redis.pipeline(transaction=False) as pipe:
+            for queue in self.queues:
+                pipe.llen(queue)
+            pipe.hgetall(IN_FLIGHT_KEY)
+            pipe.hgetall(IN_FLIGHT_SEEN_KEY)
+            *depths, counts, seen = await pipe.execute()
+
+        cutoff = time.time() - IN_FLIGHT_TTL
+        dead = [worker for worker in counts if float(seen.get(worker, 0)) < cutoff]
+        if dead:
+            async with redis.pipeline(transaction=False) as pipe:
+                pipe.hdel(IN_FLIGHT_KEY, *dead)
+                pipe.hdel(IN_FLIGHT_SEEN_KEY, *dead)
+                await pipe.execute()
+        return {
+            'queue_depth': dict(zip(self.queues, depths, strict=True)),
+            'in_flight': sum(int(count) for worker, count in counts.items() if worker not in dead),
+        }
+
+    async def _take_sample(self) -> dict | None:
+        try:
+            self._sample = await self.sample()
+        except Exception as e:
+            logger.warning('Could not sample trade queue load: %s', e)
+            self._sample = None
+        self._sampled_at = time.monotonic()
+        return self._sample
+
+    async def status(self) -> dict | None:
+        """
+        Return the latest load sample, taking a new one once it is stale.
+        """
+        if getattr(self.cache, 'redis', None) is None:
+            return None
+        if time.monotonic() - self._sampled_at < self.sample_interval:
+            return self._sample
+        if self._refresh is None or self._refresh.done():
+            self._refresh = asyncio.ensure_future(self._take_sample())
+        return await asyncio.shield(self._refresh)
+
+    async def retry_after(self) -> int | None:
+        """
+        Whether a new trade should be rejected.
+
+        Returns:
+            int | None: Seconds the client should wait before retrying, or None if
+            the trade can be enqueued.
+        """
+        load = await self.status()
+        if load is None:
+            return None
+        depth = sum(load['queue_depth'].values())
+        if self.max_queue_depth > 0 and depth >= self.max_queue_depth:
+            return self.retry_after_seconds
+        if self.max_in_flight > 0 and load['in_flight'] >= self.max_in_flight:
+            return self.retry_after_seconds
+        return None
@@ -0,0 +1,218 @@
+import logging
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Callable
+
+from httpx import HTTPStatusError, RequestError
+
+from app.cache.redis import RedisCache
+from app.core.config import settings
+from app.core.metrics import upstream_duration, upstream_errors
+from app.core.tracing import tracer
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitOpenError(Exception):
+    """
+    Raised when a call is rejected because its upstream is known to be down.
+    """
+
+
+def is_http_outage(exc: BaseException) -> bool:
+    """
+    Whether an HTTP exception means the upstream is unhealthy (network errors and
+    5xx answers), as opposed to a client-side problem or throttling.
+    """
+    if isinstance(exc, HTTPStatusError):
+        return exc.response.status_code >= 500
+    return isinstance(exc, RequestError)
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker whose state is shared by every process through Redis.
+
+    States:
+    - `closed`: calls go through; consecutive failures are counted.
+    - `open`: calls fail fast with `CircuitOpenError` until the recovery timeout elapses.
+    - `half_open`: a single probe call is let through; its outcome closes or re-opens
+      the circuit.
+
+    When Redis is not reachable the breaker fails open and every call goes through.
+    """
+
+    ALLOW_SCRIPT = """
+    local key = KEYS[1]
+    local probe_key = KEYS[2]
+    local recovery = tonumber(ARGV[1])
+    local state = redis.call('HGET', key, 'state') or 'closed'
+    if state == 'closed' then
+        return {1, '0'}
+    end
+    local t = redis.call('TIME')
+    local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+    local opened_at = tonumber(redis.call('HGET', key, 'opened_at')) or 0
+    local remaining = opened_at + recovery - now
+    if state == 'open' and remaining > 0 then
+        return {0, tostring(remaining)}
+    end
+    if redis.call('SET', probe_key, 1, 'NX', 'EX', math.ceil(recovery)) then
+        redis.call('HSET', key, 'state', 'half_open')
+        return {2, '0'}
+    end
+    return {0, tostring(recovery)}
+    """
+
+    FAILURE_SCRIPT = """
+    local key = KEYS[1]
+    local probe_key = KEYS[2]
+    local threshold = tonumber(ARGV[1])
+    local failures = redis.call('HINCRBY', key, 'failures', 1)
+    local state = redis.call('HGET', key, 'state') or 'closed'
+    if state == 'half_open' or failures >= threshold then
+        local t = redis.call('TIME')
+        redis.call('HSET', key, 'state', 'open', 'opened_at', tonumber(t[1]) + tonumber(t[2]) / 1000000)
+        redis.call('DEL', probe_key)
+        return 1
+    end
+    return 0
+    """
+
+    SUCCESS_SCRIPT = """
+    local key = KEYS[1]
+    local probe_key = KEYS[2]
+    local state = redis.call('HGET', key, 'state') or 'closed'
+    local failures = tonumber(redis.call('HGET', key, 'failures')) or 0
+    if state ~= 'closed' or failures > 0 then
+        redis.call('HSET', key, 'state', 'closed', 'failures', 0)
+        redis.call('DEL', probe_key)
+    end
+    return 0
+    """
+
+    RELEASE_PROBE_SCRIPT = """
+    if redis.call('HGET', KEYS[1], 'state') == 'half_open' then
+        redis.call('DEL', KEYS[2])
+    end
+    return 0
+    """
+
+    def __init__(
+        self,
+        cache: RedisCache,
+        name: str,
+        failure_threshold: int = settings.circuit_failure_threshold,
+        recovery_timeout: float = settings.circuit_recovery_timeout,
+    ):
+        self.cache = cache
+        self.name = name
+        self.key = f'circuit:{name}'
+        self.probe_key = f'circuit:{name}:probe'
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+
+    def _available(self) -> bool:
+        return getattr(self.cache, 'redis', None) is not None
+
+    async def _eval(self, script: str, *args) -> list | int | None:
+        if not self._available():
+            return None
+        try:
+            return await self.cache.redis.eval(script, 2, self.key, self.probe_key, *args)
+        except Exception as e:
+            logger.warning('Circuit breaker %s unavailable: %s', self.name, e)
+            return None
+
+    async def before_call(self) -> bool:
+        """
+        Check whether a call may go through. The caller must then report the outcome
+        with `record_success`/`record_failure` (or `release_probe`), which `protect`
+        does.
+
+        Returns:
+            bool: True if the call is the single half-open probe.
+
+        Raises:
+            CircuitOpenError: If the circuit is open or another process is probing.
+        """
+        result = await self._eval(self.ALLOW_SCRIPT, self.recovery_timeout)
+        if result is None:
+            return False
+        allowed, retry_in = result
+        if not int(allowed):
+            raise CircuitOpenError(f'{self.name} circuit is open (retry in {float(retry_in):.1f}s)')
+        return int(allowed) == 2
+
+    async def record_success(self) -> None:
+        await self._eval(self.SUCCESS_SCRIPT)
+
+    async def release_probe(self) -> None:
+        """
+        Give the half-open probe slot back without deciding the circuit state.
+        """
+        await self._eval(self.RELEASE_PROBE_SCRIPT)
+
+    async def record_failure(self) -> None:
+        opened = await self._eval(self.FAILURE_SCRIPT, self.failure_threshold)
+        if opened:
+            logger.warning('%s circuit opened', self.name)
+
+    @asynccontextmanager
+    async def protect(
+        self, is_failure: Callable[[BaseException], bool] = lambda _: True
+    ) -> AsyncIterator[None]:
+        """
+        Guard a block of code calling the upstream, recording its latency and
+        errors in the upstream metrics and as an `upstream {name}` span.
+
+        Args:
+            is_failure (Callable): Decides whether an exception raised by the block
+                counts as an upstream failure. Other exceptions (client errors,
+                throttling) are re-raised without recording an outcome, so they
+                neither open nor close the circuit.
+
+        Raises:
+            CircuitOpenError: If the circuit is open.
+        """
+        probe = await self.before_call()
+        start = time.perf_counter()
+        try:
+            with tracer.span(f'upstream {self.name}', upstream=self.name):
+                yield
+        except Exception as e:
+            upstream_duration.observe(
+                time.perf_counter() - start, upstream=self.name, outcome='error'
+            )
+            upstream_errors.inc(upstream=self.name, error=type(e).__name__)
+            if is_failure(e):
+                await self.record_failure()
+            elif probe:
+                await self.release_probe()
+            raise
+        upstream_duration.observe(time.perf_counter() - start, upstream=self.name, outcome='ok')
+        await self.record_success()
+
+    async def status(self) -> dict:
+        """
+        Report the shared state of the circuit.
+
+        Returns:
+            dict: State, consecutive failures and the configured thresholds.
+        """
+        state, failures = 'closed', 0
+        if self._available():
+            try:
+                raw_state, raw_failures = await self.cache.redis.hmget(
+                    self.key, ['state', 'failures']
+                )
+                state = raw_state or 'closed'
+                failures = int(raw_failures or 0)
+            except Exception as e:
+                logger.warning('Circuit breaker %s unavailable: %s', self.name, e)
+        return {
+            'state': state,
+            'failures': failures,
+            'failure_threshold': self.failure_threshold,
+            'recovery_timeout': self.recovery_timeout,
+        }
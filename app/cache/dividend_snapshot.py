@@ -0,0 +1,371 @@
+import bisect
+import logging
+import mmap
+import os
+import struct
+import time
+from typing import Any, Callable, Optional, TypeVar
+
+import orjson
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar('T')
+
+"""
+Memory-mapped snapshot of the all-dividends map, shared by every API process.
+
+File layout (little-endian):
+
+    header (64 bytes)   magic, generation, writing, slot capacity, retired flag
+    slot 0, slot 1      `capacity` bytes each; generation `g` lives in slot g % 2
+
+    slot                created_at f64, netuid count u32, entry count u32,
+                        JSON offset u64, JSON length u64
+                        netuid table: (netuid u32, first entry u32, entry count u32)
+                        entries: (hotkey 48s, dividend f64, netuid u32, pad) in
+                            chain order, grouped by netuid
+                        hotkey index: entry numbers u32 sorted by (hotkey, netuid)
+                        the `results` list as JSON, for whole-map responses
+
+One refresher process writes; API processes map the file read-only and answer
+lookups straight from the shared pages. Swaps are lock-free: the writer announces
+the generation it is writing (`writing`), fills the inactive slot and then
+publishes it (`generation`). A reader that finds `writing` two generations ahead
+after its read knows its slot was overwritten meanwhile and retries. When a
+snapshot outgrows the slots the writer builds a larger file, renames it over the
+old one and flags the old one as retired so readers remap. Readers also remap
+when the file at `path` is no longer the one they mapped (deleted and recreated
+by a fresh refresher), checked at most every `STAT_INTERVAL` seconds.
+"""
+
+MAGIC = b'TAODIVS1'
+HEADER = struct.Struct('<8sQQQI')
+HEADER_SIZE = 64
+GENERATION_AT = 8
+WRITING_AT = 16
+RETIRED_AT = 32
+SLOT = struct.Struct('<dIIQQ')
+NETUID = struct.Struct('<III')
+ENTRY = struct.Struct('<48sdI4x')
+INDEX = struct.Struct('<I')
+U64 = struct.Struct('<Q')
+U32 = struct.Struct('<I')
+HOTKEY_SIZE = 48
+READ_ATTEMPTS = 5
+STAT_INTERVAL = 1.0
+
+
+def _align(offset: int) -> int:
+    return (offset + 7) & ~7
+
+
+def encode(results: list[dict], created_at: float) -> bytes:
+    """
+    Encode `get_all_dividends` results (netuid entries with their hotkeys) as a slot.
+
+    Raises:
+        ValueError: If a hotkey does not fit the fixed-size field.
+    """
+    netuids = []
+    entries = []
+    for netuid_entry in results:
+        start = len(entries)
+        for hotkey_entry in netuid_entry['hotkeys']:
+            hotkey = hotkey_entry['hotkey'].encode()
+            if len(hotkey) > HOTKEY_SIZE:
+                raise ValueError(f'Hotkey too long for the snapshot: {hotkey_entry["hotkey"]}')
+            entries.append((hotkey, float(hotkey_entry['dividends']), netuid_entry['netuid']))
+        netuids.append((netuid_entry['netuid'], start, len(entries) - start))
+    index = sorted(
+        range(len(entries)), key=lambda i: (entries[i][0].ljust(HOTKEY_SIZE, b'\0'), entries[i][2])
+    )
+    blob = orjson.dumps(results)
+
+    netuids_at = SLOT.size
+    entries_at = _align(netuids_at + len(netuids) * NETUID.size)
+    index_at = entries_at + len(entries) * ENTRY.size
+    json_at = index_at + len(entries) * INDEX.size
+    slot = bytearray(json_at + len(blob))
+    SLOT.pack_into(slot, 0, created_at, len(netuids), len(entries), json_at, len(blob))
+    for i, row in enumerate(netuids):
+        NETUID.pack_into(slot, netuids_at + i * NETUID.size, *row)
+    for i, row in enumerate(entries):
+        ENTRY.pack_into(slot, entries_at + i * ENTRY.size, *row)
+    for i, entry in enumerate(index):
+        INDEX.pack_into(slot, index_at + i * INDEX.size, entry)
+    slot[json_at:] = blob
+    return bytes(slot)
+
+
+class DividendSnapshot:
+    """
+    Reader and writer of the shared dividends snapshot at `path`.
+
+    Lookups return None when there is no usable snapshot (no file yet, older than
+    `max_age` seconds, or a swap raced every attempt), so callers fall back to
+    the Redis cache and the chain.
+    """
+
+    def __init__(self, path: str, max_age: float = 0.0, capacity: int = 4 * 1024 * 1024):
+        self.path = path
+        self.max_age = max_age
+        self.capacity = capacity
+        self._map: Optional[mmap.mmap] = None
+        # (st_dev, st_ino) of the mapped file and when `path` was last compared to it.
+        self._identity: Optional[tuple[int, int]] = None
+        self._checked_at = 0.0
+        self._writer: Optional[mmap.mmap] = None
+        self._netuids: tuple[int, dict[int, tuple[int, int]]] = (0, {})
+
+    # Reading
+
+    def _replaced(self) -> bool:
+        """
+        Whether `path` now names a different file than the mapped one.
+        """
+        now = time.monotonic()
+        if now - self._checked_at < STAT_INTERVAL:
+            return False
+        self._checked_at = now
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return True
+        return (stat.st_dev, stat.st_ino) != self._identity
+
+    def _open(self) -> Optional[mmap.mmap]:
+        if (
+            self._map is not None
+            and not U32.unpack_from(self._map, RETIRED_AT)[0]
+            and not self._replaced()
+        ):
+            return self._map
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        try:
+            with open(self.path, 'rb') as snapshot:
+                stat = os.fstat(snapshot.fileno())
+                mapped = mmap.mmap(snapshot.fileno(), 0, access=mmap.ACCESS_READ)
+        except (FileNotFoundError, ValueError):
+            return None
+        if len(mapped) < HEADER_SIZE or mapped[:8] != MAGIC:
+            mapped.close()
+            return None
+        self._map = mapped
+        self._identity = (stat.st_dev, stat.st_ino)
+        # Generations restart in a recreated file; never reuse the old file's table.
+        self._netuids = (0, {})
+        self._checked_at = time.monotonic()
+        return mapped
+
+    def _read(self, read: Callable[[mmap.mmap, int, int], T]) -> Optional[T]:
+        """
+        Run `read(map, slot offset, generation)` on the published slot, retrying
+        while the writer overwrites it.
+        """
+        for _ in range(READ_ATTEMPTS):
+            mapped = self._open()
+            if mapped is None:
+                return None
+            generation = U64.unpack_from(mapped, GENERATION_AT)[0]
+            if generation == 0:
+                return None
+            capacity = HEADER.unpack_from(mapped)[3]
+            base = HEADER_SIZE + (generation % 2) * capacity
+            try:
+                created_at = SLOT.unpack_from(mapped, base)[0]
+                value = read(mapped, base, generation)
+            except (struct.error, IndexError, ValueError):
+                created_at, value = 0.0, None
+            if U64.unpack_from(mapped, WRITING_AT)[0] >= generation + 2:
+                continue
+            if self.max_age and time.time() - created_at > self.max_age:
+                return None
+            return value
+        return None
+
+    @staticmethod
+    def _layout(mapped: mmap.mmap, base: int) -> tuple[int, int, int, int]:
+        _, netuid_count, entry_count, _, _ = SLOT.unpack_from(mapped, base)
+        entries_at = base + _align(SLOT.size + netuid_count * NETUID.size)
+        return netuid_count, entry_count, entries_at, entries_at + entry_count * ENTRY.size
+
+    def _netuid_range(self, mapped: mmap.mmap, base: int, generation: int, netuid: int):
+        # The netuid table is small; decode it once per generation.
+        if self._netuids[0] != generation:
+            netuid_count = SLOT.unpack_from(mapped, base)[1]
+            table = {}
+            for i in range(netuid_count):
+                found, start, count = NETUID.unpack_from(mapped, base + SLOT.size + i * NETUID.size)
+                table[found] = (start, count)
+            self._netuids = (generation, table)
+        return self._netuids[1].get(netuid)
+
+    @staticmethod
+    def _hotkey_run(mapped: mmap.mmap, base: int, hotkey: str) -> list[tuple[int, float]]:
+        """
+        (netuid, dividend) of every entry of a hotkey, by binary search in the index.
+        """
+        _, entry_count, entries_at, index_at = DividendSnapshot._layout(mapped, base)
+        key = hotkey.encode().ljust(HOTKEY_SIZE, b'\0')
+
+        def hotkey_at(position: int) -> bytes:
+            entry = INDEX.unpack_from(mapped, index_at + position * INDEX.size)[0]
+            offset = entries_at + entry * ENTRY.size
+            return mapped[offset : offset + HOTKEY_SIZE]
+
+        position = bisect.bisect_left(range(entry_count), key, key=hotkey_at)
+        run = []
+        while position < entry_count and hotkey_at(position) == key:
+            entry = INDEX.unpack_from(mapped, index_at + position * INDEX.size)[0]
+            _, dividend, netuid = ENTRY.unpack_from(mapped, entries_at + entry * ENTRY.size)
+            run.append((netuid, dividend))
+            position += 1
+        return run
+
+    def netuid(self, netuid: int) -> Optional[list[dict]]:
+        """
+        Hotkeys and dividends of a netuid, or None if it is not in the snapshot.
+        """
+
+        def read(mapped: mmap.mmap, base: int, generation: int) -> Optional[list[dict]]:
+            found = self._netuid_range(mapped, base, generation, netuid)
+            if found is None:
+                return None
+            start, count = found
+            entries_at = self._layout(mapped, base)[2]
+            hotkeys = []
+            for i in range(start, start + count):
+                hotkey, dividend, _ = ENTRY.unpack_from(mapped, entries_at + i * ENTRY.size)
+                hotkeys.append({'hotkey': hotkey.rstrip(b'\0').decode(), 'dividends': dividend})
+            return hotkeys
+
+        return self._read(read)
+
+    def hotkey(self, hotkey: str) -> Optional[list[dict]]:
+        """
+        Dividend of a hotkey on every netuid it is on (empty if none).
+        """
+
+        def read(mapped: mmap.mmap, base: int, _: int) -> list[dict]:
+            return [
+                {'netuid': netuid, 'dividend': dividend}
+                for netuid, dividend in self._hotkey_run(mapped, base, hotkey)
+            ]
+
+        return self._read(read)
+
+    def pair(self, netuid: int, hotkey: str) -> Optional[float]:
+        """
+        Dividend of a hotkey on a netuid, or None if the pair is not in the snapshot.
+        """
+
+        def read(mapped: mmap.mmap, base: int, _: int) -> Optional[float]:
+            for found, dividend in self._hotkey_run(mapped, base, hotkey):
+                if found == netuid:
+                    return dividend
+            return None
+
+        return self._read(read)
+
+    def all_json(self) -> Optional[bytes]:
+        """
+        The whole `results` list, already serialized as JSON.
+        """
+
+        def read(mapped: mmap.mmap, base: int, _: int) -> bytes:
+            _, _, _, json_at, json_length = SLOT.unpack_from(mapped, base)
+            return mapped[base + json_at : base + json_at + json_length]
+
+        return self._read(read)
+
+    def status(self) -> Optional[dict[str, Any]]:
+        """
+        Generation, creation time and size of the published snapshot.
+        """
+
+        def read(mapped: mmap.mmap, base: int, generation: int) -> dict:
+            created_at, netuid_count, entry_count, _, _ = SLOT.unpack_from(mapped, base)
+            return {
+                'generation': generation,
+                'created_at': created_at,
+                'netuids': netuid_count,
+                'entries': entry_count,
+            }
+
+        return self._read(read)
+
+    # Writing (single refresher process)
+
+    def _create(self, capacity: int, generation: int) -> mmap.mmap:
+        """
+        Build a new snapshot file at a temporary path; `publish` renames it in place.
+        """
+        temporary = f'{self.path}.{os.getpid()}.tmp'
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(temporary, 'w+b') as snapshot:
+            snapshot.truncate(HEADER_SIZE + 2 * capacity)
+            mapped = mmap.mmap(snapshot.fileno(), 0)
+        HEADER.pack_into(mapped, 0, MAGIC, generation, generation, capacity, 0)
+        return mapped
+
+    def _open_writer(self) -> Optional[mmap.mmap]:
+        try:
+            with open(self.path, 'r+b') as snapshot:
+                mapped = mmap.mmap(snapshot.fileno(), 0)
+        except (FileNotFoundError, ValueError):
+            return None
+        if (
+            len(mapped) < HEADER_SIZE
+            or mapped[:8] != MAGIC
+            or U32.unpack_from(mapped, RETIRED_AT)[0]
+        ):
+            mapped.close()
+            return None
+        return mapped
+
+    def write(self, results: list[dict]) -> int:
+        """
+        Publish a new snapshot of the all-dividends results.
+
+        Returns:
+            int: The new generation.
+        """
+        slot = encode(results, time.time())
+        if self._writer is None:
+            self._writer = self._open_writer()
+        current = self._writer
+        generation = U64.unpack_from(current, GENERATION_AT)[0] if current is not None else 0
+        capacity = HEADER.unpack_from(current)[3] if current is not None else 0
+
+        replace = current is None or len(slot) > capacity
+        if replace:
+            capacity = max(self.capacity, 2 * len(slot))
+            target = self._create(capacity, generation)
+        else:
+            target = current
+
+        generation += 1
+        U64.pack_into(target, WRITING_AT, generation)
+        base = HEADER_SIZE + (generation % 2) * capacity
+        target[base : base + len(slot)] = slot
+        U64.pack_into(target, GENERATION_AT, generation)
+
+        if replace:
+            os.replace(f'{self.path}.{os.getpid()}.tmp', self.path)
+            if current is not None:
+                U32.pack_into(current, RETIRED_AT, 1)
+                current.close()
+            self._writer = target
+            logger.info('Dividend snapshot resized to %s bytes per slot', capacity)
+        return generation
+
+    def close(self) -> None:
+        for mapped in (self._map, self._writer):
+            if mapped is not None:
+                mapped.close()
+        self._map = self._writer = None
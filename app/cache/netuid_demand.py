@@ -0,0 +1,58 @@
+import logging
+
+from app.cache.redis import RedisCache
+
+logger = logging.getLogger(__name__)
+
+
+class NetuidDemand:
+    """
+    Decaying request counter per netuid, kept in the `netuid:requests` sorted set.
+
+    The API bumps a netuid's score on every request naming it, and the sentiment
+    sweep visits netuids in descending score order, halving all scores after
+    each run so recent demand weighs most. Without Redis nothing is recorded and
+    every netuid ranks equally.
+    """
+
+    KEY = 'netuid:requests'
+
+    def __init__(self, cache: RedisCache):
+        self.cache = cache
+
+    def _available(self) -> bool:
+        return getattr(self.cache, 'redis', None) is not None
+
+    async def record(self, netuid: int) -> None:
+        """
+        Count one request for a netuid.
+        """
+        if not self._available():
+            return
+        try:
+            await self.cache.redis.zincrby(self.KEY, 1, str(netuid))
+        except Exception as e:
+            logger.warning('Could not record netuid demand: %s', e)
+
+    async def rank(self, netuids: list[int]) -> list[int]:
+        """
+        Order netuids by recent demand, most requested first.
+
+        Args:
+            netuids (list[int]): The netuids to order.
+
+        Returns:
+            list[int]: The same netuids, by descending demand (ties keep their order).
+        """
+        if not self._available() or not netuids:
+            return list(netuids)
+        scores = await self.cache.redis.zmscore(self.KEY, [str(netuid) for netuid in netuids])
+        order = {netuid: float(score or 0) for netuid, score in zip(netuids, scores, strict=True)}
+        return sorted(netuids, key=lambda netuid: -order[netuid])
+
+    async def decay(self, factor: float = 0.5) -> None:
+        """
+        Scale every score by `factor`.
+        """
+        if self._available():
+            await self.cache.redis.zunionstore(self.KEY, {self.KEY: factor})
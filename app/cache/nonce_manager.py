@@ -0,0 +1,147 @@
+import asyncio
+import logging
+from typing import Awaitable, Callable
+
+from app.cache.redis import RedisCache
+
+logger = logging.getLogger(__name__)
+
+NONCE_ERRORS = (
+    'outdated',
+    'stale',
+    'future',
+    'priority is too low',
+    'already imported',
+)
+
+
+def is_nonce_error(exc: BaseException) -> bool:
+    """
+    Whether a submission error means the nonce used was stale or ahead of the chain
+    (`Transaction is outdated`, `will be valid in the future`, a same-nonce
+    replacement with too low priority, ...).
+    """
+    message = str(exc).lower()
+    return any(marker in message for marker in NONCE_ERRORS)
+
+
+class NonceManager:
+    """
+    Hands out sequential account nonces to concurrent submitters.
+
+    The next nonce per account lives in Redis (`nonce:{address}`) and is taken with
+    an atomic Lua read-and-increment, so every worker process signing with the same
+    coldkey gets a distinct nonce. The on-chain nonce is fetched only when the
+    counter is missing or after a nonce error (`resync`). A nonce whose extrinsic
+    was rejected for another reason is handed back (`release`), so later
+    extrinsics do not wait behind the gap. A process-local lock serializes
+    fetches, and a local counter takes over when Redis is not reachable.
+    """
+
+    TTL = 600
+
+    TAKE_SCRIPT = """
+    local nonce = redis.call('GET', KEYS[1])
+    if not nonce then
+        return nil
+    end
+    redis.call('SET', KEYS[1], tonumber(nonce) + 1, 'EX', tonumber(ARGV[1]))
+    return tonumber(nonce)
+    """
+
+    # Roll the counter back to ARGV[1] if no later nonce was handed out meanwhile.
+    ROLLBACK_SCRIPT = """
+    if tonumber(redis.call('GET', KEYS[1])) == tonumber(ARGV[1]) + 1 then
+        redis.call('SET', KEYS[1], ARGV[1], 'EX', tonumber(ARGV[2]))
+        return 1
+    end
+    return 0
+    """
+
+    def __init__(self, cache: RedisCache):
+        self.cache = cache
+        self._lock = asyncio.Lock()
+        self._local: dict[str, int] = {}
+
+    @staticmethod
+    def _key(address: str) -> str:
+        return f'nonce:{address}'
+
+    def _available(self) -> bool:
+        return getattr(self.cache, 'redis', None) is not None
+
+    async def allocate(self, address: str, fetch: Callable[[], Awaitable[int]]) -> int:
+        """
+        Take the next nonce for an account.
+
+        Args:
+            address (str): SS58 address of the signing account.
+            fetch (Callable): Coroutine function returning the on-chain next nonce.
+
+        Returns:
+            int: A nonce no other submitter has been given.
+        """
+        if self._available():
+            try:
+                return await self._allocate_shared(address, fetch)
+            except Exception as e:
+                logger.warning('Shared nonce counter unavailable (%s), using local one', e)
+        async with self._lock:
+            if address not in self._local:
+                self._local[address] = await fetch()
+            nonce = self._local[address]
+            self._local[address] = nonce + 1
+            return nonce
+
+    async def _allocate_shared(self, address: str, fetch: Callable[[], Awaitable[int]]) -> int:
+        key = self._key(address)
+        nonce = await self.cache.redis.eval(self.TAKE_SCRIPT, 1, key, self.TTL)
+        if nonce is not None:
+            return int(nonce)
+        async with self._lock:
+            nonce = await self.cache.redis.eval(self.TAKE_SCRIPT, 1, key, self.TTL)
+            if nonce is not None:
+                return int(nonce)
+            # Another process may seed the counter concurrently; only one SET wins.
+            await self.cache.redis.set(key, await fetch(), nx=True, ex=self.TTL)
+            return int(await self.cache.redis.eval(self.TAKE_SCRIPT, 1, key, self.TTL))
+
+    async def resync(self, address: str, fetch: Callable[[], Awaitable[int]]) -> None:
+        """
+        Reset the counter to the on-chain next nonce after a stale/future nonce error.
+        """
+        async with self._lock:
+            nonce = await fetch()
+            self._local[address] = nonce
+            if self._available():
+                try:
+                    await self.cache.redis.set(self._key(address), nonce, ex=self.TTL)
+                except Exception as e:
+                    logger.warning('Could not resync shared nonce counter: %s', e)
+
+    async def release(self, address: str, nonce: int, fetch: Callable[[], Awaitable[int]]) -> None:
+        """
+        Hand back a nonce whose extrinsic never reached the chain (rejected by the
+        node for a non-nonce reason, or not sent at all).
+
+        The counter is rolled back when `nonce` is the last one handed out;
+        otherwise later nonces are already in use and it is resynced from the
+        chain, so the next allocation fills the gap.
+        """
+        rolled_back = False
+        if self._available():
+            try:
+                rolled_back = bool(
+                    await self.cache.redis.eval(
+                        self.ROLLBACK_SCRIPT, 1, self._key(address), nonce, self.TTL
+                    )
+                )
+            except Exception as e:
+                logger.warning('Could not roll back shared nonce counter: %s', e)
+        else:
+            async with self._lock:
+                if self._local.get(address) == nonce + 1:
+                    self._local[address] = nonce
+                    rolled_back = True
+        if not rolled_back:
+            await self.resync(address, fetch)
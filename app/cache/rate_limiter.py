@@ -0,0 +1,206 @@
+import asyncio
+import hashlib
+import logging
+import time
+from typing import Optional
+
+from app.cache.redis import RedisCache
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class RateLimitTimeout(Exception):
+    """
+    Raised when a permit cannot be obtained before the caller's deadline.
+    """
+
+
+class TokenBucket:
+    """
+    Cross-process token bucket stored in Redis.
+
+    The bucket state (`tokens`, `ts` and `blocked_until`) lives in a Redis hash and is
+    updated atomically by a Lua script using the Redis server clock, so every worker
+    and API process draws from the same budget. When Redis is not reachable the
+    bucket fails open and permits are granted immediately. After a 429 the bucket is
+    emptied and blocked for the advertised `Retry-After`; refilling resumes only
+    once the block ends.
+    """
+
+    SCRIPT = """
+    local key = KEYS[1]
+    local rate = tonumber(ARGV[1])
+    local capacity = tonumber(ARGV[2])
+    local requested = tonumber(ARGV[3])
+    local t = redis.call('TIME')
+    local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+
+    local state = redis.call('HMGET', key, 'tokens', 'ts', 'blocked_until')
+    local tokens = tonumber(state[1]) or capacity
+    local ts = tonumber(state[2]) or now
+    local blocked_until = tonumber(state[3]) or 0
+
+    -- No tokens accrue while blocked, so the bucket does not burst when a block ends.
+    local refill_from = math.max(ts, blocked_until)
+    tokens = math.min(capacity, tokens + math.max(0, now - refill_from) * rate)
+
+    local allowed = 0
+    local wait = 0
+    if now < blocked_until then
+        wait = blocked_until - now
+    elseif tokens >= requested then
+        tokens = tokens - requested
+        allowed = 1
+    else
+        wait = (requested - tokens) / rate
+    end
+
+    redis.call('HSET', key, 'tokens', tokens, 'ts', now)
+    redis.call('PEXPIRE', key, math.ceil((capacity / rate + math.max(0, blocked_until - now)) * 1000) + 1000)
+    return {allowed, tostring(tokens), tostring(wait)}
+    """
+
+    def __init__(self, cache: RedisCache, name: str, rate: float, capacity: float):
+        self.cache = cache
+        self.name = name
+        self.key = f'ratelimit:{name}'
+        self.rate = rate
+        self.capacity = capacity
+        self.acquired = 0
+        self.timeouts = 0
+        self.total_wait = 0.0
+        self.last_wait = 0.0
+
+    @staticmethod
+    def key_for(upstream: str, api_key: str) -> str:
+        """
+        Build a bucket name for an upstream API key without storing the key itself.
+        """
+        return f'{upstream}:{hashlib.sha256(api_key.encode()).hexdigest()[:12]}'
+
+    def _available(self) -> bool:
+        return getattr(self.cache, 'redis', None) is not None
+
+    async def try_acquire(self, tokens: float = 1) -> tuple[bool, float]:
+        """
+        Try to take tokens from the bucket without waiting.
+
+        Args:
+            tokens (float): Number of tokens to take.
+
+        Returns:
+            tuple[bool, float]: Whether the permit was granted and, if not, how many
+                seconds to wait before retrying.
+        """
+        if not self._available():
+            return True, 0.0
+        try:
+            allowed, _, wait = await self.cache.redis.eval(
+                self.SCRIPT, 1, self.key, self.rate, self.capacity, tokens
+            )
+            return bool(int(allowed)), float(wait)
+        except Exception as e:
+            logger.warning('Rate limiter %s unavailable: %s', self.name, e)
+            return True, 0.0
+
+    async def acquire(
+        self, tokens: float = 1, timeout: Optional[float] = settings.rate_limit_timeout
+    ) -> float:
+        """
+        Wait until tokens are available.
+
+        Args:
+            tokens (float): Number of tokens to take.
+            timeout (float | None): Maximum number of seconds to wait. None waits forever.
+
+        Returns:
+            float: Seconds spent waiting for the permit.
+
+        Raises:
+            RateLimitTimeout: If the permit cannot be granted before the deadline.
+        """
+        start = time.monotonic()
+        deadline = None if timeout is None else start + timeout
+        while True:
+            allowed, wait = await self.try_acquire(tokens)
+            now = time.monotonic()
+            if allowed:
+                waited = now - start
+                self.acquired += 1
+                self.total_wait += waited
+                self.last_wait = waited
+                return waited
+            if deadline is not None and now + wait > deadline:
+                self.timeouts += 1
+                raise RateLimitTimeout(
+                    f'No {self.name} permit within {timeout}s (next in {wait:.2f}s)'
+                )
+            await asyncio.sleep(wait)
+
+    async def penalize(self, retry_after: float) -> None:
+        """
+        Block the bucket for every process after the upstream answered 429.
+
+        Args:
+            retry_after (float): Seconds advertised by the upstream `Retry-After` header.
+        """
+        if not self._available():
+            return
+        try:
+            now, micros = await self.cache.redis.time()
+            async with self.cache.redis.pipeline(transaction=True) as pipe:
+                pipe.hset(
+                    self.key,
+                    mapping={'tokens': 0, 'blocked_until': now + micros / 1_000_000 + retry_after},
+                )
+                pipe.expire(self.key, int(retry_after + self.capacity / self.rate) + 1)
+                await pipe.execute()
+        except Exception as e:
+            logger.warning('Rate limiter %s unavailable: %s', self.name, e)
+
+    async def status(self) -> dict:
+        """
+        Report the shared remaining budget and this process's wait statistics.
+
+        Returns:
+            dict: Bucket configuration, remaining tokens, blocking time and wait stats.
+        """
+        remaining: float | None = None
+        blocked_for = 0.0
+        if self._available():
+            try:
+                tokens, ts, blocked_until = await self.cache.redis.hmget(
+                    self.key, ['tokens', 'ts', 'blocked_until']
+                )
+                now, micros = await self.cache.redis.time()
+                current = now + micros / 1_000_000
+                blocked_until = float(blocked_until) if blocked_until is not None else 0.0
+                remaining = self.capacity
+                if tokens is not None and ts is not None:
+                    elapsed = max(0.0, current - max(float(ts), blocked_until))
+                    remaining = min(self.capacity, float(tokens) + elapsed * self.rate)
+                blocked_for = max(0.0, blocked_until - current)
+            except Exception as e:
+                logger.warning('Rate limiter %s unavailable: %s', self.name, e)
+
+        return {
+            'rate': self.rate,
+            'capacity': self.capacity,
+            'remaining': remaining,
+            'blocked_for': blocked_for,
+            'acquired': self.acquired,
+            'timeouts': self.timeouts,
+            'last_wait': self.last_wait,
+            'avg_wait': self.total_wait / self.acquired if self.acquired else 0.0,
+        }
+
+
+def retry_after_seconds(value: Optional[str], default: float = 1.0) -> float:
+    """
+    Parse a `Retry-After` header expressed in seconds, falling back to a default.
+    """
+    try:
+        return max(0.0, float(value)) if value is not None else default
+    except ValueError:
+        return default
@@ -1,10 +1,24 @@
 from typing import Optional
 
 import orjson
-import redis.asyncio as aioredis
 from redis.asyncio.client import Redis
 
 from app.core.config import settings
+from app.core.metrics import cache_requests, key_family
+from app.core.tracing import tracer
+
+
+class TracedRedis(Redis):
+    """
+    Redis client recording a span per command (pipelines and scripts included).
+    """
+
+    async def execute_command(self, *args, **options):
+        attributes = {'db.system': 'redis'}
+        if len(args) > 1 and isinstance(args[1], str):
+            attributes['db.key_family'] = key_family(args[1])
+        with tracer.span(f'redis {args[0]}', **attributes):
+            return await super().execute_command(*args, **options)
 
 
 class RedisCache:
@@ -23,7 +37,15 @@ class RedisCache:
         """
         Initialize the connection to the Redis server.
         """
-        self.redis = await aioredis.from_url(self.redis_url, decode_responses=True)
+        self.redis = await TracedRedis.from_url(self.redis_url, decode_responses=True)
+
+    async def ensure_connection(self) -> None:
+        """
+        Open the connection if it has not been opened yet (e.g. inside Celery workers,
+        which do not run the FastAPI lifespan).
+        """
+        if getattr(self, 'redis', None) is None:
+            await self.connect()
 
     async def close(self) -> None:
         """
@@ -32,17 +54,21 @@ class RedisCache:
         if self.redis:
             await self.redis.close()
 
-    async def get(self, key: str) -> Optional[dict]:
+    async def get(self, key: str, track: bool = True) -> Optional[dict]:
         """
         Retrieve a value from the Redis cache.
 
         Args:
             key (str): The key to retrieve.
+            track (bool): Count the lookup as a hit or miss in `cache_requests_total`;
+                callers that classify the result themselves pass False.
 
         Returns:
             Optional[dict]: The value associated with the key, or None if not found.
         """
         data = await self.redis.get(key)
+        if track:
+            cache_requests.inc(family=key_family(key), result='hit' if data else 'miss')
         if data:
             return orjson.loads(data)
         return None
@@ -0,0 +1,137 @@
+import logging
+import math
+import time
+
+import orjson
+
+from app.cache.redis import RedisCache
+
+logger = logging.getLogger(__name__)
+
+
+class SentimentHistory:
+    """
+    Sentiment time-series and smoothed trading signal per netuid.
+
+    Every new score is appended to the capped list `sentiment:history:{netuid}`
+    (newest first) and folded into `sentiment:signal:{netuid}`, a hash holding an
+    exponential moving average and exponentially weighted variance of the scores.
+    Both are updated by one Lua script, so the signal is O(1) state per netuid
+    that readers get without recomputing anything. Without Redis nothing is
+    recorded and no signal is available.
+    """
+
+    RECORD_SCRIPT = """
+    local alpha = tonumber(ARGV[1])
+    local score = tonumber(ARGV[2])
+    local count = tonumber(redis.call('HGET', KEYS[1], 'count') or '0')
+    local ema = score
+    local variance = 0
+    if count > 0 then
+        local previous = tonumber(redis.call('HGET', KEYS[1], 'ema'))
+        local diff = score - previous
+        local increment = alpha * diff
+        ema = previous + increment
+        variance = (1 - alpha) * (tonumber(redis.call('HGET', KEYS[1], 'variance')) + diff * increment)
+    end
+    redis.call('HSET', KEYS[1],
+        'ema', tostring(ema), 'variance', tostring(variance), 'count', count + 1,
+        'last', ARGV[2], 'updated_at', ARGV[3])
+    redis.call('LPUSH', KEYS[2], ARGV[4])
+    redis.call('LTRIM', KEYS[2], 0, tonumber(ARGV[5]) - 1)
+    return {tostring(ema), tostring(variance), count + 1}
+    """
+
+    def __init__(self, cache: RedisCache, alpha: float, max_points: int):
+        self.cache = cache
+        self.alpha = alpha
+        self.max_points = max_points
+
+    @staticmethod
+    def _signal_key(netuid: int) -> str:
+        return f'sentiment:signal:{netuid}'
+
+    @staticmethod
+    def _history_key(netuid: int) -> str:
+        return f'sentiment:history:{netuid}'
+
+    def _available(self) -> bool:
+        return getattr(self.cache, 'redis', None) is not None
+
+    async def record(self, netuid: int, score: float) -> dict | None:
+        """
+        Append a score to the netuid's history and update its signal.
+
+        Args:
+            netuid (int): The subnet ID.
+            score (float): The new sentiment score.
+
+        Returns:
+            dict | None: The updated EMA, volatility and sample count, or None if it
+            could not be recorded.
+        """
+        if not self._available():
+            return None
+        now = time.time()
+        point = orjson.dumps({'timestamp': now, 'score': score})
+        try:
+            ema, variance, count = await self.cache.redis.eval(
+                self.RECORD_SCRIPT,
+                2,
+                self._signal_key(netuid),
+                self._history_key(netuid),
+                self.alpha,
+                repr(float(score)),
+                now,
+                point,
+                self.max_points,
+            )
+        except Exception as e:
+            logger.warning('Could not record sentiment history: %s', e)
+            return None
+        return {
+            'ema': float(ema),
+            'volatility': math.sqrt(max(float(variance), 0.0)),
+            'count': int(count),
+        }
+
+    async def signal(self, netuid: int) -> dict | None:
+        """
+        Return the smoothed signal of a netuid.
+
+        Returns:
+            dict | None: EMA, volatility, last score, sample count and update time,
+            or None if no score has been recorded.
+        """
+        if not self._available():
+            return None
+        state = await self.cache.redis.hgetall(self._signal_key(netuid))
+        if not state:
+            return None
+        return {
+            'ema': float(state['ema']),
+            'volatility': math.sqrt(max(float(state['variance']), 0.0)),
+            'last': float(state['last']),
+            'count': int(state['count']),
+            'updated_at': float(state['updated_at']),
+        }
+
+    async def history(self, netuid: int, limit: int) -> list[dict]:
+        """
+        Return the latest `limit` scores of a netuid, newest first.
+        """
+        if not self._available():
+            return []
+        points = await self.cache.redis.lrange(self._history_key(netuid), 0, limit - 1)
+        return [orjson.loads(point) for point in points]
+
+    async def smoothed(self, netuid: int, fallback: float) -> float:
+        """
+        Return the EMA of a netuid, or `fallback` if there is none (or no Redis).
+        """
+        try:
+            signal = await self.signal(netuid)
+        except Exception as e:
+            logger.warning('Sentiment signal unavailable: %s', e)
+            return fallback
+        return signal['ema'] if signal else fallback
@@ -1,4 +1,52 @@
+from app.cache.backpressure import TradeBackpressure
+from app.cache.circuit_breaker import CircuitBreaker
+from app.cache.dividend_snapshot import DividendSnapshot
+from app.cache.netuid_demand import NetuidDemand
+from app.cache.nonce_manager import NonceManager
+from app.cache.rate_limiter import TokenBucket
 from app.cache.redis import RedisCache
+from app.cache.sentiment_history import SentimentHistory
+from app.cache.stake_intents import StakeIntentQueue
+from app.cache.task_results import TaskResults
+from app.cache.trade_dedup import TradeDeduplicator
+from app.cache.tweet_store import TweetStore
 from app.core.config import settings
 
 redis_cache = RedisCache(settings.redis_url)
+tweet_store = TweetStore(redis_cache)
+datura_limiter = TokenBucket(
+    redis_cache,
+    TokenBucket.key_for('datura', settings.datura_api_key),
+    rate=settings.datura_rate_limit,
+    capacity=settings.datura_rate_burst,
+)
+chutes_limiter = TokenBucket(
+    redis_cache,
+    TokenBucket.key_for('chutes', settings.chutes_api_key),
+    rate=settings.chutes_rate_limit,
+    capacity=settings.chutes_rate_burst,
+)
+datura_breaker = CircuitBreaker(redis_cache, 'datura')
+chutes_breaker = CircuitBreaker(redis_cache, 'chutes')
+substrate_breaker = CircuitBreaker(redis_cache, 'substrate')
+trade_dedup = TradeDeduplicator(redis_cache)
+stake_intents = StakeIntentQueue(redis_cache, settings.test_wallet_name)
+nonce_manager = NonceManager(redis_cache)
+netuid_demand = NetuidDemand(redis_cache)
+task_results = TaskResults(redis_cache)
+trade_backpressure = TradeBackpressure(
+    redis_cache,
+    ['fetch', 'score', 'stake'] if settings.trade_pipeline == 'staged' else ['celery'],
+    max_queue_depth=settings.trade_max_queue_depth,
+    max_in_flight=settings.trade_max_in_flight,
+    sample_interval=settings.backpressure_sample_interval,
+    retry_after=settings.trade_retry_after,
+)
+sentiment_history = SentimentHistory(
+    redis_cache,
+    alpha=settings.sentiment_ema_alpha,
+    max_points=settings.sentiment_history_size,
+)
+dividend_snapshot = DividendSnapshot(
+    settings.dividend_snapshot_path, max_age=settings.dividend_snapshot_max_age
+)
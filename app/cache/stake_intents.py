@@ -0,0 +1,75 @@
+import orjson
+
+from app.cache.redis import RedisCache
+
+
+class StakeIntentQueue:
+    """
+    Redis list of pending stake/unstake intents for one wallet.
+
+    Intents pushed within a batching window are drained together and submitted as
+    a single batched extrinsic. The first push of a window also claims a flush
+    marker, telling its caller to schedule the flush; draining clears both.
+    """
+
+    PUSH_SCRIPT = """
+    redis.call('RPUSH', KEYS[1], ARGV[1])
+    if redis.call('SET', KEYS[2], '1', 'NX', 'EX', tonumber(ARGV[2])) then
+        return 1
+    end
+    return 0
+    """
+
+    DRAIN_SCRIPT = """
+    local items = redis.call('LRANGE', KEYS[1], 0, -1)
+    redis.call('DEL', KEYS[1], KEYS[2])
+    return items
+    """
+
+    def __init__(self, cache: RedisCache, name: str):
+        self.cache = cache
+        self.key = f'stake:intents:{name}'
+        self.flush_key = f'{self.key}:flush'
+
+    def available(self) -> bool:
+        return getattr(self.cache, 'redis', None) is not None
+
+    async def push(
+        self, netuid: int, hotkey: str, sentiment: float, signal: float, window: float
+    ) -> bool:
+        """
+        Queue an intent to adjust the stake on `hotkey` according to `signal`.
+
+        Args:
+            netuid (int): The subnet ID.
+            hotkey (str): The hotkey to stake to or unstake from.
+            sentiment (float): Sentiment score that triggered the trade, as recorded.
+            signal (float): Score the trade is sized from; its sign selects stake or
+                unstake.
+            window (float): Batching window in seconds.
+
+        Returns:
+            bool: True if this intent opened the window and the caller must schedule
+            the flush.
+        """
+        intent = orjson.dumps({
+            'netuid': netuid,
+            'hotkey': hotkey,
+            'sentiment': sentiment,
+            'signal': signal,
+        })
+        # The marker outlives the window so a lost flush is eventually rescheduled.
+        ttl = int(window * 5) + 1
+        return bool(
+            await self.cache.redis.eval(self.PUSH_SCRIPT, 2, self.key, self.flush_key, intent, ttl)
+        )
+
+    async def drain(self) -> list[dict]:
+        """
+        Atomically take every queued intent.
+
+        Returns:
+            list[dict]: Intents in arrival order.
+        """
+        items = await self.cache.redis.eval(self.DRAIN_SCRIPT, 2, self.key, self.flush_key)
+        return [orjson.loads(item) for item in items or []]
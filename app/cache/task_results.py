@@ -0,0 +1,114 @@
+import asyncio
+from typing import AsyncIterator
+
+import orjson
+
+from app.cache.redis import RedisCache
+
+
+class TaskResults:
+    """
+    Reads Celery task results from the Redis result backend.
+
+    The backend stores each result under `celery-task-meta-{task_id}` and
+    publishes the same payload on a channel of that name whenever the state is
+    stored, so waiters subscribe to the channel instead of polling the key. A
+    task without a stored state is reported as `PENDING` (queued, running or
+    unknown, as in Celery).
+    """
+
+    PREFIX = 'celery-task-meta-'
+    READY_STATES = ('SUCCESS', 'FAILURE', 'REVOKED')
+
+    def __init__(self, cache: RedisCache):
+        self.cache = cache
+
+    @classmethod
+    def _key(cls, task_id: str) -> str:
+        return f'{cls.PREFIX}{task_id}'
+
+    @classmethod
+    def describe(cls, task_id: str, meta: dict | None) -> dict:
+        """
+        Turn a result backend payload into the status returned to clients.
+
+        Args:
+            task_id (str): The task ID.
+            meta (dict | None): The stored payload, or None if there is none yet.
+
+        Returns:
+            dict: Task ID, state, whether it is final, its result and error.
+        """
+        status = meta['status'] if meta else 'PENDING'
+        result = meta.get('result') if meta else None
+        error = None
+        if status == 'FAILURE' and isinstance(result, dict):
+            error = f'{result.get("exc_type")}: {result.get("exc_message")}'
+            result = None
+        return {
+            'task_id': task_id,
+            'status': status,
+            'ready': status in cls.READY_STATES,
+            'result': result if status == 'SUCCESS' else None,
+            'error': error,
+            'date_done': meta.get('date_done') if meta else None,
+        }
+
+    async def get(self, task_id: str) -> dict:
+        """
+        Return the current status of a task.
+        """
+        return self.describe(task_id, await self.cache.get(self._key(task_id)))
+
+    async def updates(
+        self, task_id: str, timeout: float, idle: float | None = None
+    ) -> AsyncIterator[dict | None]:
+        """
+        Yield the current status of a task and then every stored change, until it
+        reaches a final state or `timeout` seconds have passed.
+
+        Args:
+            task_id (str): The task ID.
+            timeout (float): Maximum number of seconds to wait for changes.
+            idle (float | None): If set, yield None after this many seconds without
+                a change (e.g. to send keep-alives).
+        """
+        key = self._key(task_id)
+        pubsub = self.cache.redis.pubsub()
+        # Subscribe before reading the key so a result stored in between is not lost.
+        await pubsub.subscribe(key)
+        try:
+            status = await self.get(task_id)
+            yield status
+            if status['ready']:
+                return
+            loop = asyncio.get_running_loop()
+            deadline = loop.time() + timeout
+            while (remaining := deadline - loop.time()) > 0:
+                wait = remaining if idle is None else min(remaining, idle)
+                message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=wait)
+                if message is None:
+                    if idle is not None and loop.time() < deadline:
+                        yield None
+                    continue
+                status = self.describe(task_id, orjson.loads(message['data']))
+                yield status
+                if status['ready']:
+                    return
+        finally:
+            await pubsub.unsubscribe(key)
+            await pubsub.aclose()
+
+    async def wait(self, task_id: str, timeout: float) -> dict:
+        """
+        Wait up to `timeout` seconds for a task to reach a final state.
+
+        Returns:
+            dict: The final status, or the latest one if the wait timed out.
+        """
+        status = await self.get(task_id)
+        if status['ready'] or timeout <= 0:
+            return status
+        async for update in self.updates(task_id, timeout):
+            status = update or status
+        return status
@@ -0,0 +1,88 @@
+import logging
+
+from app.cache.redis import RedisCache
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class TradeDeduplicator:
+    """
+    Enqueue-time idempotency for `analyze_and_stake` tasks.
+
+    The first trade request for a `(netuid, hotkey, engine)` stores its task ID
+    under `trade:{netuid}:{hotkey}:{engine}`; every later request attaches to that
+    task instead of enqueueing another one. The worker releases the claim when the
+    task finishes, and it expires after `window` seconds in case it never does.
+    When Redis is not reachable every request gets its own task.
+    """
+
+    CLAIM_SCRIPT = """
+    if redis.call('SET', KEYS[1], ARGV[1], 'NX', 'EX', tonumber(ARGV[2])) then
+        return {1, ARGV[1]}
+    end
+    return {0, redis.call('GET', KEYS[1])}
+    """
+
+    RELEASE_SCRIPT = """
+    if redis.call('GET', KEYS[1]) == ARGV[1] then
+        return redis.call('DEL', KEYS[1])
+    end
+    return 0
+    """
+
+    def __init__(self, cache: RedisCache, window: int = settings.trade_dedup_window):
+        self.cache = cache
+        self.window = window
+
+    @staticmethod
+    def _key(netuid: int, hotkey: str, engine: str | None) -> str:
+        return f'trade:{netuid}:{hotkey}:{engine or settings.sentiment_engine}'
+
+    def _available(self) -> bool:
+        return self.window > 0 and getattr(self.cache, 'redis', None) is not None
+
+    async def claim(
+        self, netuid: int, hotkey: str, task_id: str, engine: str | None = None
+    ) -> tuple[str, bool]:
+        """
+        Register `task_id` as the pending trade for a pair, unless one already exists.
+
+        Args:
+            netuid (int): The subnet ID.
+            hotkey (str): The hotkey to stake to or unstake from.
+            task_id (str): ID to use if this request has to enqueue the task.
+            engine (str | None): Sentiment engine of the trade (None for the default).
+
+        Returns:
+            tuple[str, bool]: The task ID to report and whether it belongs to an
+            earlier request (so nothing must be enqueued).
+        """
+        if not self._available():
+            return task_id, False
+        try:
+            claimed, current = await self.cache.redis.eval(
+                self.CLAIM_SCRIPT, 1, self._key(netuid, hotkey, engine), task_id, self.window
+            )
+        except Exception as e:
+            logger.warning('Trade deduplication unavailable: %s', e)
+            return task_id, False
+        if int(claimed) or current is None:
+            return task_id, False
+        return current, True
+
+    async def release(
+        self, netuid: int, hotkey: str, task_id: str, engine: str | None = None
+    ) -> None:
+        """
+        Drop the claim for a pair if it still belongs to `task_id` (when the task
+        finished or could not be enqueued).
+        """
+        if not self._available():
+            return
+        try:
+            await self.cache.redis.eval(
+                self.RELEASE_SCRIPT, 1, self._key(netuid, hotkey, engine), task_id
+            )
+        except Exception as e:
+            logger.warning('Could not release trade claim: %s', e)
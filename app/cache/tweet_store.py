@@ -0,0 +1,213 @@
+import asyncio
+import hashlib
+import logging
+import time
+import uuid
+from datetime import datetime, timezone
+
+from app.cache.redis import RedisCache
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class TweetStore:
+    """
+    Redis-backed store of tweets per netuid, deduplicated by tweet ID.
+
+    For each netuid it keeps:
+    - `tweets:{netuid}:ids`: sorted set of tweet IDs scored by creation time.
+    - `tweets:{netuid}:texts`: hash of tweet ID to text.
+    - `tweets:{netuid}:cursor`: creation time of the newest stored tweet.
+    - `tweets:{netuid}:fresh`: marker set after a fetch, expiring after the refresh interval.
+    - `tweets:{netuid}:lock`: short-lived lock held by the process currently fetching.
+    """
+
+    LOCK_TTL = 30
+
+    RELEASE_SCRIPT = """
+    if redis.call('GET', KEYS[1]) == ARGV[1] then
+        return redis.call('DEL', KEYS[1])
+    end
+    return 0
+    """
+
+    def __init__(self, cache: RedisCache):
+        self.cache = cache
+
+    @staticmethod
+    def _key(netuid: int, suffix: str) -> str:
+        return f'tweets:{netuid}:{suffix}'
+
+    @staticmethod
+    def _parse_created_at(value) -> float | None:
+        """
+        Parse a tweet creation date (ISO 8601 or Twitter format) into a UNIX timestamp.
+        Returns None when missing or unparsable.
+        """
+        if isinstance(value, (int, float)):
+            return float(value)
+        if isinstance(value, str):
+            try:
+                return datetime.fromisoformat(value.replace('Z', '+00:00')).timestamp()
+            except ValueError:
+                pass
+            try:
+                return datetime.strptime(value, '%a %b %d %H:%M:%S %z %Y').timestamp()
+            except ValueError:
+                pass
+        return None
+
+    @staticmethod
+    def _tweet_id(tweet: dict) -> str:
+        tweet_id = tweet.get('id') or tweet.get('id_str')
+        if tweet_id:
+            return str(tweet_id)
+        return hashlib.sha1(tweet['text'].encode()).hexdigest()
+
+    async def add(self, netuid: int, tweets: list[dict]) -> int:
+        """
+        Store tweets for a netuid, ignoring IDs that are already known.
+
+        Args:
+            netuid (int): The subnet ID.
+            tweets (list[dict]): Raw tweets as returned by Datura.
+
+        Returns:
+            int: Number of tweets that were not stored yet.
+        """
+        ids_key = self._key(netuid, 'ids')
+        texts_key = self._key(netuid, 'texts')
+        entries: dict[str, float] = {}
+        texts: dict[str, str] = {}
+        for tweet in tweets:
+            if 'text' not in tweet:
+                continue
+            tweet_id = self._tweet_id(tweet)
+            created_at = self._parse_created_at(tweet.get('created_at'))
+            if created_at is None:
+                # Storing it at the current time would move the cursor past real tweets.
+                logger.warning(
+                    'Skipping tweet %s with unparsable created_at %r',
+                    tweet_id,
+                    tweet.get('created_at'),
+                )
+                continue
+            entries[tweet_id] = created_at
+            texts[tweet_id] = tweet['text']
+        if not entries:
+            return 0
+
+        async with self.cache.redis.pipeline(transaction=True) as pipe:
+            pipe.zadd(ids_key, entries, nx=True)
+            for tweet_id, text in texts.items():
+                pipe.hsetnx(texts_key, tweet_id, text)
+            results = await pipe.execute()
+        added = int(results[0])
+
+        newest = max(entries.values())
+        cursor = await self.cursor(netuid)
+        if cursor is None or newest > cursor.timestamp():
+            await self.cache.redis.set(self._key(netuid, 'cursor'), newest)
+
+        await self._trim(netuid)
+        return added
+
+    async def _trim(self, netuid: int) -> None:
+        """
+        Drop tweets older than the retention period.
+        """
+        ids_key = self._key(netuid, 'ids')
+        cutoff = time.time() - settings.tweet_retention_seconds
+        expired = await self.cache.redis.zrangebyscore(ids_key, '-inf', cutoff)
+        if not expired:
+            return
+        async with self.cache.redis.pipeline(transaction=True) as pipe:
+            pipe.zremrangebyscore(ids_key, '-inf', cutoff)
+            pipe.hdel(self._key(netuid, 'texts'), *expired)
+            await pipe.execute()
+
+    async def cursor(self, netuid: int) -> datetime | None:
+        """
+        Return the creation time of the newest stored tweet, if any.
+        """
+        value = await self.cache.redis.get(self._key(netuid, 'cursor'))
+        if value is None:
+            return None
+        return datetime.fromtimestamp(float(value), tz=timezone.utc)
+
+    async def window(
+        self,
+        netuid: int,
+        seconds: int = settings.tweet_window_seconds,
+        limit: int = settings.tweet_window_size,
+    ) -> list[str]:
+        """
+        Return the texts of the most recent stored tweets within a rolling window.
+
+        Args:
+            netuid (int): The subnet ID.
+            seconds (int): Size of the rolling window in seconds.
+            limit (int): Maximum number of tweets to return.
+
+        Returns:
+            list[str]: Tweet texts, newest first.
+        """
+        ids = await self.cache.redis.zrevrangebyscore(
+            self._key(netuid, 'ids'),
+            '+inf',
+            time.time() - seconds,
+            start=0,
+            num=limit,
+        )
+        if not ids:
+            return []
+        texts = await self.cache.redis.hmget(self._key(netuid, 'texts'), ids)
+        return [text for text in texts if text is not None]
+
+    async def is_fresh(self, netuid: int) -> bool:
+        """
+        Whether the netuid was fetched within the refresh interval.
+        """
+        return bool(await self.cache.redis.exists(self._key(netuid, 'fresh')))
+
+    async def mark_fresh(self, netuid: int) -> None:
+        await self.cache.redis.set(
+            self._key(netuid, 'fresh'), 1, ex=settings.tweet_refresh_interval
+        )
+
+    async def acquire_fetch(self, netuid: int) -> str | None:
+        """
+        Try to become the single fetcher for a netuid.
+
+        Returns:
+            str | None: The lock token to pass to `release_fetch`, or None if another
+            process holds the lock.
+        """
+        token = uuid.uuid4().hex
+        if await self.cache.redis.set(self._key(netuid, 'lock'), token, nx=True, ex=self.LOCK_TTL):
+            return token
+        return None
+
+    async def release_fetch(self, netuid: int, token: str) -> None:
+        """
+        Release the fetch lock if it is still held with `token` (it may have expired
+        and been taken by another process meanwhile).
+        """
+        await self.cache.redis.eval(self.RELEASE_SCRIPT, 1, self._key(netuid, 'lock'), token)
+
+    async def wait_fresh(self, netuid: int, timeout: float = LOCK_TTL) -> bool:
+        """
+        Wait for another process to finish fetching a netuid.
+
+        Returns:
+            bool: True if the data became fresh before the timeout.
+        """
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if await self.is_fresh(netuid):
+                return True
+            if not await self.cache.redis.exists(self._key(netuid, 'lock')):
+                return False
+            await asyncio.sleep(0.25)
+        return False
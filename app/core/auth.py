@@ -7,6 +7,13 @@ Simple token-based authentication dependency for FastAPI routes.
 """
 
 
+def is_authorized(authorization: str | None) -> bool:
+    """
+    Whether an Authorization header value carries the API token.
+    """
+    return authorization == f'{settings.auth_token}'
+
+
 def verify_token(authorization: str = Header(...)) -> None:
     """
     FastAPI dependency to validate the Authorization header token.
@@ -17,7 +24,7 @@ def verify_token(authorization: str = Header(...)) -> None:
     Raises:
         HTTPException: If the token is invalid.
     """
-    if authorization != f'{settings.auth_token}':
+    if not is_authorized(authorization):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail='Invalid token',
@@ -1,3 +1,5 @@
+from typing import Literal
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -7,6 +9,8 @@ class Settings(BaseSettings):
     auth_token: str
     datura_api_key: str
     chutes_api_key: str
+    datura_api_url: str = 'https://apis.datura.ai/twitter'
+    chutes_api_url: str = 'https://llm.chutes.ai/v1/chat/completions'
     test_mnemonics: str
     test_wallet_name: str
     environment: str = 'development'
@@ -14,6 +18,76 @@ class Settings(BaseSettings):
     blockchain_max_retries: int
     blockchain_retry_timeout: int
     ttl_cache: int
+    sentiment_engine: Literal['llm', 'lexicon', 'auto'] = 'llm'
+    sentiment_llm_timeout: float = 10.0
+    sentiment_confidence_threshold: float = 0.8
+    tweet_fetch_count: int = 50
+    tweet_refresh_interval: int = 300
+    tweet_window_seconds: int = 86400
+    tweet_window_size: int = 50
+    tweet_retention_seconds: int = 604800
+    datura_rate_limit: float = 1.0
+    datura_rate_burst: float = 5
+    chutes_rate_limit: float = 2.0
+    chutes_rate_burst: float = 10
+    rate_limit_timeout: float = 30.0
+    circuit_failure_threshold: int = 5
+    circuit_recovery_timeout: float = 30.0
+    retry_backoff_base: float = 0.5
+    retry_backoff_max: float = 10.0
+    trade_dedup_window: int = 60
+    worker_pool: Literal['threads', 'prefork', 'solo', 'eventlet', 'gevent'] = 'threads'
+    worker_concurrency: int = 16
+    worker_max_in_flight: int = 16
+    trade_pipeline: Literal['single', 'staged'] = 'single'
+    worker_fetch_concurrency: int = 32
+    worker_score_concurrency: int = 16
+    worker_stake_concurrency: int = 1
+    sentiment_cache_ttl: int = 300
+    sentiment_sweep_interval: int = 240
+    sentiment_sweep_concurrency: int = 4
+    stake_batch_window: float = 0.0
+    stake_finalization_tracking: bool = False
+    stake_pending_timeout: int = 900
+    tracker_recent_outcomes: int = 10000
+    account_state_block_time: float = 12.0
+    trade_status_max_wait: int = 30
+    trade_events_timeout: int = 300
+    trade_max_queue_depth: int = 1000
+    trade_max_in_flight: int = 0
+    backpressure_sample_interval: float = 1.0
+    trade_retry_after: int = 10
+    stake_write_batch_size: int = 100
+    stake_write_flush_interval: float = 1.0
+    stake_write_spill_path: str = 'data/stake_actions.spill.jsonl'
+    stake_partitioning: bool = True
+    stake_partition_months_ahead: int = 2
+    stake_retention_months: int = 12
+    stake_partition_maintenance_interval: int = 86400
+    stake_rollup_interval: int = 300
+    stake_rollup_lookback: int = 3600
+    sentiment_ema_alpha: float = 0.2
+    sentiment_history_size: int = 1000
+    trade_sizing: Literal['raw', 'ema'] = 'raw'
+    worker_metrics_port: int = 9100
+    tracing_exporter: str = 'none'
+    tracing_file: str = 'data/traces.jsonl'
+    tracing_otlp_endpoint: str = 'http://localhost:4318/v1/traces'
+    tracing_sample_rate: float = 1.0
+    profile_sample_rate: float = 0.0
+    profile_buffer_size: int = 50
+    profile_report_lines: int = 40
+    log_level: str = 'INFO'
+    log_levels: str = ''
+    log_format: str = 'json'
+    log_queue_size: int = 10000
+    log_throttle_interval: float = 10.0
+    log_throttle_burst: int = 5
+    database_echo: bool = False
+    dividend_snapshot: bool = False
+    dividend_snapshot_path: str = 'data/dividends.snapshot'
+    dividend_snapshot_interval: float = 12.0
+    dividend_snapshot_max_age: float = 120.0
 
     model_config = SettingsConfigDict(env_file='.env', extra='ignore')
 
@@ -0,0 +1,69 @@
+import asyncio
+import weakref
+
+import httpx
+
+from app.core.tracing import inject, tracer
+
+"""
+Shared outbound HTTP client.
+
+One `httpx.AsyncClient` (and connection pool) per event loop, so requests made by
+many concurrent tasks on a long-lived worker loop reuse keep-alive connections
+instead of opening a new TLS session per call. Every request is traced and carries
+the current `traceparent`.
+"""
+
+_clients: 'weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]' = (
+    weakref.WeakKeyDictionary()
+)
+
+LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=20)
+
+
+class TracingTransport(httpx.AsyncBaseTransport):
+    """
+    Transport wrapper recording a client span per request.
+    """
+
+    def __init__(self, transport: httpx.AsyncBaseTransport):
+        self.transport = transport
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        with tracer.span(
+            f'HTTP {request.method} {request.url.host}',
+            **{'http.method': request.method, 'http.url': str(request.url.copy_with(query=None))},
+        ) as span:
+            inject(request.headers)
+            response = await self.transport.handle_async_request(request)
+            span.set_attribute('http.status_code', response.status_code)
+            return response
+
+    async def aclose(self) -> None:
+        await self.transport.aclose()
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """
+    Return the HTTP client bound to the running event loop, creating it on first use.
+
+    Returns:
+        httpx.AsyncClient: The shared client. Pass `timeout=` per request.
+    """
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(
+            transport=TracingTransport(httpx.AsyncHTTPTransport(limits=LIMITS))
+        )
+        _clients[loop] = client
+    return client
+
+
+async def close_http_client() -> None:
+    """
+    Close the HTTP client bound to the running event loop, if any.
+    """
+    client = _clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
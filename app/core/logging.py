@@ -0,0 +1,223 @@
+import atexit
+import copy
+import logging
+import os
+import queue
+import sys
+import threading
+import time
+import traceback
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional
+
+import orjson
+
+from app.core.config import settings
+from app.core.tracing import current_span
+
+"""
+Structured, non-blocking logging.
+
+Modules log through `logging.getLogger(__name__)`. Records are put on a bounded
+in-memory queue by the calling thread (never blocking: when the queue is full the
+record is dropped and counted) and written to stdout by a listener thread, as one
+JSON object per line carrying the service name and the current trace and span
+IDs. Repeated warnings and errors from the same call site are throttled, so a
+failing dependency inside a hot loop cannot flood the output.
+"""
+
+# Attributes of every LogRecord; anything else was passed with `extra=` and is
+# emitted as a field of its own.
+RESERVED = set(logging.makeLogRecord({}).__dict__) | {'message', 'asctime'}
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    Formats a record as a single-line JSON object.
+    """
+
+    def __init__(self, service: str):
+        super().__init__()
+        self.service = service
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            'timestamp': record.created,
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+            'service': self.service,
+        }
+        entry.update((key, value) for key, value in record.__dict__.items() if key not in RESERVED)
+        if record.exc_text:
+            entry['exception'] = record.exc_text
+        return orjson.dumps(entry, default=str).decode()
+
+
+class TextFormatter(logging.Formatter):
+    """
+    Human-readable format for local runs, with `extra=` fields appended.
+    """
+
+    def __init__(self, service: str):
+        super().__init__('%(asctime)s %(levelname)s %(name)s: %(message)s')
+        self.service = service
+
+    def format(self, record: logging.LogRecord) -> str:
+        line = super().format(record)
+        fields = ' '.join(
+            f'{key}={value}' for key, value in record.__dict__.items() if key not in RESERVED
+        )
+        return f'{line} {fields}' if fields else line
+
+
+class Throttle(logging.Filter):
+    """
+    Lets at most `burst` warnings or errors per call site (logger and message
+    template) through every `interval` seconds.
+
+    The first record let through after others were dropped carries their number
+    in a `suppressed` field. Records below WARNING always pass.
+    """
+
+    def __init__(self, interval: float, burst: int):
+        super().__init__()
+        self.interval = interval
+        self.burst = burst
+        self._windows: dict[tuple, list] = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno < logging.WARNING or self.interval <= 0:
+            return True
+        key = (record.name, record.msg, record.levelno)
+        now = time.monotonic()
+        with self._lock:
+            window = self._windows.get(key)
+            if window is None or now - window[0] >= self.interval:
+                suppressed = window[2] if window else 0
+                window = self._windows[key] = [now, 0, 0]
+                if suppressed:
+                    record.suppressed = suppressed
+            if window[1] >= self.burst:
+                window[2] += 1
+                return False
+            window[1] += 1
+        return True
+
+
+class _Listener(QueueListener):
+    def enqueue_sentinel(self) -> None:
+        # Blocking: the queue may be full, and the listener thread is draining it.
+        self.queue.put(self._sentinel)
+
+
+class AsyncLogHandler(QueueHandler):
+    """
+    Queue handler whose listener thread is started lazily in each process (so
+    forked Celery workers get their own) and which drops records instead of
+    blocking when the queue is full.
+    """
+
+    def __init__(self, handler: logging.Handler, maxsize: int):
+        self.maxsize = maxsize
+        super().__init__(queue.Queue(maxsize))
+        self.handler = handler
+        self.dropped = 0
+        self._listener: Optional[QueueListener] = None
+        self._pid: Optional[int] = None
+        self._lock = threading.Lock()
+
+    def _ensure_listener(self) -> None:
+        if self._listener is not None and self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._listener is None or self._pid != os.getpid():
+                self.queue = queue.Queue(self.maxsize)
+                self._listener = _Listener(self.queue, self.handler)
+                self._pid = os.getpid()
+                self._listener.start()
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Runs in the logging thread: resolve the message, the traceback and the
+        # trace context here, where they are still available.
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        record.msg, record.args = record.message, None
+        if record.exc_info:
+            record.exc_text = ''.join(traceback.format_exception(*record.exc_info)).rstrip()
+            record.exc_info = None
+        span = current_span()
+        if span is not None:
+            record.trace_id = span.trace_id
+            record.span_id = span.span_id
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        self._ensure_listener()
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def flush(self) -> None:
+        """
+        Drain the queue (at shutdown); the listener is restarted on the next record.
+        """
+        with self._lock:
+            if self._listener is not None and self._pid == os.getpid():
+                self._listener.stop()
+            self._listener = None
+
+
+def parse_levels(spec: str) -> dict[str, str]:
+    """
+    Parse per-logger levels, e.g. `sqlalchemy.engine=INFO,app.tasks=DEBUG`.
+
+    Raises:
+        ValueError: If an entry is not `logger=LEVEL` with a known level.
+    """
+    levels = {}
+    for entry in filter(None, (part.strip() for part in spec.split(','))):
+        name, sep, level = entry.partition('=')
+        level = level.strip().upper()
+        if not sep or not name.strip() or not isinstance(logging.getLevelName(level), int):
+            raise ValueError(f'Invalid log level entry {entry!r}')
+        levels[name.strip()] = level
+    return levels
+
+
+_handler: Optional[AsyncLogHandler] = None
+
+
+def configure_logging(service: str) -> None:
+    """
+    Route the root logger through the non-blocking JSON pipeline.
+
+    Args:
+        service (str): Service name recorded on every line (`api`, `worker`).
+    """
+    global _handler
+    formatter = JsonFormatter(service) if settings.log_format == 'json' else TextFormatter(service)
+    output = logging.StreamHandler(sys.stdout)
+    output.setFormatter(formatter)
+
+    root = logging.getLogger()
+    if _handler is not None:
+        root.removeHandler(_handler)
+        _handler.flush()
+    _handler = AsyncLogHandler(output, settings.log_queue_size)
+    _handler.addFilter(Throttle(settings.log_throttle_interval, settings.log_throttle_burst))
+    root.addHandler(_handler)
+    root.setLevel(settings.log_level.upper())
+    if settings.database_echo:
+        # Same output as SQLAlchemy's `echo=True`, without its synchronous handler.
+        logging.getLogger('sqlalchemy.engine').setLevel(logging.INFO)
+    for name, level in parse_levels(settings.log_levels).items():
+        logging.getLogger(name).setLevel(level)
+
+
+@atexit.register
+def _flush() -> None:
+    if _handler is not None:
+        _handler.flush()
@@ -0,0 +1,115 @@
+import asyncio
+import logging
+import os
+import threading
+from concurrent.futures import Future
+from typing import Any, Awaitable, Callable, Coroutine, Optional, TypeVar
+
+from app.core.tracing import activate, current_span
+
+"""
+Long-lived asyncio event loop for Celery worker processes.
+"""
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar('T')
+
+
+class WorkerEventLoop:
+    """
+    A single asyncio event loop per worker process, running in a background thread.
+
+    Celery task threads submit coroutines to it and block on the result, so many
+    tasks share one substrate connection, HTTP client pool and DB pool while their
+    network waits overlap. At most `max_in_flight` coroutines run at once.
+
+    The loop is started lazily in the process that first uses it, so it survives
+    Celery's prefork model (the parent never starts it).
+    """
+
+    def __init__(self, max_in_flight: int):
+        self.max_in_flight = max_in_flight
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._pid: Optional[int] = None
+        self._lock = threading.Lock()
+        self._shutdown_hooks: list[Callable[[], Awaitable[Any]]] = []
+
+    def _ensure_started(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self.loop is None or self._pid != os.getpid() or not self.loop.is_running():
+                loop = asyncio.new_event_loop()
+                ready = threading.Event()
+
+                def run() -> None:
+                    asyncio.set_event_loop(loop)
+                    self._semaphore = asyncio.Semaphore(self.max_in_flight)
+                    loop.call_soon(ready.set)
+                    loop.run_forever()
+
+                self._thread = threading.Thread(target=run, name='worker-event-loop', daemon=True)
+                self._thread.start()
+                ready.wait()
+                self.loop = loop
+                self._pid = os.getpid()
+            return self.loop
+
+    async def _limited(self, coro: Coroutine[Any, Any, T], span=None) -> T:
+        assert self._semaphore is not None
+        # Runs in its own task on the loop thread, so setting the span here does not
+        # leak into other coroutines.
+        activate(span)
+        async with self._semaphore:
+            return await coro
+
+    def submit(self, coro: Coroutine[Any, Any, T]) -> Future:
+        """
+        Schedule a coroutine on the worker loop without waiting for it. The
+        calling thread's current span stays the parent of the spans it opens.
+        """
+        loop = self._ensure_started()
+        return asyncio.run_coroutine_threadsafe(self._limited(coro, current_span()), loop)
+
+    def run(self, coro: Coroutine[Any, Any, T], timeout: Optional[float] = None) -> T:
+        """
+        Run a coroutine on the worker loop and block the calling thread until it finishes.
+
+        Args:
+            coro (Coroutine): The coroutine to run.
+            timeout (float | None): Maximum number of seconds to wait for the result.
+
+        Returns:
+            The coroutine's result.
+        """
+        return self.submit(coro).result(timeout)
+
+    def on_shutdown(self, hook: Callable[[], Awaitable[Any]]) -> None:
+        """
+        Register a coroutine function run on the loop before it stops (closing shared
+        connections and flushing buffers).
+        """
+        self._shutdown_hooks.append(hook)
+
+    def stop(self, timeout: float = 30.0) -> None:
+        """
+        Run the shutdown hooks and stop the loop thread.
+        """
+        if self.loop is None or self._pid != os.getpid() or not self.loop.is_running():
+            return
+
+        async def shutdown() -> None:
+            for hook in self._shutdown_hooks:
+                try:
+                    await hook()
+                except Exception as e:
+                    logger.warning('Worker shutdown hook failed: %s', e)
+
+        try:
+            asyncio.run_coroutine_threadsafe(shutdown(), self.loop).result(timeout)
+        finally:
+            self.loop.call_soon_threadsafe(self.loop.stop)
+            if self._thread is not None:
+                self._thread.join(timeout)
+            self.loop = None
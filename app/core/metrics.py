@@ -0,0 +1,300 @@
+import math
+import re
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Iterator, TypeVar
+
+"""
+In-process metrics rendered in the Prometheus text exposition format.
+
+The API serves them at `/metrics`; a Celery worker process serves its own on
+`WORKER_METRICS_PORT` (see `start_metrics_server`). Metrics are updated from
+the event loop and from worker threads, so every update takes the metric lock.
+"""
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+M = TypeVar('M', bound='Metric')
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_labels(names: tuple[str, ...], values: tuple[str, ...], extra: str = '') -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values, strict=True)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return '+Inf' if value > 0 else '-Inf'
+    return repr(float(value))
+
+
+class Metric:
+    """
+    Base class: a named metric with a fixed set of label names.
+    """
+
+    kind = 'untyped'
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self._lock = threading.Lock()
+
+    def _key(self, labels: dict) -> tuple[str, ...]:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f'{self.name} expects labels {self.labelnames}, got {tuple(labels)}')
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def samples(self) -> list[str]:
+        raise NotImplementedError
+
+    def render(self) -> str:
+        header = f'# HELP {self.name} {self.documentation}\n# TYPE {self.name} {self.kind}\n'
+        return header + ''.join(f'{line}\n' for line in self.samples())
+
+
+class Counter(Metric):
+    """
+    Monotonically increasing count per label set.
+    """
+
+    kind = 'counter'
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1.0, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def samples(self) -> list[str]:
+        with self._lock:
+            values = sorted(self._values.items())
+        return [
+            f'{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}'
+            for key, value in values
+        ]
+
+
+class Gauge(Metric):
+    """
+    Value that can go up and down, per label set.
+    """
+
+    kind = 'gauge'
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def set(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def inc(self, amount: float = 1.0, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def samples(self) -> list[str]:
+        with self._lock:
+            values = sorted(self._values.items())
+        return [
+            f'{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}'
+            for key, value in values
+        ]
+
+
+class Histogram(Metric):
+    """
+    Distribution of observed values in cumulative buckets, per label set.
+    """
+
+    kind = 'histogram'
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+        # Per label set: per-bucket (non-cumulative) counts, sum and count.
+        self._values: dict[tuple[str, ...], tuple[list[int], list[float]]] = {}
+
+    def observe(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        index = next(i for i, bound in enumerate(self.buckets) if value <= bound)
+        with self._lock:
+            counts, total = self._values.setdefault(key, ([0] * len(self.buckets), [0.0]))
+            counts[index] += 1
+            total[0] += value
+
+    @contextmanager
+    def time(self, **labels) -> Iterator[None]:
+        """
+        Observe the wall time spent in the block (also when it raises).
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def count(self, **labels) -> int:
+        counts, _ = self._values.get(self._key(labels), ([0], [0.0]))
+        return sum(counts)
+
+    def samples(self) -> list[str]:
+        with self._lock:
+            values = sorted((key, (list(c), t[0])) for key, (c, t) in self._values.items())
+        lines = []
+        for key, (counts, total) in values:
+            cumulative = 0
+            for bound, count in zip(self.buckets, counts, strict=True):
+                cumulative += count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(
+                    f'{self.name}_bucket{_format_labels(self.labelnames, key, le)} {cumulative}'
+                )
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f'{self.name}_sum{labels} {_format_value(total)}')
+            lines.append(f'{self.name}_count{labels} {cumulative}')
+        return lines
+
+
+class Registry:
+    """
+    Collection of metrics rendered together.
+    """
+
+    def __init__(self):
+        self._metrics: dict[str, Metric] = {}
+
+    def register(self, metric: M) -> M:
+        if metric.name in self._metrics:
+            raise ValueError(f'Metric {metric.name} is already registered')
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()) -> Counter:
+        return self.register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()) -> Gauge:
+        return self.register(Gauge(name, documentation, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+
+    def render(self) -> str:
+        return ''.join(metric.render() for metric in self._metrics.values())
+
+
+def key_family(key: str) -> str:
+    """
+    Cache key family: the key without its variable parts (netuids, hotkeys, hashes),
+    e.g. `dividends:18:netuid:5F...:hotkey` -> `dividends:netuid:hotkey`.
+    """
+    return ':'.join(part for part in key.split(':') if re.fullmatch(r'[a-z_]+', part)) or 'other'
+
+
+def start_metrics_server(port: int, registry: 'Registry | None' = None) -> ThreadingHTTPServer:
+    """
+    Serve `registry` (the default one) on `port` from a daemon thread, for
+    processes without an HTTP server of their own (Celery workers).
+    """
+    source = registry or REGISTRY
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:
+            body = source.render().encode()
+            self.send_response(200)
+            self.send_header('Content-Type', CONTENT_TYPE)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args) -> None:
+            pass
+
+    server = ThreadingHTTPServer(('0.0.0.0', port), Handler)
+    threading.Thread(target=server.serve_forever, name='metrics-server', daemon=True).start()
+    return server
+
+
+REGISTRY = Registry()
+
+http_request_duration = REGISTRY.histogram(
+    'http_request_duration_seconds',
+    'HTTP request latency by route, method and status code.',
+    ('route', 'method', 'status'),
+)
+tao_dividends_duration = REGISTRY.histogram(
+    'tao_dividends_duration_seconds',
+    'Latency of /tao_dividends by lookup mode (all, netuid, hotkey, pair) and trade flag.',
+    ('mode', 'trade'),
+)
+cache_requests = REGISTRY.counter(
+    'cache_requests_total',
+    'Redis cache lookups by key family and result (hit, miss, stale).',
+    ('family', 'result'),
+)
+query_map_duration = REGISTRY.histogram(
+    'substrate_query_map_duration_seconds',
+    'Duration of substrate query_map scans, including iteration, by scope.',
+    ('scope',),
+)
+query_map_entries = REGISTRY.histogram(
+    'substrate_query_map_entries',
+    'Entries returned by substrate query_map scans, by scope.',
+    ('scope',),
+    buckets=(1, 10, 100, 1000, 10000, 100000),
+)
+upstream_duration = REGISTRY.histogram(
+    'upstream_request_duration_seconds',
+    'Latency of calls to Datura, Chutes and the substrate node, by outcome.',
+    ('upstream', 'outcome'),
+)
+upstream_errors = REGISTRY.counter(
+    'upstream_errors_total',
+    'Failed calls to Datura, Chutes and the substrate node, by exception type.',
+    ('upstream', 'error'),
+)
+task_duration = REGISTRY.histogram(
+    'celery_task_duration_seconds',
+    'Celery task (pipeline stage) run time by task name and final state.',
+    ('task', 'state'),
+)
+db_write_duration = REGISTRY.histogram(
+    'db_write_duration_seconds',
+    'Latency of database writes by table.',
+    ('table',),
+)
+db_write_rows = REGISTRY.counter(
+    'db_write_rows_total',
+    'Rows written to the database by table.',
+    ('table',),
+)
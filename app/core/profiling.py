@@ -0,0 +1,126 @@
+import cProfile
+import io
+import marshal
+import pstats
+import random
+import time
+import uuid
+from collections import deque
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+from app.core.config import settings
+
+"""
+On-demand cProfile captures of single API requests.
+
+A request is profiled when an authenticated caller asks for it (`X-Profile: 1`
+header or `?profile=1`) or when it is picked by `PROFILE_SAMPLE_RATE`. Captures
+are kept in a bounded in-memory ring buffer per API process and served by the
+admin endpoints under `/api/v1/admin/profiles`.
+"""
+
+TRUTHY = {'1', 'true', 'yes', 'on'}
+
+
+class RequestProfiler:
+    """
+    Profiles requests with cProfile and keeps the last `capacity` captures.
+
+    cProfile hooks the event loop thread, so every coroutine that runs while a
+    profiled request is in flight shows up in its capture. Only one request is
+    profiled at a time; requests arriving meanwhile simply run unprofiled.
+    """
+
+    def __init__(self, capacity: int, sample_rate: float, report_lines: int):
+        self.sample_rate = sample_rate
+        self.report_lines = report_lines
+        self._captures: deque[dict] = deque(maxlen=capacity)
+        self._active = False
+
+    def trigger(self, requested: bool, authorized: bool) -> Optional[str]:
+        """
+        Decide whether to profile a request.
+
+        Args:
+            requested (bool): Whether the caller asked for a profile.
+            authorized (bool): Whether the caller presented a valid token; requests
+                for a profile without one are ignored.
+
+        Returns:
+            str | None: `request` or `sample`, or None to run the request unprofiled.
+        """
+        if requested and authorized:
+            return 'request'
+        if self.sample_rate > 0 and random.random() < self.sample_rate:
+            return 'sample'
+        return None
+
+    @contextmanager
+    def profile(self) -> Iterator[Optional[cProfile.Profile]]:
+        """
+        Profile the block, yielding None if another capture is already running.
+        """
+        if self._active:
+            yield None
+            return
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError:
+            # Another profiler (e.g. a debugger) owns the hook.
+            yield None
+            return
+        self._active = True
+        try:
+            yield profile
+        finally:
+            profile.disable()
+            self._active = False
+
+    def record(self, profile: cProfile.Profile, **info) -> str:
+        """
+        Store a finished capture with its request details.
+
+        Args:
+            profile (cProfile.Profile): The disabled profile.
+            **info: Request details (method, path, status, duration_ms, trigger).
+
+        Returns:
+            str: The capture ID.
+        """
+        report = io.StringIO()
+        stats = pstats.Stats(profile, stream=report)
+        stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(self.report_lines)
+        capture_id = uuid.uuid4().hex[:16]
+        self._captures.append({
+            'id': capture_id,
+            'captured_at': time.time(),
+            **info,
+            'calls': stats.total_calls,  # type: ignore[attr-defined]
+            'report': report.getvalue(),
+            # Same format as `cProfile.Profile.dump_stats`, loadable with pstats/snakeviz.
+            'pstats': marshal.dumps(stats.stats),  # type: ignore[attr-defined]
+        })
+        return capture_id
+
+    def list(self) -> list[dict]:
+        """
+        Summaries of the stored captures, newest first.
+        """
+        return [
+            {key: value for key, value in capture.items() if key not in ('report', 'pstats')}
+            for capture in reversed(self._captures)
+        ]
+
+    def get(self, capture_id: str) -> Optional[dict]:
+        return next((c for c in self._captures if c['id'] == capture_id), None)
+
+
+def profile_requested(header: Optional[str], query: Optional[str]) -> bool:
+    return (header or query or '').strip().lower() in TRUTHY
+
+
+profiler = RequestProfiler(
+    settings.profile_buffer_size, settings.profile_sample_rate, settings.profile_report_lines
+)
@@ -0,0 +1,382 @@
+import atexit
+import logging
+import os
+import queue
+import random
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Iterator, Optional
+
+import httpx
+import orjson
+
+from app.core.config import settings
+
+"""
+Lightweight distributed tracing.
+
+Spans are timed with `span(name, **attributes)`; the active span lives in a
+context variable, so nested spans (also across awaits and tasks) become its
+children. Context crosses process boundaries as a W3C `traceparent`: read from
+incoming API requests, added to outbound HTTP requests and carried in Celery
+task headers (see `inject` / `extract`). Finished spans are queued and written
+by a background thread, either as JSON Lines to a local file or as OTLP/HTTP
+JSON to a collector, so tracing works offline and never blocks a request.
+"""
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class Span:
+    name: str
+    trace_id: str
+    span_id: str
+    parent_id: Optional[str]
+    sampled: bool
+    start_ns: int = field(default_factory=time.time_ns)
+    end_ns: Optional[int] = None
+    attributes: dict[str, Any] = field(default_factory=dict)
+    error: Optional[str] = None
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    @property
+    def traceparent(self) -> str:
+        return f'00-{self.trace_id}-{self.span_id}-{"01" if self.sampled else "00"}'
+
+    def to_dict(self, service: str) -> dict:
+        return {
+            'service': service,
+            'name': self.name,
+            'trace_id': self.trace_id,
+            'span_id': self.span_id,
+            'parent_id': self.parent_id,
+            'start_ns': self.start_ns,
+            'end_ns': self.end_ns,
+            'duration_ms': ((self.end_ns or self.start_ns) - self.start_ns) / 1e6,
+            'attributes': self.attributes,
+            'error': self.error,
+        }
+
+
+@dataclass(frozen=True)
+class RemoteContext:
+    """
+    Parent span received from another process through a `traceparent`.
+    """
+
+    trace_id: str
+    span_id: str
+    sampled: bool
+
+    @property
+    def traceparent(self) -> str:
+        return f'00-{self.trace_id}-{self.span_id}-{"01" if self.sampled else "00"}'
+
+
+class NonRecordingSpan:
+    """
+    Stand-in yielded by `span` while tracing is disabled.
+    """
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        pass
+
+
+NON_RECORDING = NonRecordingSpan()
+_current: ContextVar[Optional[Span | RemoteContext]] = ContextVar('current_span', default=None)
+
+
+class JsonlExporter:
+    """
+    Appends spans as JSON Lines to a local file.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def export(self, spans: list[dict]) -> None:
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(self.path, 'ab') as output:
+            output.write(b''.join(orjson.dumps(span) + b'\n' for span in spans))
+
+
+class OtlpHttpExporter:
+    """
+    Sends spans to an OpenTelemetry collector with OTLP/HTTP (JSON encoding).
+    """
+
+    def __init__(self, endpoint: str):
+        self.endpoint = endpoint
+        self.client = httpx.Client(timeout=5.0)
+
+    @staticmethod
+    def _value(value: Any) -> dict:
+        if isinstance(value, bool):
+            return {'boolValue': value}
+        if isinstance(value, int):
+            return {'intValue': str(value)}
+        if isinstance(value, float):
+            return {'doubleValue': value}
+        return {'stringValue': str(value)}
+
+    def export(self, spans: list[dict]) -> None:
+        by_service: dict[str, list[dict]] = {}
+        for span in spans:
+            by_service.setdefault(span['service'], []).append({
+                'traceId': span['trace_id'],
+                'spanId': span['span_id'],
+                'parentSpanId': span['parent_id'] or '',
+                'name': span['name'],
+                'kind': 1,
+                'startTimeUnixNano': str(span['start_ns']),
+                'endTimeUnixNano': str(span['end_ns']),
+                'attributes': [
+                    {'key': key, 'value': self._value(value)}
+                    for key, value in span['attributes'].items()
+                ],
+                'status': {'code': 2, 'message': span['error']} if span['error'] else {},
+            })
+        payload = {
+            'resourceSpans': [
+                {
+                    'resource': {
+                        'attributes': [{'key': 'service.name', 'value': {'stringValue': service}}]
+                    },
+                    'scopeSpans': [{'scope': {'name': 'app'}, 'spans': otlp_spans}],
+                }
+                for service, otlp_spans in by_service.items()
+            ]
+        }
+        self.client.post(self.endpoint, json=payload).raise_for_status()
+
+
+class Tracer:
+    """
+    Creates spans and hands finished ones to the exporter thread.
+
+    Disabled (no exporter) by default: `span` then records nothing and the
+    context of an incoming request is passed on unchanged.
+    """
+
+    BATCH_SIZE = 512
+    FLUSH_INTERVAL = 1.0
+    MAX_QUEUE = 10000
+
+    def __init__(self):
+        self.service = 'app'
+        self.sample_rate = 1.0
+        self.exporter: JsonlExporter | OtlpHttpExporter | None = None
+        self._queue: queue.Queue = queue.Queue(maxsize=self.MAX_QUEUE)
+        self._thread: Optional[threading.Thread] = None
+        self._pid: Optional[int] = None
+        self._lock = threading.Lock()
+        self.dropped = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.exporter is not None
+
+    def configure(
+        self,
+        service: str,
+        exporter: str,
+        path: str,
+        endpoint: str,
+        sample_rate: float,
+    ) -> None:
+        """
+        Select the exporter (`none`, `file` or `otlp`) for this process.
+        """
+        self.service = service
+        self.sample_rate = sample_rate
+        if exporter == 'file':
+            self.exporter = JsonlExporter(path)
+        elif exporter == 'otlp':
+            self.exporter = OtlpHttpExporter(endpoint)
+        else:
+            self.exporter = None
+
+    def _ensure_thread(self) -> None:
+        # Started lazily and per process, so forked workers get their own.
+        if self._thread is not None and self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._thread is None or self._pid != os.getpid():
+                self._queue = queue.Queue(maxsize=self.MAX_QUEUE)
+                self._thread = threading.Thread(target=self._run, name='trace-export', daemon=True)
+                self._pid = os.getpid()
+                self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.FLUSH_INTERVAL
+            while len(batch) < self.BATCH_SIZE:
+                try:
+                    batch.append(self._queue.get(timeout=max(0.0, deadline - time.monotonic())))
+                except queue.Empty:
+                    break
+            self._export(batch)
+
+    def _export(self, batch: list[dict]) -> None:
+        try:
+            if self.exporter is not None:
+                self.exporter.export(batch)
+        except Exception as e:
+            logger.warning('Could not export %s spans: %s', len(batch), e)
+
+    def flush(self) -> None:
+        """
+        Export the spans still queued (at shutdown).
+        """
+        batch = []
+        while True:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        if batch:
+            self._export(batch)
+
+    def _finish(self, span: Span) -> None:
+        span.end_ns = time.time_ns()
+        if not span.sampled or self.exporter is None:
+            return
+        self._ensure_thread()
+        try:
+            self._queue.put_nowait(span.to_dict(self.service))
+        except queue.Full:
+            self.dropped += 1
+
+    def start(self, name: str, parent: Span | RemoteContext | None = None, **attributes) -> Span:
+        """
+        Start a span without making it current (see `span` for the usual form).
+        """
+        parent = parent if parent is not None else _current.get()
+        if parent is None:
+            trace_id = os.urandom(16).hex()
+            sampled = self.enabled and random.random() < self.sample_rate
+        else:
+            trace_id, sampled = parent.trace_id, parent.sampled
+        return Span(
+            name=name,
+            trace_id=trace_id,
+            span_id=os.urandom(8).hex(),
+            parent_id=parent.span_id if parent is not None else None,
+            sampled=sampled,
+            attributes=attributes,
+        )
+
+    def end(self, span: Span, error: BaseException | None = None) -> None:
+        if error is not None:
+            span.error = f'{type(error).__name__}: {error}'
+        self._finish(span)
+
+    @contextmanager
+    def span(
+        self, name: str, parent: Span | RemoteContext | None = None, **attributes
+    ) -> Iterator[Span | NonRecordingSpan]:
+        """
+        Time a block as a child of the current span (or of `parent`).
+
+        Args:
+            name (str): Operation name, e.g. `redis.GET` or `substrate.query_map`.
+            parent (Span | RemoteContext | None): Explicit parent, e.g. extracted
+                from a `traceparent`.
+            **attributes: Span attributes.
+
+        Yields:
+            Span | NonRecordingSpan: The active span.
+        """
+        if self.exporter is None:
+            token = _current.set(parent) if parent is not None else None
+            try:
+                yield NON_RECORDING
+            finally:
+                if token is not None:
+                    _current.reset(token)
+            return
+        span = self.start(name, parent, **attributes)
+        token = _current.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            self.end(span, e)
+            raise
+        else:
+            self.end(span)
+        finally:
+            _current.reset(token)
+
+
+def current_span() -> Span | RemoteContext | None:
+    return _current.get()
+
+
+def activate(span: Span | RemoteContext | None):
+    """
+    Make a span current; returns the token to pass to `deactivate`.
+    """
+    return _current.set(span)
+
+
+def deactivate(token) -> None:
+    _current.reset(token)
+
+
+def inject(headers: dict) -> None:
+    """
+    Add the `traceparent` of the current span to outgoing headers.
+    """
+    span = _current.get()
+    if span is not None:
+        headers['traceparent'] = span.traceparent
+
+
+def extract(traceparent: str | None) -> RemoteContext | None:
+    """
+    Parse a W3C `traceparent` header.
+
+    Returns:
+        RemoteContext | None: The remote parent, or None if the header is missing or
+        malformed.
+    """
+    if not traceparent:
+        return None
+    parts = traceparent.strip().split('-')
+    if len(parts) != 4 or len(parts[1]) != 32 or len(parts[2]) != 16:
+        return None
+    try:
+        int(parts[1], 16), int(parts[2], 16)
+        sampled = bool(int(parts[3], 16) & 1)
+    except ValueError:
+        return None
+    return RemoteContext(trace_id=parts[1], span_id=parts[2], sampled=sampled)
+
+
+def configure_tracing(service: str) -> None:
+    """
+    Configure the process-wide tracer from the settings.
+
+    Args:
+        service (str): Service name recorded on every span (`api`, `worker`).
+    """
+    tracer.configure(
+        service,
+        settings.tracing_exporter,
+        settings.tracing_file,
+        settings.tracing_otlp_endpoint,
+        settings.tracing_sample_rate,
+    )
+
+
+tracer = Tracer()
+atexit.register(tracer.flush)
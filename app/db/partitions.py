@@ -0,0 +1,206 @@
+from datetime import datetime, timezone
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+"""
+Monthly range partitioning of the `stakeaction` table (PostgreSQL only).
+
+The parent table is partitioned by `timestamp`, with one partition per calendar
+month (`stakeaction_y2025m06`) and a default partition catching rows outside
+every month created so far. Partitions are created some months ahead and those
+older than the retention period are dropped whole, instead of deleting rows.
+"""
+
+TABLE = 'stakeaction'
+DEFAULT_PARTITION = f'{TABLE}_default'
+# Serializes the one-time conversion when several processes start at once.
+ADVISORY_LOCK_ID = 7_412_903
+
+PARENT_DDL = f"""
+CREATE TABLE {TABLE} (
+    id INTEGER NOT NULL DEFAULT nextval('{TABLE}_id_seq'),
+    timestamp TIMESTAMP WITHOUT TIME ZONE NOT NULL,
+    netuid INTEGER NOT NULL,
+    hotkey VARCHAR NOT NULL,
+    sentiment FLOAT NOT NULL,
+    stake_type VARCHAR NOT NULL,
+    tao_amount FLOAT NOT NULL,
+    status VARCHAR NOT NULL,
+    error_message VARCHAR,
+    extrinsic_hash VARCHAR,
+    PRIMARY KEY (id, timestamp)
+) PARTITION BY RANGE (timestamp)
+"""
+
+COLUMNS = (
+    'id, timestamp, netuid, hotkey, sentiment, stake_type, tao_amount, status, '
+    'error_message, extrinsic_hash'
+)
+
+
+def month_start(value: datetime) -> datetime:
+    return value.replace(day=1, hour=0, minute=0, second=0, microsecond=0, tzinfo=None)
+
+
+def add_months(month: datetime, months: int) -> datetime:
+    index = month.year * 12 + month.month - 1 + months
+    return month.replace(year=index // 12, month=index % 12 + 1)
+
+
+def partition_name(month: datetime) -> str:
+    return f'{TABLE}_y{month.year:04d}m{month.month:02d}'
+
+
+def partition_month(name: str) -> datetime | None:
+    """
+    Month covered by a partition, or None if the name is not a monthly partition.
+    """
+    try:
+        return datetime.strptime(name.removeprefix(f'{TABLE}_'), 'y%Ym%m')
+    except ValueError:
+        return None
+
+
+def expired_partitions(names: list[str], now: datetime, retention_months: int) -> list[str]:
+    """
+    Monthly partitions whose whole range is older than the retention period.
+
+    Args:
+        names (list[str]): Names of the existing partitions.
+        now (datetime): Current time (naive UTC).
+        retention_months (int): Months of history to keep besides the current one.
+
+    Returns:
+        list[str]: Partitions that can be dropped, oldest first.
+    """
+    cutoff = add_months(month_start(now), -retention_months)
+    months = {name: partition_month(name) for name in names}
+    return sorted(name for name, month in months.items() if month is not None and month < cutoff)
+
+
+async def _relkind(conn: AsyncConnection, name: str) -> str | None:
+    result = await conn.execute(
+        text("SELECT relkind FROM pg_class WHERE relname = :name AND relkind IN ('r', 'p')"),
+        {'name': name},
+    )
+    return result.scalar()
+
+
+async def list_partitions(conn: AsyncConnection) -> list[str]:
+    result = await conn.execute(
+        text(
+            'SELECT child.relname FROM pg_inherits '
+            'JOIN pg_class parent ON pg_inherits.inhparent = parent.oid '
+            'JOIN pg_class child ON pg_inherits.inhrelid = child.oid '
+            'WHERE parent.relname = :table'
+        ),
+        {'table': TABLE},
+    )
+    return [row[0] for row in result]
+
+
+async def _create_partition(
+    conn: AsyncConnection, name: str, lower: datetime, upper: datetime
+) -> None:
+    """
+    Create one monthly partition, moving the rows the default partition holds for it.
+
+    PostgreSQL refuses to attach a range that rows in the default partition fall
+    into, so the default is detached while those rows move to the new partition.
+    """
+    bounds = f"FOR VALUES FROM ('{lower.isoformat()}') TO ('{upper.isoformat()}')"
+    in_range = f"timestamp >= '{lower.isoformat()}' AND timestamp < '{upper.isoformat()}'"
+    stray = await conn.execute(
+        text(f'SELECT EXISTS (SELECT 1 FROM {DEFAULT_PARTITION} WHERE {in_range})')
+    )
+    if not stray.scalar():
+        await conn.execute(text(f'CREATE TABLE IF NOT EXISTS {name} PARTITION OF {TABLE} {bounds}'))
+        return
+
+    await conn.execute(text(f'ALTER TABLE {TABLE} DETACH PARTITION {DEFAULT_PARTITION}'))
+    await conn.execute(text(f'CREATE TABLE {name} PARTITION OF {TABLE} {bounds}'))
+    await conn.execute(
+        text(
+            f'INSERT INTO {name} ({COLUMNS}) '
+            f'SELECT {COLUMNS} FROM {DEFAULT_PARTITION} WHERE {in_range}'
+        )
+    )
+    await conn.execute(text(f'DELETE FROM {DEFAULT_PARTITION} WHERE {in_range}'))
+    await conn.execute(text(f'ALTER TABLE {TABLE} ATTACH PARTITION {DEFAULT_PARTITION} DEFAULT'))
+
+
+async def create_partitions(conn: AsyncConnection, first: datetime, last: datetime) -> None:
+    """
+    Create the monthly partitions from `first` to `last` (inclusive) that are missing.
+    """
+    month = month_start(first)
+    while month <= last:
+        upper = add_months(month, 1)
+        name = partition_name(month)
+        if await _relkind(conn, name) is None:
+            await _create_partition(conn, name, month, upper)
+        month = upper
+
+
+async def ensure_partitioned(conn: AsyncConnection, months_ahead: int) -> None:
+    """
+    Create the partitioned `stakeaction` table, converting an existing plain table.
+
+    A plain table from earlier releases is renamed, its rows are copied into the
+    monthly partitions and it is dropped; ids keep coming from the same sequence.
+    Runs before `create_all`, which then leaves the table alone.
+    """
+    await conn.execute(text(f'SELECT pg_advisory_xact_lock({ADVISORY_LOCK_ID})'))
+    kind = await _relkind(conn, TABLE)
+    if kind == 'p':
+        return
+
+    legacy = f'{TABLE}_legacy'
+    await conn.execute(text(f'CREATE SEQUENCE IF NOT EXISTS {TABLE}_id_seq'))
+    if kind == 'r':
+        await conn.execute(text(f'ALTER SEQUENCE {TABLE}_id_seq OWNED BY NONE'))
+        await conn.execute(text(f'ALTER TABLE {TABLE} RENAME TO {legacy}'))
+        await conn.execute(
+            text(f'ALTER TABLE {legacy} ADD COLUMN IF NOT EXISTS extrinsic_hash VARCHAR')
+        )
+        # The primary key index keeps the parent's name; free it for the new table.
+        await conn.execute(text(f'ALTER INDEX IF EXISTS {TABLE}_pkey RENAME TO {legacy}_pkey'))
+    await conn.execute(text(PARENT_DDL))
+    await conn.execute(text(f'ALTER SEQUENCE {TABLE}_id_seq OWNED BY {TABLE}.id'))
+    await conn.execute(text(f'CREATE TABLE {DEFAULT_PARTITION} PARTITION OF {TABLE} DEFAULT'))
+
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    first = now
+    if kind == 'r':
+        oldest = (await conn.execute(text(f'SELECT min(timestamp) FROM {legacy}'))).scalar()
+        first = min(oldest or now, now)
+    await create_partitions(conn, first, add_months(month_start(now), months_ahead))
+
+    if kind == 'r':
+        await conn.execute(text(f'INSERT INTO {TABLE} ({COLUMNS}) SELECT {COLUMNS} FROM {legacy}'))
+        await conn.execute(text(f'DROP TABLE {legacy}'))
+
+
+async def maintain_partitions(
+    conn: AsyncConnection, months_ahead: int, retention_months: int
+) -> list[str]:
+    """
+    Create the partitions for the coming months and drop the expired ones.
+
+    Args:
+        conn (AsyncConnection): Connection inside a transaction.
+        months_ahead (int): Months to create past the current one.
+        retention_months (int): Months of history to keep; 0 keeps everything.
+
+    Returns:
+        list[str]: Names of the dropped partitions.
+    """
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    await create_partitions(conn, now, add_months(month_start(now), months_ahead))
+    if retention_months <= 0:
+        return []
+    dropped = expired_partitions(await list_partitions(conn), now, retention_months)
+    for name in dropped:
+        await conn.execute(text(f'DROP TABLE IF EXISTS {name}'))
+    return dropped
@@ -1,6 +1,7 @@
 import asyncio
 from typing import Any, AsyncGenerator
 
+from sqlalchemy import Connection, text
 from sqlalchemy.ext.asyncio import (
     AsyncEngine,
     AsyncSession,
@@ -10,6 +11,9 @@ from sqlalchemy.ext.asyncio import (
 from sqlmodel import SQLModel
 
 from app.core.config import settings
+from app.db.partitions import ensure_partitioned
+from app.models.stake_action import StakeAction  # noqa: F401
+from app.models.stake_action_hourly import StakeActionHourly  # noqa: F401
 
 """
 Async database session management using SQLModel and SQLAlchemy.
@@ -18,11 +22,17 @@ Async database session management using SQLModel and SQLAlchemy.
 DATABASE_URL: str = settings.database_url
 engine: AsyncEngine = create_async_engine(
     DATABASE_URL,
-    echo=True,
+    # SQL echo goes through the logging pipeline instead (DATABASE_ECHO).
+    echo=False,
     pool_size=10,
     max_overflow=20,
 )
 
+# Columns added after the first release; `create_all` does not alter existing tables.
+ADDED_COLUMNS: list[str] = [
+    'ALTER TABLE stakeaction ADD COLUMN IF NOT EXISTS extrinsic_hash VARCHAR',
+]
+
 async_session: Any = async_sessionmaker(
     engine,
     class_=AsyncSession,
@@ -30,6 +40,15 @@ async_session: Any = async_sessionmaker(
 )
 
 
+def create_missing_indexes(conn: Connection) -> None:
+    """
+    Create the indexes declared on the models that existing tables lack.
+    """
+    for table in SQLModel.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(conn, checkfirst=True)
+
+
 async def get_session() -> AsyncGenerator[AsyncSession, None]:
     """
     Yield an async database session to be used in FastAPI dependencies.
@@ -58,7 +77,13 @@ async def init_db(
     for _ in range(retries):
         try:
             async with engine.begin() as conn:
+                if settings.stake_partitioning and conn.dialect.name == 'postgresql':
+                    await ensure_partitioned(conn, settings.stake_partition_months_ahead)
                 await conn.run_sync(SQLModel.metadata.create_all)
+                for statement in ADDED_COLUMNS:
+                    await conn.execute(text(statement))
+                # `create_all` only creates indexes together with their table.
+                await conn.run_sync(create_missing_indexes)
             return
         except Exception as _:
             await asyncio.sleep(delay)
@@ -0,0 +1,8 @@
+from app.core.config import settings
+from app.db.stake_action_writer import StakeActionWriter
+
+stake_action_writer = StakeActionWriter(
+    max_batch=settings.stake_write_batch_size,
+    flush_interval=settings.stake_write_flush_interval,
+    spill_path=settings.stake_write_spill_path,
+)
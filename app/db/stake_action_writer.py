@@ -0,0 +1,172 @@
+import asyncio
+import logging
+import os
+from datetime import datetime
+
+import orjson
+from sqlalchemy import insert
+
+from app.core.metrics import db_write_duration, db_write_rows
+from app.core.tracing import activate, tracer
+from app.db.session import async_session
+from app.models.stake_action import StakeAction
+
+logger = logging.getLogger(__name__)
+
+
+class StakeActionWriter:
+    """
+    Write-behind buffer for `StakeAction` rows.
+
+    Rows are stamped when they are added and written in batches with one
+    multi-row INSERT: as soon as `max_batch` rows are buffered, or every
+    `flush_interval` seconds otherwise. A batch that cannot be written is
+    appended to a JSON Lines spill file, which is replayed into the table when
+    the flusher starts and after every flush that reaches the database. Spilled
+    lines that cannot be parsed are moved to `{spill_path}.bad`. `close` writes
+    whatever is still buffered.
+    """
+
+    def __init__(self, max_batch: int, flush_interval: float, spill_path: str):
+        self.max_batch = max_batch
+        self.flush_interval = flush_interval
+        self.spill_path = spill_path
+        self._buffer: list[dict] = []
+        self._flusher: asyncio.Task | None = None
+        self._pending: set[asyncio.Task] = set()
+
+    def add(self, **fields) -> None:
+        """
+        Buffer a stake action; takes the same fields as `StakeAction`.
+        """
+        self._buffer.append(StakeAction(**fields).model_dump(exclude={'id'}))
+        self._ensure_flusher()
+        if len(self._buffer) >= self.max_batch:
+            self._schedule_flush()
+
+    def _schedule_flush(self) -> asyncio.Task:
+        # Tracked so `close` waits for it: its rows are no longer in the buffer.
+        task = asyncio.ensure_future(self.flush())
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+        return task
+
+    def _ensure_flusher(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._flusher is None or self._flusher.done() or self._flusher.get_loop() is not loop:
+            self._flusher = loop.create_task(self._run())
+
+    async def _run(self) -> None:
+        # Periodic flushes are their own traces, not part of the trade that
+        # happened to start the flusher.
+        activate(None)
+        await self.replay()
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            await asyncio.shield(self._schedule_flush())
+
+    async def _insert(self, rows: list[dict]) -> None:
+        table = StakeAction.__tablename__
+        with (
+            db_write_duration.time(table=table),
+            tracer.span(f'db insert {table}', **{'db.table': table, 'db.rows': len(rows)}),
+        ):
+            async with async_session() as session:
+                await session.execute(insert(StakeAction), rows)
+                await session.commit()
+        db_write_rows.inc(len(rows), table=table)
+
+    async def flush(self) -> int:
+        """
+        Write the buffered rows, spilling them to disk if the insert fails.
+
+        Returns:
+            int: Number of rows written to the database.
+        """
+        rows, self._buffer = self._buffer, []
+        if rows:
+            try:
+                await self._insert(rows)
+            except Exception as e:
+                logger.error('Unable to save %s stake actions, spilling: %s', len(rows), e)
+                self._spill(rows)
+                return 0
+        # The database is (or may be) back: recover what earlier flushes spilled.
+        if os.path.exists(self.spill_path):
+            return len(rows) + await self.replay()
+        return len(rows)
+
+    def _spill(self, rows: list[dict]) -> None:
+        try:
+            self._append(self.spill_path, [orjson.dumps(row) + b'\n' for row in rows])
+        except OSError as e:
+            logger.error('Unable to spill %s stake actions: %s', len(rows), e)
+
+    @staticmethod
+    def _append(path: str, lines: list[bytes]) -> None:
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, 'ab') as spill:
+            spill.write(b''.join(lines))
+
+    @staticmethod
+    def _parse(line: bytes) -> dict:
+        row = orjson.loads(line)
+        row['timestamp'] = datetime.fromisoformat(row['timestamp'])
+        return row
+
+    async def replay(self) -> int:
+        """
+        Insert the rows spilled by earlier failed flushes.
+
+        Returns:
+            int: Number of rows recovered.
+        """
+        replaying = f'{self.spill_path}.{os.getpid()}.replay'
+        try:
+            os.rename(self.spill_path, replaying)
+        except FileNotFoundError:
+            return 0
+        rows, bad = [], []
+        with open(replaying, 'rb') as spill:
+            for line in spill:
+                if not line.strip():
+                    continue
+                try:
+                    rows.append(self._parse(line))
+                except (orjson.JSONDecodeError, KeyError, TypeError, ValueError):
+                    bad.append(line if line.endswith(b'\n') else line + b'\n')
+        if bad:
+            # A truncated or corrupt line must not block the rest of the file.
+            logger.error('Quarantining %s unreadable spilled stake actions', len(bad))
+            try:
+                self._append(f'{self.spill_path}.bad', bad)
+            except OSError as e:
+                logger.error('Unable to quarantine spilled stake actions: %s', e)
+        try:
+            if rows:
+                await self._insert(rows)
+        except Exception as e:
+            logger.error('Unable to replay spilled stake actions: %s', e)
+            self._spill(rows)
+            rows = []
+        os.remove(replaying)
+        if rows:
+            logger.info('Recovered %s spilled stake actions', len(rows))
+        return len(rows)
+
+    async def close(self) -> None:
+        """
+        Stop the periodic flusher and write the rows still buffered.
+        """
+        if self._flusher is not None and not self._flusher.done():
+            self._flusher.cancel()
+            try:
+                await self._flusher
+            except (asyncio.CancelledError, RuntimeError):
+                pass
+        self._flusher = None
+        if self._pending:
+            await asyncio.gather(*self._pending, return_exceptions=True)
+        await self.flush()
@@ -1,22 +1,39 @@
+import logging
+import time
 from contextlib import asynccontextmanager
 from typing import cast
 
 from fastapi import FastAPI
 from fastapi.requests import Request
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse
 from slowapi import Limiter
 from slowapi.errors import RateLimitExceeded
 from slowapi.util import get_remote_address
 from starlette.types import ExceptionHandler
 
-from app.api.v1 import tao_dividends, wallets
+from app.api.v1 import (
+    profiles,
+    sentiment,
+    stake_actions,
+    tao_dividends,
+    trades,
+    upstreams,
+    wallets,
+)
 from app.cache.singleton import redis_cache
+from app.core.auth import is_authorized
+from app.core.logging import configure_logging
+from app.core.metrics import CONTENT_TYPE, REGISTRY, http_request_duration
+from app.core.profiling import profile_requested, profiler
+from app.core.tracing import configure_tracing, extract, tracer
 from app.db.session import init_db
 
 """
 Application entry point. Defines the FastAPI app, routes, and lifecycle events.
 """
 
+logger = logging.getLogger(__name__)
+
 
 def rate_limit_exceeded_handler(request: Request, exc: RateLimitExceeded) -> JSONResponse:
     return JSONResponse(
@@ -27,27 +44,29 @@ def rate_limit_exceeded_handler(request: Request, exc: RateLimitExceeded) -> JSO
 
 @asynccontextmanager
 async def lifespan(_: FastAPI):
-    print('Startup...', flush=True)
+    logger.info('Startup...')
     try:
         await redis_cache.connect()
     except Exception as e:
-        print(f'Redis connection error: {e}', flush=True)
+        logger.error('Redis connection error: %s', e)
 
     try:
         await init_db()
     except Exception as e:
-        print(f'Database initialization error: {e}', flush=True)
+        logger.error('Database initialization error: %s', e)
 
-    print('Startup done.', flush=True)
+    logger.info('Startup done.')
     yield
 
-    print('Shutting down...', flush=True)
+    logger.info('Shutting down...')
     try:
         await redis_cache.close()
     except Exception as e:
-        print(f'Redis shutdown error: {e}', flush=True)
+        logger.warning('Redis shutdown error: %s', e)
 
 
+configure_tracing('api')
+configure_logging('api')
 limiter = Limiter(key_func=get_remote_address)
 
 app = FastAPI(
@@ -59,8 +78,65 @@ app.state.limiter = limiter
 app.add_exception_handler(RateLimitExceeded, cast(ExceptionHandler, rate_limit_exceeded_handler))
 
 
+@app.middleware('http')
+async def record_request_duration(request: Request, call_next):
+    """
+    Observe the latency of every request, labelled with its route template, and
+    trace it as the root span (or continuation of the caller's `traceparent`).
+    """
+    start = time.perf_counter()
+    parent = extract(request.headers.get('traceparent'))
+    with tracer.span(
+        f'{request.method} {request.url.path}', parent, **{'http.method': request.method}
+    ) as span:
+        response = await call_next(request)
+        route = getattr(request.scope.get('route'), 'path', 'unmatched')
+        span.set_attribute('http.route', route)
+        span.set_attribute('http.status_code', response.status_code)
+    http_request_duration.observe(
+        time.perf_counter() - start,
+        route=route,
+        method=request.method,
+        status=response.status_code,
+    )
+    return response
+
+
+@app.middleware('http')
+async def profile_request(request: Request, call_next):
+    """
+    Capture a cProfile of the request (until its response headers are sent) when
+    an authenticated caller asks for one or it is sampled, and return the capture
+    ID in `X-Profile-Id`.
+    """
+    trigger = profiler.trigger(
+        profile_requested(request.headers.get('x-profile'), request.query_params.get('profile')),
+        is_authorized(request.headers.get('authorization')),
+    )
+    if trigger is None or request.url.path.startswith('/api/v1/admin/profiles'):
+        return await call_next(request)
+    start = time.perf_counter()
+    with profiler.profile() as profile:
+        response = await call_next(request)
+    if profile is not None:
+        response.headers['X-Profile-Id'] = profiler.record(
+            profile,
+            method=request.method,
+            path=request.url.path,
+            status=response.status_code,
+            duration_ms=(time.perf_counter() - start) * 1000,
+            trigger=trigger,
+        )
+    return response
+
+
 app.include_router(tao_dividends.router, prefix='/api/v1', tags=['tao_dividends'])
 app.include_router(wallets.router, prefix='/api/v1', tags=['wallets'])
+app.include_router(upstreams.router, prefix='/api/v1', tags=['upstreams'])
+app.include_router(trades.router, prefix='/api/v1', tags=['trades'])
+app.include_router(stake_actions.router, prefix='/api/v1', tags=['stake_actions'])
+app.include_router(sentiment.router, prefix='/api/v1', tags=['sentiment'])
+app.include_router(profiles.router, prefix='/api/v1', tags=['admin'])
 
 
 @app.get('/health')
@@ -74,6 +150,14 @@ async def health_check() -> dict:
     return {'status': 'ok'}
 
 
+@app.get('/metrics', include_in_schema=False)
+async def metrics() -> PlainTextResponse:
+    """
+    Prometheus scrape endpoint for the metrics of this API process.
+    """
+    return PlainTextResponse(REGISTRY.render(), media_type=CONTENT_TYPE)
+
+
 @app.get('/openapi.json', include_in_schema=False)
 async def get_openapi():
     from fastapi.openapi.utils import get_openapi
@@ -1,5 +1,6 @@
 from datetime import datetime, timezone
 
+from sqlalchemy import Index
 from sqlmodel import Field, SQLModel
 
 
@@ -17,8 +18,16 @@ class StakeAction(SQLModel, table=True):
         tao_amount (float): TAO amount involved in the action.
         status (str): Status of the operation ('success' or 'error').
         error_message (str | None): Error message if operation failed.
+        extrinsic_hash (str | None): Hash of the (possibly batched) extrinsic that
+            carried the action.
     """
 
+    __table_args__ = (
+        Index('ix_stakeaction_netuid_hotkey_timestamp', 'netuid', 'hotkey', 'timestamp', 'id'),
+        Index('ix_stakeaction_status_timestamp', 'status', 'timestamp', 'id'),
+        Index('ix_stakeaction_timestamp', 'timestamp', 'id'),
+    )
+
     id: int | None = Field(default=None, primary_key=True)
     timestamp: datetime = Field(
         default_factory=lambda: datetime.now(timezone.utc).replace(tzinfo=None)
@@ -30,3 +39,4 @@ class StakeAction(SQLModel, table=True):
     tao_amount: float
     status: str
     error_message: str | None = None
+    extrinsic_hash: str | None = None
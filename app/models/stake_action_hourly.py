@@ -0,0 +1,26 @@
+from datetime import datetime
+
+from sqlmodel import Field, SQLModel
+
+
+class StakeActionHourly(SQLModel, table=True):
+    """
+    SQLModel table holding hourly rollups of stake actions per subnet and status.
+
+    Attributes:
+        hour (datetime): Start of the hour (UTC).
+        netuid (int): The subnet ID.
+        status (str): Status of the rolled up actions.
+        actions (int): Number of actions.
+        staked_tao (float): TAO amount of the stake actions.
+        unstaked_tao (float): TAO amount of the unstake actions.
+        sentiment_sum (float): Sum of the sentiment scores, for averages.
+    """
+
+    hour: datetime = Field(primary_key=True)
+    netuid: int = Field(primary_key=True)
+    status: str = Field(primary_key=True)
+    actions: int
+    staked_tao: float
+    unstaked_tao: float
+    sentiment_sum: float
@@ -0,0 +1,146 @@
+import asyncio
+import time
+from typing import Any, Awaitable, Callable
+
+from bittensor import Balance
+from bittensor.core.async_subtensor import AsyncSubtensor
+
+from app.core.config import settings
+from app.core.tracing import tracer
+
+
+class AccountStateCache:
+    """
+    Block-scoped cache of the pre-trade state of the wallet coldkey.
+
+    Holds the free balance, the stake per (netuid, hotkey) and the registration
+    status per (netuid, hotkey), all read at one block hash. The chain head is
+    looked up at most once per `block_time` seconds; when it changes the cache is
+    dropped. Missing values are fetched concurrently and shared by every trade
+    asking for them in the same block, and our own submissions are applied
+    optimistically so later trades in the block see the expected balance.
+    """
+
+    def __init__(
+        self,
+        subtensor: AsyncSubtensor,
+        coldkey: str,
+        block_time: float = settings.account_state_block_time,
+    ):
+        self.subtensor = subtensor
+        self.coldkey = coldkey
+        self.block_time = block_time
+        self.block_hash: str | None = None
+        self.hits = 0
+        self.misses = 0
+        self._checked_at = 0.0
+        self._head: asyncio.Task | None = None
+        self._values: dict[tuple, asyncio.Future] = {}
+
+    async def _fetch_head(self) -> str:
+        with tracer.span('substrate get_chain_head'):
+            block_hash = await self.subtensor.substrate.get_chain_head()
+        if block_hash != self.block_hash:
+            self.block_hash = block_hash
+            self._values = {}
+        self._checked_at = time.monotonic()
+        return block_hash
+
+    async def head(self) -> str:
+        """
+        Return the block hash the cached state belongs to, refreshing it once the
+        block time has elapsed.
+        """
+        if self.block_hash is not None and time.monotonic() - self._checked_at < self.block_time:
+            return self.block_hash
+        if self._head is None or self._head.done():
+            self._head = asyncio.ensure_future(self._fetch_head())
+        return await asyncio.shield(self._head)
+
+    @staticmethod
+    async def _fetch(key: tuple, fetch: Callable[[str], Awaitable[Any]], block_hash: str) -> Any:
+        with tracer.span(f'substrate {key[0]}', block_hash=block_hash):
+            return await fetch(block_hash)
+
+    async def _cached(self, key: tuple, fetch: Callable[[str], Awaitable[Any]]) -> Any:
+        block_hash = await self.head()
+        future = self._values.get(key)
+        if future is None:
+            self.misses += 1
+            future = asyncio.ensure_future(self._fetch(key, fetch, block_hash))
+            self._values[key] = future
+        else:
+            self.hits += 1
+        try:
+            return await asyncio.shield(future)
+        except Exception:
+            if self._values.get(key) is future:
+                del self._values[key]
+            raise
+
+    def _set(self, key: tuple, value: Any) -> None:
+        future = asyncio.get_running_loop().create_future()
+        future.set_result(value)
+        self._values[key] = future
+
+    async def balance(self) -> Balance:
+        return await self._cached(
+            ('balance',),
+            lambda block_hash: self.subtensor.get_balance(self.coldkey, block_hash=block_hash),
+        )
+
+    async def stake(self, netuid: int, hotkey: str) -> Balance:
+        return await self._cached(
+            ('stake', netuid, hotkey),
+            lambda block_hash: self.subtensor.get_stake(
+                coldkey_ss58=self.coldkey, hotkey_ss58=hotkey, netuid=netuid, block_hash=block_hash
+            ),
+        )
+
+    async def registered(self, netuid: int, hotkey: str) -> bool:
+        return await self._cached(
+            ('registered', netuid, hotkey),
+            lambda block_hash: self.subtensor.is_hotkey_registered(
+                hotkey_ss58=hotkey, netuid=netuid, block_hash=block_hash
+            ),
+        )
+
+    async def get(self, netuid: int, hotkey: str) -> tuple[Balance, Balance, bool]:
+        """
+        Return the balance, stake and registration status for a trade, fetching the
+        missing ones concurrently.
+
+        Args:
+            netuid (int): The subnet ID.
+            hotkey (str): The hotkey to stake to or unstake from.
+
+        Returns:
+            tuple: Coldkey free balance, current stake and whether the hotkey is registered.
+        """
+        balance, stake, registered = await asyncio.gather(
+            self.balance(), self.stake(netuid, hotkey), self.registered(netuid, hotkey)
+        )
+        return balance, stake, registered
+
+    async def prefetch(self, pairs: list[tuple[int, str]]) -> None:
+        """
+        Load the state for many (netuid, hotkey) pairs in one concurrent round-trip.
+        """
+        await asyncio.gather(
+            self.balance(),
+            *(self.stake(netuid, hotkey) for netuid, hotkey in pairs),
+            *(self.registered(netuid, hotkey) for netuid, hotkey in pairs),
+        )
+
+    def apply(self, netuid: int, hotkey: str, amount: Balance, staked: bool) -> None:
+        """
+        Optimistically apply one of our own stake (or unstake) submissions.
+        """
+        balance = self._values.get(('balance',))
+        if balance is not None and balance.done() and not balance.exception():
+            current = balance.result()
+            self._set(('balance',), current - amount if staked else current + amount)
+        stake = self._values.get(('stake', netuid, hotkey))
+        if stake is not None and stake.done() and not stake.exception():
+            current = stake.result()
+            self._set(('stake', netuid, hotkey), current + amount if staked else current - amount)
@@ -1,17 +1,33 @@
 import asyncio
 import binascii
+import logging
 
 from async_substrate_interface import AsyncQueryMapResult
 from async_substrate_interface.async_substrate import AsyncSubstrateInterface
+from async_substrate_interface.errors import SubstrateRequestException
 from bittensor import Balance, Wallet
 from bittensor.core.async_subtensor import AsyncSubtensor
 from bittensor.core.settings import SS58_FORMAT
 from scalecodec import ss58_encode
 from scalecodec.utils.ss58 import ss58_decode
 
+from app.cache.nonce_manager import is_nonce_error
+from app.cache.singleton import nonce_manager, sentiment_history, substrate_breaker
 from app.core.config import settings
-from app.db.session import async_session
-from app.models.stake_action import StakeAction
+from app.core.metrics import query_map_duration, query_map_entries
+from app.core.tracing import tracer
+from app.db.singleton import stake_action_writer
+from app.services.account_state import AccountStateCache
+
+logger = logging.getLogger(__name__)
+
+
+def is_chain_outage(exc: BaseException) -> bool:
+    """
+    Whether a submission error means the chain endpoint is unhealthy, as opposed to
+    the node rejecting the extrinsic (bad nonce, fees, invalid call, ...).
+    """
+    return not isinstance(exc, SubstrateRequestException)
 
 
 class AsyncSubstrateService:
@@ -24,6 +40,9 @@ class AsyncSubstrateService:
     - Storing stake actions in the database.
     """
 
+    # Blocks a submitted extrinsic stays valid for (about 13 minutes).
+    EXTRINSIC_PERIOD = 64
+
     def __init__(self, url: str = settings.blockchain_url):
         self.url = url
         self.substrate: AsyncSubstrateInterface = AsyncSubstrateInterface(
@@ -40,7 +59,15 @@ class AsyncSubstrateService:
             self.wallet.create_new_coldkey(use_password=False)
         if not self.wallet.hotkey_file.exists_on_device():
             self.wallet.create_new_hotkey(use_password=False)
-        self.subtensor = AsyncSubtensor(network='test')
+        self.subtensor = AsyncSubtensor(network=self.url)
+        self.account_state = AccountStateCache(self.subtensor, self.wallet.coldkeypub.ss58_address)
+
+    async def close(self) -> None:
+        """
+        Close the websocket connections held by the substrate interface and subtensor.
+        """
+        await self.substrate.close()
+        await self.subtensor.close()
 
     async def _record_stake_action(
         self,
@@ -51,25 +78,27 @@ class AsyncSubstrateService:
         tao_amount: float,
         status: str,
         error_message: str | None = None,
-    ) -> None:
+        extrinsic_hash: str | None = None,
+    ) -> dict:
         """
-        Store a record of the stake or unstake operation in the database.
+        Queue a record of the stake or unstake operation for the buffered writer,
+        which inserts it with the rest of its batch.
+
+        Returns:
+            dict: The recorded fields, reported as the outcome of the trade.
         """
-        try:
-            async with async_session() as session:
-                action = StakeAction(
-                    netuid=netuid,
-                    hotkey=hotkey,
-                    sentiment=sentiment,
-                    stake_type=stake_type,
-                    tao_amount=tao_amount,
-                    status=status,
-                    error_message=error_message,
-                )
-                session.add(action)
-                await session.commit()
-        except Exception as e:
-            print(f'[DB ERROR] Unable to save stake action: {e}', flush=True)
+        record = {
+            'netuid': netuid,
+            'hotkey': hotkey,
+            'sentiment': sentiment,
+            'stake_type': stake_type,
+            'tao_amount': tao_amount,
+            'status': status,
+            'error_message': error_message,
+            'extrinsic_hash': extrinsic_hash,
+        }
+        stake_action_writer.add(**record)
+        return record
 
     @staticmethod
     async def exhaust(qmr):
@@ -97,28 +126,33 @@ class AsyncSubstrateService:
         try:
             if not self.substrate:
                 raise Exception('Substrate not connected')
-            qmr: AsyncQueryMapResult = await self.substrate.query_map(
-                module='SubtensorModule',
-                storage_function='TaoDividendsPerSubnet',
-            )
             results = []
-            async for k, v in qmr:
-                try:
-                    netuid: int = k[0]
-                    raw_hotkey = bytes(k[1][0])
-                    hotkey: str = ss58_encode(raw_hotkey)
-                    dividend = self._parse_dividend_value(v.value)
-
-                    if dividend is None:
-                        continue
-                    results = self._add_dividends_to_all(results, netuid, hotkey, dividend)
-                except Exception as e:
-                    print(f'[WARN] Error decoding key {k}: {e}', flush=True)
-                    continue
-
+            entries = 0
+            with query_map_duration.time(scope='all'):
+                async with substrate_breaker.protect():
+                    qmr: AsyncQueryMapResult = await self.substrate.query_map(
+                        module='SubtensorModule',
+                        storage_function='TaoDividendsPerSubnet',
+                    )
+                    async for k, v in qmr:
+                        entries += 1
+                        try:
+                            netuid: int = k[0]
+                            raw_hotkey = bytes(k[1][0])
+                            hotkey: str = ss58_encode(raw_hotkey)
+                            dividend = self._parse_dividend_value(v.value)
+
+                            if dividend is None:
+                                continue
+                            results = self._add_dividends_to_all(results, netuid, hotkey, dividend)
+                        except Exception as e:
+                            logger.warning('Error decoding key %s: %s', k, e)
+                            continue
+
+            query_map_entries.observe(entries, scope='all')
             return results
         except Exception as e:
-            print(f'[ERROR] get_all_dividends failed: {e}', flush=True)
+            logger.error('get_all_dividends failed: %s', e)
             return []
 
     async def get_dividends_for_netuid_hotkey(self, netuid: int, hotkey: str) -> float | None:
@@ -128,21 +162,21 @@ class AsyncSubstrateService:
         try:
             if not self.substrate:
                 raise Exception('Substrate not connected')
-            block_hash = await self.substrate.get_chain_head()
-
             hotkey_bytes = binascii.unhexlify(ss58_decode(hotkey, valid_ss58_format=SS58_FORMAT))
 
-            result = await self.substrate.query(
-                module='SubtensorModule',
-                storage_function='TaoDividendsPerSubnet',
-                params=[netuid, hotkey_bytes],
-                block_hash=block_hash,
-            )
+            async with substrate_breaker.protect():
+                block_hash = await self.substrate.get_chain_head()
+                result = await self.substrate.query(
+                    module='SubtensorModule',
+                    storage_function='TaoDividendsPerSubnet',
+                    params=[netuid, hotkey_bytes],
+                    block_hash=block_hash,
+                )
 
             return float(result.value) if result else None
 
         except Exception as e:
-            print(f'[ERROR] Failed to fetch dividend: {e}', flush=True)
+            logger.error('Failed to fetch dividend: %s', e)
             return None
 
     async def get_dividends_for_netuid(self, netuid: int) -> list:
@@ -152,23 +186,25 @@ class AsyncSubstrateService:
         try:
             if not self.substrate:
                 raise Exception('Substrate not connected')
-            qmr = await self.substrate.query_map(
-                module='SubtensorModule',
-                storage_function='TaoDividendsPerSubnet',
-                params=[netuid],
-            )
-
             result = []
-            async for x in qmr:
-                hotkey = ss58_encode(bytes(x[0][0]))
-                result.append({
-                    'hotkey': hotkey,
-                    'dividend': x[1].value,
-                })
+            with query_map_duration.time(scope='netuid'):
+                async with substrate_breaker.protect():
+                    qmr = await self.substrate.query_map(
+                        module='SubtensorModule',
+                        storage_function='TaoDividendsPerSubnet',
+                        params=[netuid],
+                    )
+                    async for x in qmr:
+                        hotkey = ss58_encode(bytes(x[0][0]))
+                        result.append({
+                            'hotkey': hotkey,
+                            'dividend': x[1].value,
+                        })
+            query_map_entries.observe(len(result), scope='netuid')
 
             return result
         except Exception as e:
-            print(f'[ERROR] get_dividends_for_netuid failed: {e}', flush=True)
+            logger.error('get_dividends_for_netuid failed: %s', e)
             return []
 
     @staticmethod
@@ -189,58 +225,173 @@ class AsyncSubstrateService:
         })
         return data
 
-    async def submit_stake_adjustment(self, netuid: int, hotkey: str, sentiment: float):
-        """Handle stake adjustments with automatic hotkey registration if needed"""
-        if sentiment == 0.0:
-            return False
+    async def _sign_and_submit(self, call, wait: bool):
+        """
+        Sign a call with the wallet coldkey and submit it.
+
+        Nonces come from the shared nonce manager, so several submissions from the
+        same coldkey can be in flight at once; on a stale/future nonce error the
+        counter is resynced from the chain and the submission retried once, and on
+        any other rejection the nonce is released.
+        Without `wait` the receipt is returned as soon as the node accepts the
+        extrinsic into its pool; the mortal era bounds how long it may still land.
+        """
+        substrate = self.subtensor.substrate
+        address = self.wallet.coldkeypub.ss58_address
+
+        async def chain_nonce() -> int:
+            return await substrate.get_account_next_index(address, use_cache=False)
+
+        for attempt in range(2):
+            nonce = await nonce_manager.allocate(address, chain_nonce)
+            extrinsic = await substrate.create_signed_extrinsic(
+                call=call,
+                keypair=self.wallet.coldkey,
+                era={'period': self.EXTRINSIC_PERIOD},
+                nonce=nonce,
+            )
+            try:
+                async with substrate_breaker.protect(is_chain_outage):
+                    with tracer.span(
+                        'substrate submit_extrinsic', nonce=nonce, attempt=attempt, wait=wait
+                    ):
+                        return await substrate.submit_extrinsic(
+                            extrinsic, wait_for_inclusion=wait, wait_for_finalization=wait
+                        )
+            except Exception as e:
+                if not is_nonce_error(e):
+                    # The nonce was not used: hand it back so later extrinsics from
+                    # this coldkey are not stuck in the future pool behind the gap.
+                    await nonce_manager.release(address, nonce, chain_nonce)
+                    raise
+                if attempt:
+                    raise
+                logger.warning('Nonce %s rejected (%s), resyncing', nonce, e)
+                await nonce_manager.resync(address, chain_nonce)
+
+    async def _submit_pending(
+        self,
+        netuid: int,
+        hotkey: str,
+        sentiment: float,
+        signal: float,
+        call_function: str,
+        call_params: dict,
+    ) -> dict:
+        """
+        Submit a stake call without waiting for inclusion and record it as `pending`;
+        the finalization tracker settles the row once the extrinsic is finalized.
+        `signal` sizes the trade and `sentiment` is recorded.
+
+        Returns:
+            dict: The `pending` stake action.
+        """
+        call = await self.subtensor.substrate.compose_call(
+            call_module='SubtensorModule',
+            call_function=call_function,
+            call_params=call_params,
+        )
+        receipt = await self._sign_and_submit(call, wait=False)
+        logger.info('Submitted %s: %s', call_function, receipt.extrinsic_hash)
+        self.account_state.apply(
+            netuid, hotkey, Balance.from_tao(0.01 * abs(signal)), staked=signal > 0
+        )
+        return await self._record_stake_action(
+            netuid=netuid,
+            hotkey=hotkey,
+            sentiment=sentiment,
+            stake_type='stake' if signal > 0 else 'unstake',
+            tao_amount=0.01 * abs(signal),
+            status='pending',
+            extrinsic_hash=receipt.extrinsic_hash,
+        )
+
+    @staticmethod
+    async def trading_signal(netuid: int, sentiment: float) -> float:
+        """
+        Score a trade is sized from: the latest sentiment, or with `TRADE_SIZING=ema`
+        the netuid's smoothed sentiment (falling back to the latest one).
+        """
+        if settings.trade_sizing == 'ema':
+            return await sentiment_history.smoothed(netuid, sentiment)
+        return sentiment
+
+    async def submit_stake_adjustment(self, netuid: int, hotkey: str, sentiment: float) -> dict:
+        """
+        Handle stake adjustments with automatic hotkey registration if needed.
 
+        Returns:
+            dict: The stake action recorded for the trade (type, TAO amount, status,
+            error and extrinsic hash), with status `skipped` for a neutral signal.
+        """
+        # Trades are sized from the signal; the recorded action keeps the raw score.
+        signal = await self.trading_signal(netuid, sentiment)
+        if signal == 0.0:
+            return {
+                'netuid': netuid,
+                'hotkey': hotkey,
+                'sentiment': sentiment,
+                'stake_type': None,
+                'tao_amount': 0.0,
+                'status': 'skipped',
+                'error_message': None,
+                'extrinsic_hash': None,
+            }
+
+        stake_amount_tao = 0.01 * abs(signal)
         try:
             if not self.wallet:
                 raise Exception('Wallet not connected')
 
             # Convert amount to proper Balance with explicit netuid context
-            stake_amount_tao = 0.01 * abs(sentiment)
             stake_amount = Balance.from_tao(stake_amount_tao)
 
-            # Get balances with proper units
-            coldkey_balance = await self.subtensor.get_balance(self.wallet.coldkeypub.ss58_address)
-            current_stake = await self.subtensor.get_stake(
-                coldkey_ss58=self.wallet.coldkeypub.ss58_address, hotkey_ss58=hotkey, netuid=netuid
-            )
+            # Balance, stake and registration at the current block, shared by every
+            # trade in the block and fetched concurrently when missing. Fails fast
+            # while the chain endpoint is known to be down.
+            async with substrate_breaker.protect():
+                coldkey_balance, current_stake, is_registered = await self.account_state.get(
+                    netuid, hotkey
+                )
 
-            print(f'Current coldkey balance: {coldkey_balance}')
-            print(f'Current stake for {hotkey}: {current_stake}')
-            print(f'Attempting to {"stake" if sentiment > 0 else "unstake"} {stake_amount}')
+            logger.debug('Current coldkey balance: %s', coldkey_balance)
+            logger.debug('Current stake for %s: %s', hotkey, current_stake)
+            logger.info(
+                'Attempting to %s %s',
+                'stake' if signal > 0 else 'unstake',
+                stake_amount,
+                extra={'netuid': netuid, 'hotkey': hotkey},
+            )
 
             # Check and handle hotkey registration with retries
             max_registration_attempts = 3
-            is_registered = await self.subtensor.is_hotkey_registered(
-                netuid=netuid, hotkey_ss58=hotkey
-            )
 
-            if not is_registered and sentiment > 0:  # Only register for stake operations
-                print(
-                    f'Hotkey {hotkey} not registered on subnet {netuid} - attempting registration...'
+            if not is_registered and signal > 0:  # Only register for stake operations
+                logger.info(
+                    'Hotkey %s not registered on subnet %s - attempting registration...',
+                    hotkey,
+                    netuid,
                 )
 
                 for attempt in range(max_registration_attempts):
                     try:
-                        registration_result = await self.subtensor.register(
-                            wallet=self.wallet,
-                            netuid=netuid,
-                            wait_for_inclusion=True,
-                            wait_for_finalization=True,
-                        )
+                        with tracer.span('substrate register', netuid=netuid, attempt=attempt):
+                            registration_result = await self.subtensor.register(
+                                wallet=self.wallet,
+                                netuid=netuid,
+                                wait_for_inclusion=True,
+                                wait_for_finalization=True,
+                            )
 
                         if registration_result:
-                            print(f'✅ Successfully registered hotkey (attempt {attempt + 1})')
+                            logger.info('Successfully registered hotkey (attempt %s)', attempt + 1)
                             is_registered = True
                             break
                         else:
-                            print(f'⚠️ Registration attempt {attempt + 1} failed')
+                            logger.warning('Registration attempt %s failed', attempt + 1)
 
                     except Exception as e:
-                        print(f'⚠️ Registration attempt {attempt + 1} error: {str(e)}')
+                        logger.warning('Registration attempt %s error: %s', attempt + 1, e)
 
                     if attempt < max_registration_attempts - 1:
                         await asyncio.sleep(5)  # Wait before retry
@@ -248,26 +399,25 @@ class AsyncSubstrateService:
             if not is_registered:
                 error_msg = (
                     'Hotkey not registered'
-                    if sentiment > 0
+                    if signal > 0
                     else 'Cannot unstake - hotkey not registered'
                 )
-                print(error_msg)
-                await self._record_stake_action(
+                logger.warning(error_msg, extra={'netuid': netuid, 'hotkey': hotkey})
+                return await self._record_stake_action(
                     netuid=netuid,
                     hotkey=hotkey,
                     sentiment=sentiment,
-                    stake_type='stake' if sentiment > 0 else 'unstake',
+                    stake_type='stake' if signal > 0 else 'unstake',
                     tao_amount=float(stake_amount_tao),
                     status='failed',
                     error_message=error_msg,
                 )
-                return False
 
             # Proceed with stake/unstake operation
-            if sentiment > 0:  # Stake operation
+            if signal > 0:  # Stake operation
                 if coldkey_balance < stake_amount:
-                    print(f'Insufficient balance: {coldkey_balance} < {stake_amount}')
-                    await self._record_stake_action(
+                    logger.warning('Insufficient balance: %s < %s', coldkey_balance, stake_amount)
+                    return await self._record_stake_action(
                         netuid=netuid,
                         hotkey=hotkey,
                         sentiment=sentiment,
@@ -276,20 +426,17 @@ class AsyncSubstrateService:
                         status='failed',
                         error_message='Insufficient balance',
                     )
-                    return False
 
-                result = await self.subtensor.add_stake(
-                    wallet=self.wallet,
-                    netuid=netuid,
-                    hotkey_ss58=hotkey,
-                    amount=stake_amount,
-                    wait_for_inclusion=True,
-                    wait_for_finalization=True,
-                )
+                call_function = 'add_stake'
+                call_params = {
+                    'hotkey': hotkey,
+                    'netuid': netuid,
+                    'amount_staked': stake_amount.rao,
+                }
             else:  # Unstake operation
                 if current_stake < stake_amount:
-                    print(f'Insufficient stake: {current_stake} < {stake_amount}')
-                    await self._record_stake_action(
+                    logger.warning('Insufficient stake: %s < %s', current_stake, stake_amount)
+                    return await self._record_stake_action(
                         netuid=netuid,
                         hotkey=hotkey,
                         sentiment=sentiment,
@@ -298,51 +445,224 @@ class AsyncSubstrateService:
                         status='failed',
                         error_message='Insufficient stake',
                     )
-                    return False
 
-                result = await self.subtensor.unstake(
-                    wallet=self.wallet,
-                    hotkey_ss58=hotkey,
-                    netuid=netuid,
-                    amount=stake_amount,
-                    wait_for_inclusion=True,
-                    wait_for_finalization=True,
+                call_function = 'remove_stake'
+                call_params = {
+                    'hotkey': hotkey,
+                    'netuid': netuid,
+                    'amount_unstaked': stake_amount.rao,
+                }
+
+            if settings.stake_finalization_tracking:
+                return await self._submit_pending(
+                    netuid, hotkey, sentiment, signal, call_function, call_params
                 )
+            call = await self.subtensor.substrate.compose_call(
+                call_module='SubtensorModule',
+                call_function=call_function,
+                call_params=call_params,
+            )
+            receipt = await self._sign_and_submit(call, wait=True)
+            result = await receipt.is_success
 
             if result:
-                print(f'Successfully {"staked" if sentiment > 0 else "unstaked"} {stake_amount}')
-                await self._record_stake_action(
+                logger.info(
+                    'Successfully %s %s',
+                    'staked' if signal > 0 else 'unstaked',
+                    stake_amount,
+                    extra={'netuid': netuid, 'hotkey': hotkey},
+                )
+                self.account_state.apply(netuid, hotkey, stake_amount, staked=signal > 0)
+                return await self._record_stake_action(
                     netuid=netuid,
                     hotkey=hotkey,
                     sentiment=sentiment,
-                    stake_type='stake' if sentiment > 0 else 'unstake',
+                    stake_type='stake' if signal > 0 else 'unstake',
                     tao_amount=float(stake_amount_tao),
                     status='success',
+                    extrinsic_hash=receipt.extrinsic_hash,
                 )
-                return True
             else:
-                print('Transaction failed')
-                await self._record_stake_action(
+                logger.error('Transaction failed', extra={'netuid': netuid, 'hotkey': hotkey})
+                return await self._record_stake_action(
                     netuid=netuid,
                     hotkey=hotkey,
                     sentiment=sentiment,
-                    stake_type='stake' if sentiment > 0 else 'unstake',
+                    stake_type='stake' if signal > 0 else 'unstake',
                     tao_amount=float(stake_amount_tao),
                     status='failed',
                     error_message='Transaction failed',
+                    extrinsic_hash=receipt.extrinsic_hash,
                 )
-                return False
 
         except Exception as e:
             error_msg = str(e)
-            print(f'Error in stake adjustment: {error_msg}')
-            await self._record_stake_action(
+            logger.error('Error in stake adjustment: %s', error_msg)
+            return await self._record_stake_action(
                 netuid=netuid,
                 hotkey=hotkey,
                 sentiment=sentiment,
-                stake_type='stake' if sentiment > 0 else 'unstake',
+                stake_type='stake' if signal > 0 else 'unstake',
                 tao_amount=float(stake_amount_tao),
                 status='error',
                 error_message=error_msg,
             )
-            return False
+
+    @staticmethod
+    def intent_signal(intent: dict) -> float:
+        """
+        Score an intent is sized from (its raw sentiment for intents queued without
+        a separate `signal`).
+        """
+        return intent.get('signal', intent['sentiment'])
+
+    @staticmethod
+    def net_intents(intents: list[dict]) -> dict[tuple[int, str], tuple[float, list[dict]]]:
+        """
+        Net stake and unstake intents per (netuid, hotkey).
+
+        Each intent moves `0.01 * signal` TAO (positive stakes, negative unstakes).
+
+        Args:
+            intents (list[dict]): Intents with `netuid`, `hotkey`, `sentiment` and
+                `signal`.
+
+        Returns:
+            dict: Net TAO amount and constituent intents per (netuid, hotkey).
+        """
+        netted: dict[tuple[int, str], tuple[float, list[dict]]] = {}
+        for intent in intents:
+            pair = (intent['netuid'], intent['hotkey'])
+            amount, members = netted.get(pair, (0.0, []))
+            signal = AsyncSubstrateService.intent_signal(intent)
+            netted[pair] = (amount + 0.01 * signal, [*members, intent])
+        return netted
+
+    async def _record_intents(
+        self,
+        intents: list[dict],
+        status: str,
+        error_message: str | None = None,
+        extrinsic_hash: str | None = None,
+    ) -> None:
+        for intent in intents:
+            signal = self.intent_signal(intent)
+            await self._record_stake_action(
+                netuid=intent['netuid'],
+                hotkey=intent['hotkey'],
+                sentiment=intent['sentiment'],
+                stake_type='stake' if signal > 0 else 'unstake',
+                tao_amount=0.01 * abs(signal),
+                status=status,
+                error_message=error_message,
+                extrinsic_hash=extrinsic_hash,
+            )
+
+    async def submit_stake_batch(self, intents: list[dict]) -> str | None:
+        """
+        Submit a window of stake/unstake intents as one `Utility.batch_all` extrinsic.
+
+        Opposing intents for the same (netuid, hotkey) are netted first; pairs that net
+        to zero are recorded as `netted` without touching the chain. Every constituent
+        intent is recorded as a `StakeAction` carrying the shared extrinsic hash.
+
+        Args:
+            intents (list[dict]): Intents with `netuid`, `hotkey`, `sentiment` and
+                `signal`.
+
+        Returns:
+            str | None: The extrinsic hash, or None if nothing was submitted.
+        """
+        if not intents:
+            return None
+
+        calls = []
+        included: list[dict] = []
+        settled: set[int] = set()
+
+        async def settle(members: list[dict], status: str, error: str | None = None, **kw):
+            settled.update(id(member) for member in members)
+            await self._record_intents(members, status, error, **kw)
+
+        try:
+            if not self.wallet:
+                raise Exception('Wallet not connected')
+
+            netted = self.net_intents(intents)
+            async with substrate_breaker.protect():
+                await self.account_state.prefetch(list(netted))
+                available = await self.account_state.balance()
+            submitted: list[tuple[int, str, Balance, bool]] = []
+            for (netuid, hotkey), (amount_tao, members) in netted.items():
+                amount = Balance.from_tao(abs(amount_tao))
+                if amount.rao == 0:
+                    await settle(members, 'netted')
+                    continue
+
+                if not await self.account_state.registered(netuid, hotkey):
+                    await settle(members, 'failed', 'Hotkey not registered')
+                    continue
+
+                if amount_tao > 0:
+                    if available < amount:
+                        await settle(members, 'failed', 'Insufficient balance')
+                        continue
+                    available = available - amount
+                    call_function = 'add_stake'
+                    call_params = {'hotkey': hotkey, 'netuid': netuid, 'amount_staked': amount.rao}
+                else:
+                    if await self.account_state.stake(netuid, hotkey) < amount:
+                        await settle(members, 'failed', 'Insufficient stake')
+                        continue
+                    call_function = 'remove_stake'
+                    call_params = {
+                        'hotkey': hotkey,
+                        'netuid': netuid,
+                        'amount_unstaked': amount.rao,
+                    }
+
+                calls.append(
+                    await self.subtensor.substrate.compose_call(
+                        call_module='SubtensorModule',
+                        call_function=call_function,
+                        call_params=call_params,
+                    )
+                )
+                included.extend(members)
+                submitted.append((netuid, hotkey, amount, amount_tao > 0))
+
+            if not calls:
+                return None
+
+            batch = await self.subtensor.substrate.compose_call(
+                call_module='Utility',
+                call_function='batch_all',
+                call_params={'calls': calls},
+            )
+            wait = not settings.stake_finalization_tracking
+            response = await self._sign_and_submit(batch, wait=wait)
+            extrinsic_hash = response.extrinsic_hash
+            logger.info('Submitted batch of %s stake calls: %s', len(calls), extrinsic_hash)
+            success = wait and await response.is_success
+            if not wait or success:
+                for netuid, hotkey, amount, staked in submitted:
+                    self.account_state.apply(netuid, hotkey, amount, staked)
+            if not wait:
+                await settle(included, 'pending', extrinsic_hash=extrinsic_hash)
+            elif success:
+                await settle(included, 'success', extrinsic_hash=extrinsic_hash)
+            else:
+                await settle(
+                    included,
+                    'failed',
+                    str(await response.error_message),
+                    extrinsic_hash=extrinsic_hash,
+                )
+            return extrinsic_hash
+
+        except Exception as e:
+            logger.error('Error in batched stake adjustment: %s', e)
+            await self._record_intents(
+                [intent for intent in intents if id(intent) not in settled], 'error', str(e)
+            )
+            return None
@@ -1,10 +1,16 @@
+import logging
 import re
 
-import httpx
 from httpx import RequestError
-from tenacity import retry, retry_if_exception_type, stop_after_attempt, wait_fixed
+from tenacity import retry, retry_if_exception_type, stop_after_attempt, wait_random_exponential
 
+from app.cache.circuit_breaker import is_http_outage
+from app.cache.rate_limiter import retry_after_seconds
+from app.cache.singleton import chutes_breaker, chutes_limiter
 from app.core.config import settings
+from app.core.http import get_http_client
+
+logger = logging.getLogger(__name__)
 
 
 class ChutesService:
@@ -15,7 +21,7 @@ class ChutesService:
     and handle failure gracefully with retries and fallback behavior.
     """
 
-    BASE_URL = 'https://llm.chutes.ai/v1/chat/completions'
+    BASE_URL = settings.chutes_api_url
 
     @staticmethod
     def extract_sentiment_score(response: str) -> float:
@@ -45,28 +51,38 @@ class ChutesService:
     @staticmethod
     @retry(
         stop=stop_after_attempt(settings.blockchain_max_retries),
-        wait=wait_fixed(2),
+        wait=wait_random_exponential(
+            multiplier=settings.retry_backoff_base, max=settings.retry_backoff_max
+        ),
         retry=retry_if_exception_type((RequestError, KeyError, TypeError)),
         reraise=True,
     )
     async def _call_chutes(payload: dict, headers: dict) -> dict:
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.post(
+        async with chutes_breaker.protect(is_http_outage):
+            await chutes_limiter.acquire()
+            response = await get_http_client().post(
                 ChutesService.BASE_URL,
                 json=payload,
                 headers=headers,
+                timeout=30.0,
             )
+            if response.status_code == 429:
+                await chutes_limiter.penalize(
+                    retry_after_seconds(response.headers.get('Retry-After'))
+                )
             response.raise_for_status()
-            isinstance(response.json()['choices'][0]['message']['content'], str)
-            return response.json()
+        isinstance(response.json()['choices'][0]['message']['content'], str)
+        return response.json()
 
     @staticmethod
-    async def get_sentiment_score(tweets: list[str]) -> float:
+    async def get_sentiment_score(tweets: list[str], raise_on_error: bool = False) -> float:
         """
         Evaluate the overall sentiment score of a list of tweets using Chutes API.
 
         Args:
             tweets (list[str]): A list of tweet texts.
+            raise_on_error (bool): Re-raise request failures instead of returning 0.0,
+                so callers can fall back to another engine.
 
         Returns:
             float: Sentiment score between -100 and 100.
@@ -101,5 +117,7 @@ class ChutesService:
                 data['choices'][0]['message']['content'],
             )
         except Exception as e:
-            print(f'[ERROR] {e}', flush=True)
+            if raise_on_error:
+                raise
+            logger.error('Chutes sentiment request failed: %s', e)
             return 0.0
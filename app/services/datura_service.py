@@ -1,10 +1,17 @@
+import logging
 from datetime import datetime, timezone
+from typing import Optional
 
-import httpx
 from httpx import HTTPStatusError, RequestError
-from tenacity import retry, retry_if_exception_type, stop_after_attempt, wait_fixed
+from tenacity import retry, retry_if_exception_type, stop_after_attempt, wait_random_exponential
 
+from app.cache.circuit_breaker import CircuitOpenError, is_http_outage
+from app.cache.rate_limiter import RateLimitTimeout, retry_after_seconds
+from app.cache.singleton import datura_breaker, datura_limiter, redis_cache, tweet_store
 from app.core.config import settings
+from app.core.http import get_http_client
+
+logger = logging.getLogger(__name__)
 
 
 class DaturaService:
@@ -12,14 +19,44 @@ class DaturaService:
     Service for retrieving recent tweets from the Datura API.
 
     Used to gather context for sentiment analysis related to Bittensor subnets.
+    Tweets are ingested incrementally into the shared tweet store, so several tasks
+    for the same netuid share a single Datura call per refresh interval.
     """
 
-    API_URL = 'https://apis.datura.ai/twitter'
+    API_URL = settings.datura_api_url
+
+    @staticmethod
+    async def _get(params: dict) -> list:
+        """
+        Send a rate-limited search request to Datura.
+
+        Fails fast with `CircuitOpenError` while Datura is known to be down, waits for
+        a permit from the shared Datura token bucket and, on a 429 answer, blocks the
+        bucket for every process for the advertised `Retry-After`.
+        """
+        headers = {
+            'Authorization': settings.datura_api_key,
+            'Content-Type': 'application/json',
+        }
+
+        async with datura_breaker.protect(is_http_outage):
+            await datura_limiter.acquire()
+            response = await get_http_client().get(
+                DaturaService.API_URL, headers=headers, params=params, timeout=15
+            )
+            if response.status_code == 429:
+                await datura_limiter.penalize(
+                    retry_after_seconds(response.headers.get('Retry-After'))
+                )
+            response.raise_for_status()
+            return response.json()
 
     @staticmethod
     @retry(
         stop=stop_after_attempt(settings.blockchain_max_retries),
-        wait=wait_fixed(2),
+        wait=wait_random_exponential(
+            multiplier=settings.retry_backoff_base, max=settings.retry_backoff_max
+        ),
         retry=retry_if_exception_type((RequestError, HTTPStatusError)),
         reraise=True,
     )
@@ -50,13 +87,87 @@ class DaturaService:
             'count': 10,
         }
 
-        headers = {
-            'Authorization': settings.datura_api_key,
-            'Content-Type': 'application/json',
+        data = await DaturaService._get(params)
+        return [tweet['text'] for tweet in data if 'text' in tweet]
+
+    @staticmethod
+    @retry(
+        stop=stop_after_attempt(settings.blockchain_max_retries),
+        wait=wait_random_exponential(
+            multiplier=settings.retry_backoff_base, max=settings.retry_backoff_max
+        ),
+        retry=retry_if_exception_type((RequestError, HTTPStatusError)),
+        reraise=True,
+    )
+    async def fetch_tweets(netuid: int, since: Optional[datetime] = None) -> list[dict]:
+        """
+        Fetch the latest raw tweets for a netuid, optionally only those since a cursor.
+
+        Args:
+            netuid (int): The subnet ID to include in the tweet query.
+            since (datetime | None): Creation time of the newest tweet already stored.
+
+        Returns:
+            list[dict]: Raw tweet objects (with at least `text`).
+        """
+        params = {
+            'query': 'netuid:{}'.format(netuid),
+            'blue_verified': False,
+            'end_date': str(datetime.now(timezone.utc).date()),
+            'is_image': False,
+            'is_quote': False,
+            'is_video': False,
+            'lang': 'en',
+            'min_likes': 0,
+            'min_replies': 0,
+            'min_retweets': 0,
+            'sort': 'Latest',
+            'count': settings.tweet_fetch_count,
         }
+        if since is not None:
+            params['start_date'] = str(since.date())
 
-        async with httpx.AsyncClient(timeout=15) as client:
-            response = await client.get(DaturaService.API_URL, headers=headers, params=params)
-            response.raise_for_status()
-            data = response.json()
-            return [tweet['text'] for tweet in data if 'text' in tweet]
+        data = await DaturaService._get(params)
+        return [tweet for tweet in data if 'text' in tweet]
+
+    @staticmethod
+    async def get_recent_tweets(netuid: int) -> list[str]:
+        """
+        Return the tweets in the rolling window for a netuid, fetching only new tweets
+        from Datura when the stored data is older than the refresh interval.
+
+        Falls back to a direct `search_tweets` call if the store is unavailable.
+
+        Args:
+            netuid (int): The subnet ID.
+
+        Returns:
+            list[str]: A list of tweet texts, newest first.
+        """
+        try:
+            await redis_cache.ensure_connection()
+            if not await tweet_store.is_fresh(netuid):
+                token = await tweet_store.acquire_fetch(netuid)
+                if token is not None:
+                    try:
+                        since = await tweet_store.cursor(netuid)
+                        tweets = await DaturaService.fetch_tweets(netuid, since)
+                        await tweet_store.add(netuid, tweets)
+                        await tweet_store.mark_fresh(netuid)
+                    finally:
+                        await tweet_store.release_fetch(netuid, token)
+                else:
+                    await tweet_store.wait_fresh(netuid)
+            return await tweet_store.window(netuid)
+        except (RequestError, HTTPStatusError, RateLimitTimeout, CircuitOpenError):
+            # Datura is failing or throttled: serve whatever is already stored, if anything.
+            try:
+                stored = await tweet_store.window(netuid)
+            except Exception:
+                stored = []
+            if stored:
+                return stored
+            raise
+        except Exception as e:
+            logger.warning('Tweet store unavailable (%s), querying Datura directly', e)
+            return await DaturaService.search_tweets(netuid)
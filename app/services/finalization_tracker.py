@@ -0,0 +1,212 @@
+import asyncio
+import logging
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+
+from async_substrate_interface.async_substrate import AsyncSubstrateInterface
+from sqlalchemy import update
+from sqlmodel import select
+
+from app.cache.redis import RedisCache
+from app.core.config import settings
+from app.core.tracing import tracer
+from app.db.session import async_session
+from app.models.stake_action import StakeAction
+
+logger = logging.getLogger(__name__)
+
+
+class FinalizationTracker:
+    """
+    Settles `pending` stake actions once their extrinsics are finalized.
+
+    Subscribes to finalized heads and, for every finalized block, records the
+    outcome of each extrinsic it contains (success, or failure with its dispatch
+    error). Pending rows whose hash matches a recent outcome are then updated in
+    bulk, one statement per outcome. Outcomes are kept for the last
+    `recent_size` extrinsics, so rows written after their block was processed
+    still get matched. Rows pending for longer than `pending_timeout` seconds
+    have outlived their era and are marked as failed.
+
+    The last processed block is kept in Redis (`tracker:last_block`), so after a
+    restart the blocks finalized while the tracker was down are backfilled before
+    anything is expired. Rows are matched every `BACKFILL_SETTLE_EVERY` blocks
+    during a backfill so outcomes are not evicted before they are used.
+    """
+
+    LAST_BLOCK_KEY = 'tracker:last_block'
+    # Blocks re-scanned on start, for rows written just before a restart.
+    RESCAN_BLOCKS = 10
+    BACKFILL_SETTLE_EVERY = 100
+
+    def __init__(
+        self,
+        substrate: AsyncSubstrateInterface,
+        cache: RedisCache,
+        recent_size: int = settings.tracker_recent_outcomes,
+        pending_timeout: int = settings.stake_pending_timeout,
+    ):
+        self.substrate = substrate
+        self.cache = cache
+        self.recent_size = recent_size
+        self.pending_timeout = pending_timeout
+        self.recent: OrderedDict[str, tuple[str, str | None]] = OrderedDict()
+        self.last_block: int | None = None
+
+    @staticmethod
+    def block_outcomes(extrinsics: list, events: list) -> dict[str, tuple[str, str | None]]:
+        """
+        Determine the outcome of every signed extrinsic in a block.
+
+        Args:
+            extrinsics (list): Decoded block extrinsics.
+            events (list): Decoded block events.
+
+        Returns:
+            dict: `(status, error_message)` per extrinsic hash.
+        """
+        results: dict[int, tuple[str, str | None]] = {}
+        for event in events:
+            index = event.get('extrinsic_idx')
+            module = event['event']['module_id']
+            name = event['event']['event_id']
+            if index is None or module != 'System':
+                continue
+            if name == 'ExtrinsicSuccess':
+                results[index] = ('success', None)
+            elif name == 'ExtrinsicFailed':
+                error = event['event']['attributes'].get('dispatch_error')
+                results[index] = ('failed', str(error))
+
+        outcomes = {}
+        for index, extrinsic in enumerate(extrinsics):
+            extrinsic_hash = getattr(extrinsic, 'extrinsic_hash', None)
+            if extrinsic_hash and index in results:
+                outcomes[f'0x{extrinsic_hash.hex()}'] = results[index]
+        return outcomes
+
+    def _remember(self, outcomes: dict[str, tuple[str, str | None]]) -> None:
+        self.recent.update(outcomes)
+        while len(self.recent) > self.recent_size:
+            self.recent.popitem(last=False)
+
+    async def process_block(self, number: int) -> None:
+        """
+        Record the outcomes of the extrinsics in a finalized block.
+        """
+        block_hash = await self.substrate.get_block_hash(number)
+        block = await self.substrate.get_block(block_hash=block_hash)
+        if not block or not block['extrinsics']:
+            return
+        events = await self.substrate.get_events(block_hash=block_hash)
+        self._remember(self.block_outcomes(block['extrinsics'], events))
+
+    async def load_last_block(self) -> None:
+        """
+        Resume from the last block processed before a restart, if it is known.
+        """
+        if getattr(self.cache, 'redis', None) is None:
+            return
+        try:
+            value = await self.cache.redis.get(self.LAST_BLOCK_KEY)
+        except Exception as e:
+            logger.warning('Could not load the last processed block: %s', e)
+            return
+        if value is not None:
+            self.last_block = max(int(value) - self.RESCAN_BLOCKS, 0)
+            logger.info('Resuming after block %s', self.last_block)
+
+    async def save_last_block(self) -> None:
+        if self.last_block is None or getattr(self.cache, 'redis', None) is None:
+            return
+        try:
+            await self.cache.redis.set(self.LAST_BLOCK_KEY, self.last_block)
+        except Exception as e:
+            logger.warning('Could not save the last processed block: %s', e)
+
+    async def settle(self, expire: bool = True) -> int:
+        """
+        Update pending rows matching a known outcome and, once caught up with the
+        finalized head (`expire`), expire stale ones.
+
+        Returns:
+            int: Number of rows updated.
+        """
+        with tracer.span('db settle stakeaction') as span:
+            updated = await self._settle(expire)
+            span.set_attribute('db.rows', updated)
+        return updated
+
+    async def _settle(self, expire: bool) -> int:
+        updated = 0
+        async with async_session() as session:
+            pending = await session.execute(
+                select(StakeAction.extrinsic_hash).where(StakeAction.status == 'pending').distinct()
+            )
+            by_outcome: dict[tuple[str, str | None], list[str]] = {}
+            for (extrinsic_hash,) in pending:
+                if extrinsic_hash in self.recent:
+                    by_outcome.setdefault(self.recent[extrinsic_hash], []).append(extrinsic_hash)
+
+            for (status, error), hashes in by_outcome.items():
+                result = await session.execute(
+                    update(StakeAction)
+                    .where(StakeAction.extrinsic_hash.in_(hashes), StakeAction.status == 'pending')
+                    .values(status=status, error_message=error)
+                )
+                updated += result.rowcount
+
+            if expire:
+                cutoff = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(
+                    seconds=self.pending_timeout
+                )
+                result = await session.execute(
+                    update(StakeAction)
+                    .where(StakeAction.status == 'pending', StakeAction.timestamp < cutoff)
+                    .values(status='failed', error_message='Not finalized before the era expired')
+                )
+                updated += result.rowcount
+            await session.commit()
+        return updated
+
+    async def on_finalized_head(self, obj: dict, update_nr: int, subscription_id: str) -> None:
+        """
+        Subscription handler: process every block finalized since the previous head
+        (finality can advance several blocks at once), then settle pending rows.
+        """
+        number = int(obj['header']['number'])
+        first = number if self.last_block is None else self.last_block + 1
+        if number > first:
+            logger.info('Processing finalized blocks %s to %s', first, number)
+        updated = 0
+        for block_number in range(first, number + 1):
+            await self.process_block(block_number)
+            self.last_block = block_number
+            if (
+                block_number < number
+                and (block_number - first + 1) % self.BACKFILL_SETTLE_EVERY == 0
+            ):
+                updated += await self.settle(expire=False)
+                await self.save_last_block()
+        updated += await self.settle()
+        await self.save_last_block()
+        if updated:
+            logger.info('Block %s: settled %s stake actions', number, updated)
+        return None
+
+    async def run(self, retry_delay: float = settings.blockchain_retry_timeout) -> None:
+        """
+        Follow finalized heads forever, resubscribing after connection errors.
+        """
+        if self.last_block is None:
+            await self.load_last_block()
+        while True:
+            try:
+                await self.substrate.subscribe_block_headers(
+                    self.on_finalized_head, finalized_only=True
+                )
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning('Subscription failed (%s), retrying', e)
+                await asyncio.sleep(retry_delay)
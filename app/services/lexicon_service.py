@@ -0,0 +1,217 @@
+import math
+import re
+
+
+class LexiconService:
+    """
+    In-process, CPU-only sentiment scorer based on a crypto-tuned lexicon.
+
+    Scores a whole batch of tweets in a single pass and exposes the same
+    `get_sentiment_score` interface as `ChutesService`, plus a confidence value
+    used to decide whether the LLM can be skipped.
+    """
+
+    LEXICON: dict[str, float] = {
+        # Positive
+        'bullish': 3.0,
+        'moon': 2.5,
+        'mooning': 2.5,
+        'pump': 1.5,
+        'pumping': 1.5,
+        'ath': 2.5,
+        'hodl': 1.5,
+        'undervalued': 2.0,
+        'adoption': 2.0,
+        'partnership': 2.0,
+        'launch': 1.5,
+        'launched': 1.5,
+        'upgrade': 1.5,
+        'staking': 1.0,
+        'rewards': 1.5,
+        'yield': 1.0,
+        'gem': 2.0,
+        'breakout': 2.0,
+        'rally': 2.0,
+        'surge': 2.0,
+        'soaring': 2.5,
+        'gains': 2.0,
+        'profit': 1.5,
+        'profitable': 1.5,
+        'strong': 1.5,
+        'growth': 1.5,
+        'innovative': 2.0,
+        'promising': 2.0,
+        'great': 2.0,
+        'good': 1.5,
+        'amazing': 2.5,
+        'awesome': 2.5,
+        'love': 2.5,
+        'excited': 2.0,
+        'win': 1.5,
+        'winning': 2.0,
+        'lfg': 2.5,
+        'wagmi': 2.5,
+        'buy': 1.0,
+        'accumulate': 1.5,
+        '🚀': 2.5,
+        '📈': 2.0,
+        '🔥': 1.5,
+        '💎': 1.5,
+        # Negative
+        'bearish': -3.0,
+        'dump': -2.0,
+        'dumping': -2.0,
+        'rug': -3.5,
+        'rugpull': -3.5,
+        'scam': -3.5,
+        'hack': -3.0,
+        'hacked': -3.0,
+        'exploit': -3.0,
+        'exploited': -3.0,
+        'crash': -2.5,
+        'crashed': -2.5,
+        'rekt': -2.5,
+        'fud': -1.5,
+        'sell': -1.0,
+        'selloff': -2.0,
+        'ponzi': -3.5,
+        'fraud': -3.5,
+        'bug': -1.5,
+        'outage': -2.0,
+        'down': -1.0,
+        'delist': -3.0,
+        'delisted': -3.0,
+        'dead': -2.5,
+        'bleeding': -2.0,
+        'loss': -2.0,
+        'losses': -2.0,
+        'weak': -1.5,
+        'overvalued': -2.0,
+        'bad': -2.0,
+        'terrible': -2.5,
+        'awful': -2.5,
+        'hate': -2.5,
+        'worried': -1.5,
+        'risky': -1.5,
+        'ngmi': -2.5,
+        '📉': -2.0,
+        '💀': -1.5,
+    }
+
+    NEGATIONS = frozenset({
+        'not',
+        'no',
+        'never',
+        'none',
+        'nothing',
+        'without',
+        "isn't",
+        "aren't",
+        "wasn't",
+        "don't",
+        "doesn't",
+        "didn't",
+        "won't",
+        "can't",
+        'cannot',
+    })
+
+    INTENSIFIERS: dict[str, float] = {
+        'very': 1.5,
+        'super': 1.5,
+        'so': 1.3,
+        'really': 1.3,
+        'extremely': 2.0,
+        'massive': 1.5,
+        'huge': 1.5,
+    }
+
+    # Tokens within this distance after a negation get their polarity flipped.
+    NEGATION_SCOPE = 3
+
+    # Normalization constant used to squash a raw tweet score into [-1, 1].
+    ALPHA = 15.0
+
+    _TOKEN_RE = re.compile(r"[a-z0-9']+|[🚀📈🔥💎📉💀]")
+
+    @staticmethod
+    def _score_tweet(tokens: list[str]) -> tuple[float, int]:
+        """
+        Compute the normalized polarity of one tokenized tweet.
+
+        Args:
+            tokens (list[str]): Lowercased tokens of the tweet.
+
+        Returns:
+            tuple[float, int]: Polarity in [-1, 1] and the number of lexicon hits.
+        """
+        lexicon = LexiconService.LEXICON
+        total = 0.0
+        hits = 0
+        negation_left = 0
+        boost = 1.0
+        for token in tokens:
+            weight = lexicon.get(token)
+            if weight is not None:
+                if negation_left > 0:
+                    weight = -weight
+                total += weight * boost
+                hits += 1
+                boost = 1.0
+            elif token in LexiconService.NEGATIONS:
+                negation_left = LexiconService.NEGATION_SCOPE + 1
+            else:
+                boost = LexiconService.INTENSIFIERS.get(token, 1.0)
+            if negation_left > 0:
+                negation_left -= 1
+
+        if hits == 0:
+            return 0.0, 0
+        return total / math.sqrt(total * total + LexiconService.ALPHA), hits
+
+    @staticmethod
+    def score_with_confidence(tweets: list[str]) -> tuple[float, float]:
+        """
+        Score a batch of tweets and estimate how much the local score can be trusted.
+
+        Confidence is the product of coverage (share of tweets with at least one
+        lexicon hit) and agreement (how consistently the covered tweets lean the
+        same way).
+
+        Args:
+            tweets (list[str]): A list of tweet texts.
+
+        Returns:
+            tuple[float, float]: Sentiment score between -100 and 100 and a
+                confidence between 0 and 1.
+        """
+        if len(tweets) == 0:
+            return 0.0, 0.0
+
+        tokenize = LexiconService._TOKEN_RE.findall
+        scored = [LexiconService._score_tweet(tokenize(tweet.lower())) for tweet in tweets]
+        polarities = [polarity for polarity, hits in scored if hits > 0]
+        if not polarities:
+            return 0.0, 0.0
+
+        mean = sum(polarities) / len(tweets)
+        magnitude = sum(abs(p) for p in polarities) / len(tweets)
+        coverage = len(polarities) / len(tweets)
+        agreement = abs(mean) / magnitude if magnitude else 0.0
+
+        score = max(-100.0, min(100.0, mean * 100.0))
+        return round(score, 2), round(coverage * agreement, 4)
+
+    @staticmethod
+    async def get_sentiment_score(tweets: list[str]) -> float:
+        """
+        Evaluate the overall sentiment score of a list of tweets using the local lexicon.
+
+        Args:
+            tweets (list[str]): A list of tweet texts.
+
+        Returns:
+            float: Sentiment score between -100 and 100.
+        """
+        score, _ = LexiconService.score_with_confidence(tweets)
+        return score
@@ -0,0 +1,64 @@
+import asyncio
+import logging
+
+from app.core.config import settings
+from app.services.chutes_service import ChutesService
+from app.services.lexicon_service import LexiconService
+
+logger = logging.getLogger(__name__)
+
+
+class SentimentService:
+    """
+    Engine selector for tweet sentiment scoring.
+
+    Supported engines:
+    - `llm`: Chutes LLM, falling back to the local lexicon when the call fails or
+      exceeds the latency budget.
+    - `lexicon`: local lexicon only.
+    - `auto`: local lexicon first, only calling the LLM when its confidence is low.
+    """
+
+    ENGINES = ('llm', 'lexicon', 'auto')
+
+    @staticmethod
+    async def _llm_or_fallback(tweets: list[str], fallback: float) -> float:
+        try:
+            return await asyncio.wait_for(
+                ChutesService.get_sentiment_score(tweets, raise_on_error=True),
+                timeout=settings.sentiment_llm_timeout,
+            )
+        except asyncio.TimeoutError:
+            logger.warning('Chutes exceeded latency budget, using lexicon score')
+        except Exception as e:
+            logger.warning('Chutes failed (%s), using lexicon score', e)
+        return fallback
+
+    @staticmethod
+    async def get_sentiment_score(tweets: list[str], engine: str | None = None) -> float:
+        """
+        Evaluate the overall sentiment score of a list of tweets with the selected engine.
+
+        Args:
+            tweets (list[str]): A list of tweet texts.
+            engine (str | None): One of `llm`, `lexicon` or `auto`. Defaults to the
+                configured `sentiment_engine`.
+
+        Returns:
+            float: Sentiment score between -100 and 100.
+
+        Raises:
+            ValueError: If the engine is unknown.
+        """
+        engine = engine or settings.sentiment_engine
+        if engine not in SentimentService.ENGINES:
+            raise ValueError(f'Unknown sentiment engine: {engine}')
+        if len(tweets) == 0:
+            return 0.0
+
+        local_score, confidence = LexiconService.score_with_confidence(tweets)
+        if engine == 'lexicon':
+            return local_score
+        if engine == 'auto' and confidence >= settings.sentiment_confidence_threshold:
+            return local_score
+        return await SentimentService._llm_or_fallback(tweets, local_score)
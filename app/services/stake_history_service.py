@@ -0,0 +1,108 @@
+import base64
+from datetime import datetime, timezone
+
+import orjson
+from sqlalchemy import and_, or_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlmodel import select
+
+from app.models.stake_action import StakeAction
+
+
+class StakeHistoryService:
+    """
+    Read side of the `StakeAction` table.
+
+    Actions are listed newest first and paginated by keyset on `(timestamp, id)`:
+    the cursor encodes the last row returned, so each page is a range scan on one
+    of the composite indexes, whatever its depth.
+    """
+
+    @staticmethod
+    def naive_utc(value: datetime) -> datetime:
+        # Timestamps are stored as naive UTC.
+        if value.tzinfo is None:
+            return value
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+    @staticmethod
+    def encode_cursor(action: StakeAction) -> str:
+        raw = orjson.dumps([action.timestamp.isoformat(), action.id])
+        return base64.urlsafe_b64encode(raw).decode()
+
+    @staticmethod
+    def decode_cursor(cursor: str) -> tuple[datetime, int]:
+        """
+        Decode a cursor returned by `list_actions`.
+
+        Raises:
+            ValueError: If the cursor is malformed.
+        """
+        try:
+            timestamp, action_id = orjson.loads(base64.urlsafe_b64decode(cursor.encode()))
+            return datetime.fromisoformat(timestamp), int(action_id)
+        except Exception as e:
+            raise ValueError('Invalid cursor') from e
+
+    @staticmethod
+    async def list_actions(
+        session: AsyncSession,
+        netuid: int | None = None,
+        hotkey: str | None = None,
+        status: str | None = None,
+        stake_type: str | None = None,
+        since: datetime | None = None,
+        until: datetime | None = None,
+        cursor: str | None = None,
+        limit: int = 100,
+    ) -> tuple[list[StakeAction], str | None]:
+        """
+        List stake actions matching the filters, newest first.
+
+        Args:
+            session (AsyncSession): Database session.
+            netuid (int | None): Only actions on this subnet.
+            hotkey (str | None): Only actions for this hotkey.
+            status (str | None): Only actions with this status.
+            stake_type (str | None): Only `stake` or `unstake` actions.
+            since (datetime | None): Only actions at or after this time.
+            until (datetime | None): Only actions before this time.
+            cursor (str | None): `next_cursor` of the previous page.
+            limit (int): Maximum number of actions to return.
+
+        Returns:
+            tuple: The page of actions and the cursor of the next page (None on the
+            last page).
+        """
+        query = select(StakeAction)
+        if netuid is not None:
+            query = query.where(StakeAction.netuid == netuid)
+        if hotkey is not None:
+            query = query.where(StakeAction.hotkey == hotkey)
+        if status is not None:
+            query = query.where(StakeAction.status == status)
+        if stake_type is not None:
+            query = query.where(StakeAction.stake_type == stake_type)
+        if since is not None:
+            query = query.where(StakeAction.timestamp >= StakeHistoryService.naive_utc(since))
+        if until is not None:
+            query = query.where(StakeAction.timestamp < StakeHistoryService.naive_utc(until))
+        if cursor is not None:
+            timestamp, action_id = StakeHistoryService.decode_cursor(cursor)
+            # The redundant `<=` bound lets the planner turn it into an index range.
+            query = query.where(
+                and_(
+                    StakeAction.timestamp <= timestamp,
+                    or_(
+                        StakeAction.timestamp < timestamp,
+                        StakeAction.id < action_id,
+                    ),
+                )
+            )
+        query = query.order_by(StakeAction.timestamp.desc(), StakeAction.id.desc()).limit(limit + 1)
+
+        actions = list((await session.execute(query)).scalars())
+        if len(actions) <= limit:
+            return actions, None
+        actions = actions[:limit]
+        return actions, StakeHistoryService.encode_cursor(actions[-1])
@@ -0,0 +1,134 @@
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import case, delete, func, insert, literal_column
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlmodel import select
+
+from app.models.stake_action import StakeAction
+from app.models.stake_action_hourly import StakeActionHourly
+from app.services.stake_history_service import StakeHistoryService
+
+
+class StakeStatsService:
+    """
+    Hourly rollups of stake actions and the statistics served from them.
+
+    `rollup` recomputes the hourly aggregates per (netuid, status) from the last
+    rolled up hour, going back at least `lookback` so rows whose status changed
+    since (pending actions settled by the tracker) are counted under the new
+    one. `stats` only reads the rollups, never the raw rows.
+    """
+
+    @staticmethod
+    async def rollup(session: AsyncSession, lookback: timedelta) -> datetime:
+        """
+        Recompute the hourly aggregates from the last rolled up hour (or `lookback`
+        ago, whichever is earlier) up to now.
+
+        Args:
+            session (AsyncSession): Database session (PostgreSQL).
+            lookback (timedelta): Minimum window recomputed on every run.
+
+        Returns:
+            datetime: Start of the first recomputed hour.
+        """
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        latest = (await session.execute(select(func.max(StakeActionHourly.hour)))).scalar()
+        start = now - lookback
+        if latest is None:
+            oldest = (await session.execute(select(func.min(StakeAction.timestamp)))).scalar()
+            start = min(oldest or start, start)
+        else:
+            start = min(latest, start)
+        start = start.replace(minute=0, second=0, microsecond=0)
+
+        # Inlined so the SELECT and GROUP BY expressions are textually identical.
+        hour = func.date_trunc(literal_column("'hour'"), StakeAction.timestamp).label('hour')
+        aggregates = (
+            select(
+                hour,
+                StakeAction.netuid,
+                StakeAction.status,
+                func.count().label('actions'),
+                func.coalesce(
+                    func.sum(
+                        case((StakeAction.stake_type == 'stake', StakeAction.tao_amount), else_=0)
+                    ),
+                    0,
+                ).label('staked_tao'),
+                func.coalesce(
+                    func.sum(
+                        case((StakeAction.stake_type == 'unstake', StakeAction.tao_amount), else_=0)
+                    ),
+                    0,
+                ).label('unstaked_tao'),
+                func.sum(StakeAction.sentiment).label('sentiment_sum'),
+            )
+            .where(StakeAction.timestamp >= start)
+            .group_by(hour, StakeAction.netuid, StakeAction.status)
+        )
+        await session.execute(delete(StakeActionHourly).where(StakeActionHourly.hour >= start))
+        await session.execute(
+            insert(StakeActionHourly).from_select(
+                [
+                    'hour',
+                    'netuid',
+                    'status',
+                    'actions',
+                    'staked_tao',
+                    'unstaked_tao',
+                    'sentiment_sum',
+                ],
+                aggregates,
+            )
+        )
+        await session.commit()
+        return start
+
+    @staticmethod
+    async def stats(
+        session: AsyncSession,
+        netuid: int | None = None,
+        since: datetime | None = None,
+        until: datetime | None = None,
+    ) -> list[dict]:
+        """
+        Totals per (netuid, status) over the hourly rollups.
+
+        Args:
+            session (AsyncSession): Database session.
+            netuid (int | None): Only this subnet.
+            since (datetime | None): First hour included.
+            until (datetime | None): Hours before this time only.
+
+        Returns:
+            list[dict]: Action count, staked and unstaked TAO and average sentiment
+            per netuid and status.
+        """
+        query = select(
+            StakeActionHourly.netuid,
+            StakeActionHourly.status,
+            func.sum(StakeActionHourly.actions).label('actions'),
+            func.sum(StakeActionHourly.staked_tao).label('staked_tao'),
+            func.sum(StakeActionHourly.unstaked_tao).label('unstaked_tao'),
+            func.sum(StakeActionHourly.sentiment_sum).label('sentiment_sum'),
+        ).group_by(StakeActionHourly.netuid, StakeActionHourly.status)
+        if netuid is not None:
+            query = query.where(StakeActionHourly.netuid == netuid)
+        if since is not None:
+            query = query.where(StakeActionHourly.hour >= StakeHistoryService.naive_utc(since))
+        if until is not None:
+            query = query.where(StakeActionHourly.hour < StakeHistoryService.naive_utc(until))
+        query = query.order_by(StakeActionHourly.netuid, StakeActionHourly.status)
+
+        return [
+            {
+                'netuid': row.netuid,
+                'status': row.status,
+                'actions': row.actions,
+                'staked_tao': row.staked_tao,
+                'unstaked_tao': row.unstaked_tao,
+                'avg_sentiment': row.sentiment_sum / row.actions if row.actions else None,
+            }
+            for row in await session.execute(query)
+        ]
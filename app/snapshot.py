@@ -0,0 +1,58 @@
+import asyncio
+import logging
+
+from app.cache.singleton import dividend_snapshot, redis_cache
+from app.core.config import settings
+from app.core.logging import configure_logging
+from app.services.singleton import substrate_service
+
+logger = logging.getLogger(__name__)
+
+"""
+Dividend snapshot refresher entrypoint (`python -m app.snapshot`).
+
+Queries the all-dividends map every `DIVIDEND_SNAPSHOT_INTERVAL` seconds and
+publishes it to `DIVIDEND_SNAPSHOT_PATH`, which every API worker process maps
+read-only, and to the `dividends:all` Redis key used when the snapshot is stale.
+"""
+
+
+async def refresh() -> int | None:
+    """
+    Publish one snapshot.
+
+    Returns:
+        int | None: The new generation, or None if the chain query returned nothing.
+    """
+    results = await substrate_service.get_all_dividends()
+    if not results:
+        logger.warning('No dividends returned; keeping the previous snapshot')
+        return None
+    generation = dividend_snapshot.write(results)
+    try:
+        await redis_cache.ensure_connection()
+        await redis_cache.set('dividends:all', {'results': results})
+    except Exception as e:
+        logger.warning('Could not cache dividends: %s', e)
+    return generation
+
+
+async def main() -> None:
+    configure_logging('snapshot')
+    await redis_cache.connect()
+    try:
+        while True:
+            try:
+                generation = await refresh()
+                if generation is not None:
+                    logger.info('Published dividend snapshot generation %s', generation)
+            except Exception:
+                logger.exception('Dividend snapshot refresh failed')
+            await asyncio.sleep(settings.dividend_snapshot_interval)
+    finally:
+        dividend_snapshot.close()
+        await redis_cache.close()
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -1,60 +1,532 @@
-from celery import Celery
+import asyncio
+import hashlib
+import inspect
+import logging
+import os
+import socket
+import threading
+import time
+from datetime import timedelta
 
+from celery import Celery, chain
+from celery.canvas import Signature
+from celery.signals import (
+    before_task_publish,
+    task_postrun,
+    task_prerun,
+    worker_process_shutdown,
+    worker_shutdown,
+)
+
+from app.cache.backpressure import IN_FLIGHT_HEARTBEAT, IN_FLIGHT_KEY, IN_FLIGHT_SEEN_KEY
+from app.cache.singleton import (
+    netuid_demand,
+    redis_cache,
+    sentiment_history,
+    stake_intents,
+    trade_dedup,
+)
 from app.core.config import settings
+from app.core.http import close_http_client
+from app.core.loop import WorkerEventLoop
+from app.core.metrics import cache_requests, key_family, task_duration
+from app.core.tracing import activate, deactivate, extract, inject, tracer
+from app.db.partitions import maintain_partitions
+from app.db.session import async_session
+from app.db.session import engine as db_engine
+from app.db.singleton import stake_action_writer
 from app.services.bittensor_substrate_service import AsyncSubstrateService
-from app.services.chutes_service import ChutesService
 from app.services.datura_service import DaturaService
+from app.services.sentiment_service import SentimentService
+from app.services.stake_stats_service import StakeStatsService
+
+logger = logging.getLogger(__name__)
+
+# Tasks whose ID is a trade's deduplication claim (see `TradeDeduplicator`).
+TRADE_TASKS = ('analyze_and_stake', 'submit_stake')
 
 
 class CeleryTask:
     """
     Celery application configured to run background sentiment analysis tasks.
 
-    Contains task definitions for fetching tweets and calculating sentiment.
+    Contains task definitions for fetching tweets and calculating sentiment, both as
+    a single `analyze_and_stake` task and as a chain of stages routed to their own
+    queues (`fetch_tweets` -> `score_sentiment` -> `submit_stake`), so I/O-bound
+    fetch and scoring workers scale separately from the serialized signing worker.
+    Task bodies run as coroutines on one long-lived event loop per worker process,
+    so the substrate connection, HTTP clients and DB pool are reused across tasks.
     """
 
+    STAGE_QUEUES = {
+        'fetch_tweets': 'fetch',
+        'score_sentiment': 'score',
+        'submit_stake': 'stake',
+        'flush_stakes': 'stake',
+        'sweep_sentiment': 'score',
+    }
+
     def __init__(self):
         self.celery = Celery(
             'app.worker',
             broker=settings.redis_url,
             backend=settings.redis_url,
         )
+        self.celery.conf.task_routes = {
+            name: {'queue': queue} for name, queue in self.STAGE_QUEUES.items()
+        }
+        # Logging is configured by `configure_logging`; keep Celery off the root logger.
+        self.celery.conf.worker_hijack_root_logger = False
+        self.celery.conf.worker_redirect_stdouts = False
+        beat_schedule = {}
+        if settings.sentiment_sweep_interval > 0:
+            beat_schedule['sweep-sentiment'] = {
+                'task': 'sweep_sentiment',
+                'schedule': settings.sentiment_sweep_interval,
+            }
+        if settings.stake_partitioning and settings.stake_partition_maintenance_interval > 0:
+            beat_schedule['maintain-stake-partitions'] = {
+                'task': 'maintain_stake_partitions',
+                'schedule': settings.stake_partition_maintenance_interval,
+            }
+        if settings.stake_rollup_interval > 0:
+            beat_schedule['rollup-stake-actions'] = {
+                'task': 'rollup_stake_actions',
+                'schedule': settings.stake_rollup_interval,
+            }
+        self.celery.conf.beat_schedule = beat_schedule
 
         self.datura_service = DaturaService()
-        self.chutes_service = ChutesService()
+        self.sentiment_service = SentimentService()
         self.substrate_service = AsyncSubstrateService()
 
+        self.loop = WorkerEventLoop(settings.worker_max_in_flight)
+        self.loop.on_shutdown(self._close_connections)
+        worker_process_shutdown.connect(self._stop_loop, weak=False)
+        worker_shutdown.connect(self._stop_loop, weak=False)
+
+        self._in_flight = 0
+        self._in_flight_lock = threading.Lock()
+        self._heartbeat_pid: int | None = None
+        self._task_starts: dict[str | None, float] = {}
+        self._task_spans: dict[str | None, tuple] = {}
+        task_prerun.connect(self._task_started, weak=False)
+        task_postrun.connect(self._task_finished, weak=False)
+        before_task_publish.connect(self._inject_trace, weak=False)
+
         self._register_tasks()
 
+    async def _close_connections(self) -> None:
+        """
+        Release the connections shared by the tasks of this worker process.
+        """
+        await close_http_client()
+        await self.substrate_service.close()
+        await stake_action_writer.close()
+        if getattr(redis_cache, 'redis', None) is not None:
+            await redis_cache.close()
+        await db_engine.dispose()
+
+    def _stop_loop(self, **_) -> None:
+        self.loop.stop()
+
+    def _report_in_flight(self, delta: int = 0) -> None:
+        """
+        Publish the number of tasks running in this worker process, with a
+        heartbeat, for the API's backpressure check. A background thread repeats
+        the heartbeat so long-running tasks keep counting; a process that dies
+        stops being counted once its heartbeat is `IN_FLIGHT_TTL` seconds old.
+        """
+        if self._heartbeat_pid != os.getpid():
+            # Started lazily in each (possibly forked) worker process.
+            self._heartbeat_pid = os.getpid()
+            threading.Thread(target=self._heartbeat, name='in-flight', daemon=True).start()
+        worker = f'{socket.gethostname()}:{os.getpid()}'
+        with self._in_flight_lock:
+            self._in_flight += delta
+            try:
+                pipe = self.celery.backend.client.pipeline(transaction=False)
+                pipe.hset(IN_FLIGHT_KEY, worker, self._in_flight)
+                pipe.hset(IN_FLIGHT_SEEN_KEY, worker, time.time())
+                pipe.execute()
+            except Exception as e:
+                logger.warning('Could not report in-flight tasks: %s', e)
+
+    def _heartbeat(self) -> None:
+        while True:
+            time.sleep(IN_FLIGHT_HEARTBEAT)
+            self._report_in_flight()
+
+    @staticmethod
+    def _inject_trace(headers: dict | None = None, **_) -> None:
+        """
+        Carry the publisher's trace context in the task message headers, so the
+        task span (and the next pipeline stage) joins the same trace.
+        """
+        if headers is not None:
+            inject(headers)
+
+    def _task_started(self, task_id: str | None = None, task=None, **_) -> None:
+        self._task_starts[task_id] = time.perf_counter()
+        if task is not None:
+            parent = extract(getattr(task.request, 'traceparent', None))
+            span = tracer.start(f'task {task.name}', parent, **{'celery.task_id': task_id})
+            self._task_spans[task_id] = (span, activate(span))
+        self._report_in_flight(1)
+
+    def _task_finished(
+        self,
+        task_id: str | None = None,
+        task=None,
+        state: str | None = None,
+        args: tuple = (),
+        kwargs: dict | None = None,
+        **_,
+    ) -> None:
+        if task is not None and task.name in TRADE_TASKS:
+            self._release_trade(task, task_id, args, kwargs)
+        start = self._task_starts.pop(task_id, None)
+        if start is not None and task is not None:
+            task_duration.observe(
+                time.perf_counter() - start, task=task.name, state=state or 'UNKNOWN'
+            )
+        traced = self._task_spans.pop(task_id, None)
+        if traced is not None:
+            span, token = traced
+            span.set_attribute('celery.state', state or 'UNKNOWN')
+            if state == 'FAILURE':
+                span.error = 'Task failed'
+            deactivate(token)
+            tracer.end(span)
+        self._report_in_flight(-1)
+
+    def _release_trade(self, task, task_id: str | None, args: tuple, kwargs: dict | None) -> None:
+        """
+        Release the deduplication claim of a finished trade, so the next trade request
+        for the pair enqueues a new task instead of attaching to this one. In the
+        staged pipeline the claimed task ID is the one of the last stage.
+        """
+        try:
+            call = inspect.signature(task.run).bind(*args, **(kwargs or {}))
+        except TypeError:
+            return
+        call.apply_defaults()
+        trade = call.arguments
+        self.loop.submit(
+            trade_dedup.release(trade['netuid'], trade['hotkey'], task_id, trade['engine'])
+        )
+
+    @staticmethod
+    def _sentiment_key(netuid: int, engine: str | None) -> str:
+        return f'sentiment:{netuid}:{engine or settings.sentiment_engine}'
+
+    @staticmethod
+    def _tweets_digest(tweets: list[str]) -> str:
+        return hashlib.sha1('\n'.join(tweets).encode()).hexdigest()
+
+    async def _cached_sentiment(self, netuid: int, engine: str | None) -> float | None:
+        """
+        Return the cached sentiment for a netuid (precomputed by the sweep or an
+        earlier trade), or None if there is no fresh score.
+        """
+        try:
+            await redis_cache.ensure_connection()
+            cached = await redis_cache.get(self._sentiment_key(netuid, engine))
+        except Exception as e:
+            logger.warning('Sentiment cache unavailable: %s', e)
+            return None
+        return cached['score'] if cached else None
+
+    async def _score_cached(
+        self, netuid: int, tweets: list[str], engine: str | None, extend: bool = False
+    ) -> float:
+        """
+        Score tweets, reusing the cached score for the netuid while its tweet window
+        has not changed. With `extend`, a reused score gets a fresh TTL. New scores
+        are appended to the netuid's sentiment history.
+        """
+        key = self._sentiment_key(netuid, engine)
+        digest = self._tweets_digest(tweets)
+        try:
+            await redis_cache.ensure_connection()
+            cached = await redis_cache.get(key, track=False)
+            fresh = bool(cached) and cached.get('digest') == digest
+            # A cached score for an older tweet window counts as stale, not as a hit.
+            result = 'hit' if fresh else 'stale' if cached else 'miss'
+            cache_requests.inc(family=key_family(key), result=result)
+            if fresh:
+                if extend:
+                    await redis_cache.redis.expire(key, settings.sentiment_cache_ttl)
+                return cached['score']
+        except Exception as e:
+            logger.warning('Sentiment cache unavailable: %s', e)
+
+        sentiment = await self.sentiment_service.get_sentiment_score(tweets, engine)
+        await sentiment_history.record(netuid, sentiment)
+        try:
+            await redis_cache.set(
+                key, {'score': sentiment, 'digest': digest}, ttl=settings.sentiment_cache_ttl
+            )
+        except Exception as e:
+            logger.warning('Could not cache sentiment: %s', e)
+        return sentiment
+
+    async def _sweep_sentiment(self) -> int:
+        """
+        Precompute the sentiment of every netuid in the dividends snapshot, most
+        requested first, with at most `SENTIMENT_SWEEP_CONCURRENCY` in progress.
+
+        Returns:
+            int: Number of netuids whose score was refreshed.
+        """
+        await redis_cache.ensure_connection()
+        snapshot = await redis_cache.get('dividends:all')
+        results = snapshot['results'] if snapshot else None
+        if not results:
+            results = await self.substrate_service.get_all_dividends()
+            if results:
+                await redis_cache.set('dividends:all', {'results': results})
+        netuids = await netuid_demand.rank(sorted({entry['netuid'] for entry in results or []}))
+
+        semaphore = asyncio.Semaphore(settings.sentiment_sweep_concurrency)
+
+        async def refresh(netuid: int) -> bool:
+            async with semaphore:
+                try:
+                    tweets = await self.datura_service.get_recent_tweets(netuid)
+                    await self._score_cached(netuid, tweets, None, extend=True)
+                    return True
+                except Exception as e:
+                    logger.warning('Sentiment sweep failed for netuid %s: %s', netuid, e)
+                    return False
+
+        refreshed = sum(await asyncio.gather(*(refresh(netuid) for netuid in netuids)))
+        await netuid_demand.decay()
+        logger.info('Refreshed sentiment for %s/%s netuids', refreshed, len(netuids))
+        return refreshed
+
+    async def _adjust_stake(self, netuid: int, hotkey: str, sentiment: float) -> dict:
+        """
+        Submit a stake adjustment, or queue it for the next batched extrinsic when
+        `STAKE_BATCH_WINDOW` is set and Redis is reachable.
+
+        Returns:
+            dict: The outcome of the trade: netuid, hotkey, sentiment, `stake_type`,
+            `tao_amount`, `status` (`success`, `pending`, `failed`, `error`,
+            `skipped` or `queued`), `error_message` and `extrinsic_hash`.
+        """
+        # The shared nonce counter and the intent queue both live in Redis.
+        await redis_cache.ensure_connection()
+        if settings.stake_batch_window > 0:
+            try:
+                window = settings.stake_batch_window
+                signal = await self.substrate_service.trading_signal(netuid, sentiment)
+                # A neutral signal is skipped by the direct path below.
+                if signal != 0.0:
+                    if await stake_intents.push(netuid, hotkey, sentiment, signal, window):
+                        await asyncio.to_thread(
+                            self.celery.tasks['flush_stakes'].apply_async, countdown=window
+                        )
+                    return {
+                        'netuid': netuid,
+                        'hotkey': hotkey,
+                        'sentiment': sentiment,
+                        'stake_type': 'stake' if signal > 0 else 'unstake',
+                        'tao_amount': 0.01 * abs(signal),
+                        'status': 'queued',
+                        'error_message': None,
+                        'extrinsic_hash': None,
+                    }
+            except Exception as e:
+                logger.warning('Stake batching unavailable (%s), submitting directly', e)
+        return await self.substrate_service.submit_stake_adjustment(netuid, hotkey, sentiment)
+
+    def trade_pipeline(self, netuid: int, hotkey: str, engine: str | None = None) -> Signature:
+        """
+        Build the staged trade pipeline for a subnet and hotkey.
+
+        Args:
+            netuid (int): The subnet ID.
+            hotkey (str): The hotkey to stake to or unstake from.
+            engine (str | None): Sentiment engine (`llm`, `lexicon` or `auto`).
+
+        Returns:
+            Signature: A chain whose result is the outcome of the trade.
+        """
+        return chain(
+            self.celery.tasks['fetch_tweets'].s(netuid, engine),
+            self.celery.tasks['score_sentiment'].s(netuid, engine),
+            self.celery.tasks['submit_stake'].s(netuid, hotkey, engine),
+        )
+
     def _register_tasks(self):
         @self.celery.task(name='analyze_and_stake')
-        def analyze_and_stake(netuid: int, hotkey: str) -> float:
+        def analyze_and_stake(netuid: int, hotkey: str, engine: str | None = None) -> dict:
             """
             Celery task that performs sentiment analysis on tweets for a given subnet
-            and returns a numeric sentiment score.
+            and stakes or unstakes accordingly.
 
             Args:
                 netuid (int): The subnet ID.
+                hotkey (str): The hotkey to stake to or unstake from.
+                engine (str | None): Sentiment engine (`llm`, `lexicon` or `auto`).
 
             Returns:
-                float: The sentiment score (between -100 and 100).
+                dict: The outcome of the trade (see `_adjust_stake`). Errors fail the
+                task instead of being reported as a neutral score.
             """
-            import asyncio
 
-            async def async_analyze_and_stake(netuid: int) -> float:
-                try:
-                    tweets = await self.datura_service.search_tweets(netuid)
-                    sentiment = await self.chutes_service.get_sentiment_score(tweets)
-                    await self.substrate_service.submit_stake_adjustment(netuid, hotkey, sentiment)
+            async def async_analyze_and_stake(netuid: int) -> dict:
+                sentiment = await self._cached_sentiment(netuid, engine)
+                if sentiment is None:
+                    tweets = await self.datura_service.get_recent_tweets(netuid)
+                    sentiment = await self._score_cached(netuid, tweets, engine)
+                return await self._adjust_stake(netuid, hotkey, sentiment)
+
+            return self.loop.run(async_analyze_and_stake(netuid))
+
+        @self.celery.task(name='fetch_tweets')
+        def fetch_tweets(netuid: int, engine: str | None = None) -> list[str] | float:
+            """
+            Pipeline stage: return the tweets in the rolling window for a subnet, or
+            the cached score (precomputed by the sweep or an earlier trade) when there
+            is one, so Datura is not queried.
+
+            Args:
+                netuid (int): The subnet ID.
+                engine (str | None): Sentiment engine whose cached score is reused.
+
+            Returns:
+                list[str] | float: Tweet texts, newest first, or the cached score.
+            """
+
+            async def async_fetch_tweets() -> list[str] | float:
+                sentiment = await self._cached_sentiment(netuid, engine)
+                if sentiment is not None:
                     return sentiment
+                return await self.datura_service.get_recent_tweets(netuid)
+
+            return self.loop.run(async_fetch_tweets())
+
+        @self.celery.task(name='score_sentiment')
+        def score_sentiment(
+            tweets: list[str] | float, netuid: int, engine: str | None = None
+        ) -> float:
+            """
+            Pipeline stage: score the tweets fetched for a subnet, cached per netuid
+            and engine for as long as the tweet window is unchanged. A cached score
+            from `fetch_tweets` is passed through.
+
+            Args:
+                tweets (list[str] | float): Tweet texts or cached score from
+                    `fetch_tweets`.
+                netuid (int): The subnet ID.
+                engine (str | None): Sentiment engine (`llm`, `lexicon` or `auto`).
+
+            Returns:
+                float: The sentiment score (between -100 and 100).
+            """
+            if isinstance(tweets, (int, float)):
+                return float(tweets)
+            return self.loop.run(self._score_cached(netuid, tweets, engine))
+
+        @self.celery.task(name='submit_stake')
+        def submit_stake(
+            sentiment: float, netuid: int, hotkey: str, engine: str | None = None
+        ) -> dict:
+            """
+            Pipeline stage: stake or unstake according to the sentiment score.
+
+            Args:
+                sentiment (float): Score from `score_sentiment`.
+                netuid (int): The subnet ID.
+                hotkey (str): The hotkey to stake to or unstake from.
+                engine (str | None): Engine the score came from; identifies the
+                    trade's deduplication claim, released when this stage finishes.
+
+            Returns:
+                dict: The outcome of the trade (see `_adjust_stake`).
+            """
+            return self.loop.run(self._adjust_stake(netuid, hotkey, sentiment))
+
+        @self.celery.task(name='flush_stakes')
+        def flush_stakes() -> str | None:
+            """
+            Submit every stake intent queued during the batching window as one
+            batched extrinsic.
+
+            Returns:
+                str | None: The extrinsic hash, or None if nothing was submitted.
+            """
+
+            async def async_flush_stakes() -> str | None:
+                await redis_cache.ensure_connection()
+                intents = await stake_intents.drain()
+                return await self.substrate_service.submit_stake_batch(intents)
+
+            return self.loop.run(async_flush_stakes())
+
+        @self.celery.task(name='sweep_sentiment')
+        def sweep_sentiment() -> int:
+            """
+            Periodic task (Celery beat): precompute and cache the sentiment of every
+            active netuid so trades read a fresh score instead of waiting on Datura
+            and Chutes.
+
+            Returns:
+                int: Number of netuids whose score was refreshed.
+            """
+            return self.loop.run(self._sweep_sentiment())
+
+        @self.celery.task(name='maintain_stake_partitions')
+        def maintain_stake_partitions() -> list[str]:
+            """
+            Periodic task (Celery beat): create the stake action partitions for the
+            coming months and drop those past the retention period.
+
+            Returns:
+                list[str]: Names of the dropped partitions.
+            """
+
+            async def async_maintain_stake_partitions() -> list[str]:
+                async with db_engine.begin() as conn:
+                    if conn.dialect.name != 'postgresql':
+                        return []
+                    dropped = await maintain_partitions(
+                        conn,
+                        settings.stake_partition_months_ahead,
+                        settings.stake_retention_months,
+                    )
+                if dropped:
+                    logger.info('Dropped expired partitions: %s', ', '.join(dropped))
+                return dropped
+
+            return self.loop.run(async_maintain_stake_partitions())
+
+        @self.celery.task(name='rollup_stake_actions')
+        def rollup_stake_actions() -> str | None:
+            """
+            Periodic task (Celery beat): refresh the hourly stake action rollups
+            (PostgreSQL only).
+
+            Returns:
+                str | None: Start of the first recomputed hour (ISO 8601), or None on
+                other databases.
+            """
 
-                except Exception as _:
-                    return 0.0
+            async def async_rollup_stake_actions() -> str | None:
+                if db_engine.dialect.name != 'postgresql':
+                    return None
+                async with async_session() as session:
+                    start = await StakeStatsService.rollup(
+                        session, timedelta(seconds=settings.stake_rollup_lookback)
+                    )
+                return start.isoformat()
 
-            loop = asyncio.get_event_loop()
-            result = loop.run_until_complete(async_analyze_and_stake(netuid))
-            return result
+            return self.loop.run(async_rollup_stake_actions())
 
 
-celery_app = CeleryTask().celery
+celery_task = CeleryTask()
+celery_app = celery_task.celery
 analyze_and_stake = celery_app.tasks['analyze_and_stake']
+trade_pipeline = celery_task.trade_pipeline
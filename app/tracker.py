@@ -0,0 +1,30 @@
+import asyncio
+
+from async_substrate_interface.async_substrate import AsyncSubstrateInterface
+from bittensor.core.settings import SS58_FORMAT
+
+from app.cache.singleton import redis_cache
+from app.core.config import settings
+from app.core.logging import configure_logging
+from app.db.session import init_db
+from app.services.finalization_tracker import FinalizationTracker
+
+"""
+Finalization tracker entrypoint (`python -m app.tracker`).
+"""
+
+
+async def main() -> None:
+    configure_logging('tracker')
+    await init_db()
+    await redis_cache.connect()
+    substrate = AsyncSubstrateInterface(url=settings.blockchain_url, ss58_format=SS58_FORMAT)
+    try:
+        await FinalizationTracker(substrate, redis_cache).run()
+    finally:
+        await substrate.close()
+        await redis_cache.close()
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -1,3 +1,47 @@
-from app.tasks import celery_app
+import sys
 
-celery_app.worker_main(argv=['worker', '--loglevel=info', '--concurrency=1'])
+from app.core.config import settings
+from app.core.logging import configure_logging
+from app.core.metrics import start_metrics_server
+from app.core.tracing import configure_tracing
+from app.tasks import celery_task
+
+"""
+Celery worker entrypoint.
+
+    python -m app.worker          # consume every queue
+    python -m app.worker fetch    # only the `fetch_tweets` stage (likewise score, stake)
+"""
+
+STAGE_CONCURRENCY = {
+    'fetch': settings.worker_fetch_concurrency,
+    'score': settings.worker_score_concurrency,
+    'stake': settings.worker_stake_concurrency,
+}
+
+stage = sys.argv[1] if len(sys.argv) > 1 else 'all'
+if stage == 'all':
+    queues = ','.join(['celery', *celery_task.STAGE_QUEUES.values()])
+    concurrency = settings.worker_concurrency
+elif stage in STAGE_CONCURRENCY:
+    queues = stage
+    concurrency = STAGE_CONCURRENCY[stage]
+else:
+    sys.exit(f'Unknown stage {stage!r}; expected all, {", ".join(STAGE_CONCURRENCY)}')
+
+service = 'worker' if stage == 'all' else f'worker-{stage}'
+configure_tracing(service)
+configure_logging(service)
+celery_task.loop.max_in_flight = min(settings.worker_max_in_flight, concurrency)
+if settings.worker_metrics_port > 0:
+    start_metrics_server(settings.worker_metrics_port)
+celery_task.celery.worker_main(
+    argv=[
+        'worker',
+        '--loglevel=info',
+        f'--pool={settings.worker_pool}',
+        f'--concurrency={concurrency}',
+        f'--queues={queues}',
+        f'--hostname={stage}@%h',
+    ]
+)
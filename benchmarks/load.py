@@ -0,0 +1,308 @@
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import random
+import subprocess
+import sys
+import time
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Awaitable, Callable
+
+import httpx
+import uvicorn
+from fastapi import FastAPI
+
+from benchmarks.stubs.http import create_chutes_app, create_datura_app
+from benchmarks.stubs.substrate import FakeChain, FakeSubstrateServer
+
+"""
+End-to-end load benchmark against local stand-ins for Datura, Chutes and Subtensor.
+
+Starts the stub servers, the API (uvicorn) and, for the trade scenario, a Celery
+worker, all pointed at the stubs. It then drives requests at a fixed arrival rate
+(open loop) and reports latency percentiles and throughput as JSON.
+
+    python -m benchmarks.load --scenario tao_dividends --rps 100 --duration 30
+    python -m benchmarks.load --scenario analyze_and_stake --rps 5 --duration 60
+
+The trade scenario needs the Redis broker (`--redis-url`). The API and worker also
+use Redis and PostgreSQL when reachable, and degrade as in production when not.
+"""
+
+ROOT = Path(__file__).resolve().parent.parent
+RESULTS_DIR = Path(__file__).resolve().parent / 'results'
+
+
+async def serve_stubs(args: argparse.Namespace) -> None:
+    stubs = FastAPI()
+    stubs.mount('/datura', create_datura_app(args.datura_latency_ms / 1000))
+    stubs.mount('/chutes', create_chutes_app(args.chutes_latency_ms / 1000))
+    server = uvicorn.Server(
+        uvicorn.Config(stubs, host=args.host, port=args.stub_port, log_level='warning')
+    )
+    chain = FakeChain(args.subnets, args.hotkeys, block_time=args.block_time)
+    substrate = FakeSubstrateServer(chain, latency=args.substrate_latency_ms / 1000)
+    await asyncio.gather(server.serve(), substrate.serve(args.host, args.substrate_port))
+
+
+def run_stubs(args: argparse.Namespace) -> None:
+    asyncio.run(serve_stubs(args))
+
+
+def stub_env(args: argparse.Namespace) -> dict:
+    """
+    Environment pointing the API and worker at the stubs.
+    """
+    return {
+        **os.environ,
+        'PYTHONPATH': str(ROOT),
+        'BLOCKCHAIN_URL': f'ws://{args.host}:{args.substrate_port}',
+        'DATURA_API_URL': f'http://{args.host}:{args.stub_port}/datura/twitter',
+        'CHUTES_API_URL': f'http://{args.host}:{args.stub_port}/chutes/v1/chat/completions',
+        'REDIS_URL': args.redis_url,
+    }
+
+
+def wait_until_ready(url: str, timeout: float = 60.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(url, timeout=1).status_code < 500:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.25)
+    raise RuntimeError(f'{url} not ready after {timeout}s')
+
+
+def percentile(values: list[float], p: float) -> float:
+    """
+    Nearest-rank percentile of an already sorted list.
+    """
+    if not values:
+        return 0.0
+    rank = max(0, min(len(values) - 1, int(round(p / 100 * len(values) + 0.5)) - 1))
+    return values[rank]
+
+
+def summarize(latencies: list[float], errors: int, elapsed: float, offered: int) -> dict:
+    ordered = sorted(latencies)
+    return {
+        'requests': offered,
+        'completed': len(latencies),
+        'errors': errors,
+        'elapsed_s': round(elapsed, 3),
+        'throughput_rps': round(len(latencies) / elapsed, 2) if elapsed else 0.0,
+        'latency_ms': {
+            'p50': round(percentile(ordered, 50) * 1000, 2),
+            'p95': round(percentile(ordered, 95) * 1000, 2),
+            'p99': round(percentile(ordered, 99) * 1000, 2),
+            'max': round(ordered[-1] * 1000, 2) if ordered else 0.0,
+            'mean': round(sum(ordered) / len(ordered) * 1000, 2) if ordered else 0.0,
+        },
+    }
+
+
+async def open_loop(call: Callable[[], Awaitable[bool]], rps: float, duration: float) -> dict:
+    """
+    Start `call` at a fixed arrival rate regardless of how long previous calls take,
+    so queueing delay shows up in the measured latency.
+    """
+    latencies: list[float] = []
+    errors = 0
+
+    async def timed() -> None:
+        nonlocal errors
+        start = time.perf_counter()
+        try:
+            ok = await call()
+        except Exception:
+            ok = False
+        if ok:
+            latencies.append(time.perf_counter() - start)
+        else:
+            errors += 1
+
+    loop = asyncio.get_running_loop()
+    total = int(rps * duration)
+    begin = loop.time()
+    tasks = []
+    for i in range(total):
+        delay = begin + i / rps - loop.time()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        tasks.append(asyncio.create_task(timed()))
+    await asyncio.gather(*tasks)
+    return summarize(latencies, errors, loop.time() - begin, total)
+
+
+def dividend_requests(chain: FakeChain, mode: str) -> Callable[[], str]:
+    """
+    Build a generator of `/tao_dividends` query strings for a request mode.
+    """
+    modes = ['all', 'netuid', 'hotkey', 'pair'] if mode == 'mix' else [mode]
+
+    def next_query() -> str:
+        netuid = random.randint(1, chain.subnets)
+        hotkey = random.choice(chain.hotkeys[netuid])
+        selected = random.choice(modes)
+        if selected == 'netuid':
+            return f'netuid={netuid}'
+        if selected == 'hotkey':
+            return f'hotkey={hotkey}'
+        if selected == 'pair':
+            return f'netuid={netuid}&hotkey={hotkey}'
+        return ''
+
+    return next_query
+
+
+async def bench_tao_dividends(args: argparse.Namespace, chain: FakeChain) -> dict:
+    base_url = f'http://{args.host}:{args.api_port}'
+    next_query = dividend_requests(chain, args.mode)
+    limits = httpx.Limits(max_connections=args.max_connections)
+    async with httpx.AsyncClient(
+        base_url=base_url,
+        headers={'Authorization': args.auth_token},
+        timeout=args.timeout,
+        limits=limits,
+    ) as client:
+
+        async def call() -> bool:
+            response = await client.get(f'/api/v1/tao_dividends?{next_query()}')
+            return response.status_code == 200
+
+        return await open_loop(call, args.rps, args.duration)
+
+
+async def bench_analyze_and_stake(args: argparse.Namespace, chain: FakeChain) -> dict:
+    import redis.asyncio as aioredis
+    from celery import Celery
+
+    client = Celery('benchmarks', broker=args.redis_url, backend=args.redis_url)
+    redis = aioredis.from_url(args.redis_url, decode_responses=True)
+    pending: dict[str, asyncio.Future] = {}
+    prefix = 'celery-task-meta-'
+
+    async def listen(pubsub) -> None:
+        async for message in pubsub.listen():
+            if message['type'] != 'pmessage':
+                continue
+            future = pending.pop(message['channel'][len(prefix) :], None)
+            if future is not None and not future.done():
+                future.set_result(json.loads(message['data']).get('status'))
+
+    pubsub = redis.pubsub()
+    await pubsub.psubscribe(f'{prefix}*')
+    listener = asyncio.create_task(listen(pubsub))
+
+    async def call() -> bool:
+        netuid = random.randint(1, chain.subnets)
+        hotkey = random.choice(chain.hotkeys[netuid])
+        task_id = str(uuid.uuid4())
+        future = asyncio.get_running_loop().create_future()
+        pending[task_id] = future
+        await asyncio.to_thread(
+            client.send_task, 'analyze_and_stake', args=[netuid, hotkey], task_id=task_id
+        )
+        status = await asyncio.wait_for(future, args.timeout)
+        return status == 'SUCCESS'
+
+    try:
+        return await open_loop(call, args.rps, args.duration)
+    finally:
+        listener.cancel()
+        await pubsub.aclose()
+        await redis.aclose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='End-to-end load benchmark.')
+    parser.add_argument(
+        '--scenario', choices=['tao_dividends', 'analyze_and_stake', 'all'], default='tao_dividends'
+    )
+    parser.add_argument(
+        '--mode',
+        choices=['all', 'netuid', 'hotkey', 'pair', 'mix'],
+        default='mix',
+        help='/tao_dividends request shape',
+    )
+    parser.add_argument('--rps', type=float, default=50.0)
+    parser.add_argument('--duration', type=float, default=30.0)
+    parser.add_argument('--timeout', type=float, default=120.0)
+    parser.add_argument('--max-connections', type=int, default=200)
+    parser.add_argument('--subnets', type=int, default=32)
+    parser.add_argument('--hotkeys', type=int, default=256, help='Hotkeys per subnet')
+    parser.add_argument('--block-time', type=float, default=12.0)
+    parser.add_argument('--datura-latency-ms', type=float, default=200.0)
+    parser.add_argument('--chutes-latency-ms', type=float, default=800.0)
+    parser.add_argument('--substrate-latency-ms', type=float, default=20.0)
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--api-port', type=int, default=18000)
+    parser.add_argument('--stub-port', type=int, default=18001)
+    parser.add_argument('--substrate-port', type=int, default=18002)
+    parser.add_argument('--redis-url', default='redis://127.0.0.1:6379/0')
+    parser.add_argument('--auth-token', default=os.environ.get('AUTH_TOKEN', 'supersecret123'))
+    parser.add_argument('--output', type=Path, default=None)
+    args = parser.parse_args()
+
+    chain = FakeChain(args.subnets, args.hotkeys, block_time=args.block_time)
+    stubs = multiprocessing.Process(target=run_stubs, args=(args,), daemon=True)
+    stubs.start()
+    env = stub_env(args)
+    processes = [
+        subprocess.Popen(
+            [
+                sys.executable,
+                '-m',
+                'uvicorn',
+                'app.main:app',
+                '--host',
+                args.host,
+                '--port',
+                str(args.api_port),
+            ],
+            cwd=ROOT,
+            env=env,
+        )
+    ]
+    if args.scenario in ('analyze_and_stake', 'all'):
+        processes.append(subprocess.Popen([sys.executable, '-m', 'app.worker'], cwd=ROOT, env=env))
+
+    results: dict = {
+        'timestamp': datetime.now(timezone.utc).isoformat(),
+        'config': {
+            k: str(v) if isinstance(v, Path) else v
+            for k, v in vars(args).items()
+            if k != 'auth_token'
+        },
+        'scenarios': {},
+    }
+    try:
+        wait_until_ready(f'http://{args.host}:{args.stub_port}/datura/twitter')
+        wait_until_ready(f'http://{args.host}:{args.api_port}/health')
+        if args.scenario in ('tao_dividends', 'all'):
+            results['scenarios']['tao_dividends'] = asyncio.run(bench_tao_dividends(args, chain))
+        if args.scenario in ('analyze_and_stake', 'all'):
+            results['scenarios']['analyze_and_stake'] = asyncio.run(
+                bench_analyze_and_stake(args, chain)
+            )
+    finally:
+        for process in processes:
+            process.terminate()
+        for process in processes:
+            process.wait(timeout=30)
+        stubs.terminate()
+
+    output = args.output or RESULTS_DIR / f'load-{int(time.time())}.json'
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(results, indent=2))
+    print(json.dumps(results, indent=2), flush=True)
+
+
+if __name__ == '__main__':
+    main()
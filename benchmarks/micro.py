@@ -0,0 +1,339 @@
+import argparse
+import asyncio
+import functools
+import json
+import platform
+import random
+import sys
+import tempfile
+import timeit
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable
+
+from scalecodec import ss58_encode
+
+from app.api.v1.tao_dividends import hotkey_dividends, netuid_hotkeys, pair_dividend
+from app.cache.dividend_snapshot import DividendSnapshot
+from app.cache.redis import RedisCache
+from app.services.bittensor_substrate_service import AsyncSubstrateService
+from app.services.chutes_service import ChutesService
+
+"""
+Microbenchmarks for the hot pure-Python paths, with a regression baseline.
+
+Each benchmark times one call of a function on synthetic data sized like the
+mainnet dividends map, reporting the best per-call time over several rounds.
+Results are compared with `benchmarks/baseline.json`; a benchmark slower than
+its baseline by more than `--tolerance` fails the run (exit status 1).
+
+    python -m benchmarks.micro                    # run and compare
+    python -m benchmarks.micro -k dividends       # only matching benchmarks
+    python -m benchmarks.micro --update-baseline  # record the current numbers
+
+Baselines are only comparable on the machine and Python version they were
+recorded with; re-record them there after an intended change in performance.
+"""
+
+BASELINE = Path(__file__).resolve().parent / 'baseline.json'
+
+SUBNETS = 64
+HOTKEYS_PER_SUBNET = 256
+
+LLM_RESPONSES = [
+    '72',
+    'Sentiment score: -35.5',
+    'The overall sentiment is bullish, I would rate it 64,5 out of 100.',
+    'Based on the tweets, the community is worried about emissions. Score: -80',
+    'No clear signal in these tweets.',
+    'Score: 250 (very positive)',
+]
+
+
+@dataclass
+class Benchmark:
+    name: str
+    setup: Callable[[], Callable[[], Any]]
+
+
+BENCHMARKS: list[Benchmark] = []
+
+
+def benchmark(name: str):
+    """
+    Register a benchmark; the decorated function builds the data and returns the
+    zero-argument callable that is timed.
+    """
+
+    def register(setup: Callable[[], Callable[[], Any]]):
+        BENCHMARKS.append(Benchmark(name, setup))
+        return setup
+
+    return register
+
+
+def synthetic_entries(seed: int = 42) -> list[tuple[int, bytes, int]]:
+    """
+    `TaoDividendsPerSubnet` entries as (netuid, raw hotkey, dividend).
+    """
+    rng = random.Random(seed)
+    return [
+        (netuid, rng.randbytes(32), rng.randrange(0, 10**12))
+        for netuid in range(SUBNETS)
+        for _ in range(HOTKEYS_PER_SUBNET)
+    ]
+
+
+@functools.cache
+def all_results() -> list[dict]:
+    results: list[dict] = []
+    for netuid, raw_hotkey, dividend in synthetic_entries():
+        results = AsyncSubstrateService._add_dividends_to_all(
+            results, netuid, ss58_encode(raw_hotkey), float(dividend)
+        )
+    return results
+
+
+class ScaleValue:
+    def __init__(self, value: int):
+        self.value = value
+
+
+class QueryMap:
+    """
+    Async iterator shaped like `AsyncQueryMapResult` over decoded entries.
+    """
+
+    def __init__(self, records: list):
+        self.records = records
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        for record in self.records:
+            yield record
+
+
+class FakeSubstrate:
+    def __init__(self, records: list):
+        self.records = records
+
+    async def query_map(self, **_) -> QueryMap:
+        return QueryMap(self.records)
+
+
+class FakeRedis:
+    def __init__(self):
+        self.data: dict[str, bytes] = {}
+
+    async def get(self, key: str) -> bytes | None:
+        return self.data.get(key)
+
+    async def set(self, key: str, value: bytes, ex: int | None = None) -> None:
+        self.data[key] = value
+
+
+def run_async(factory: Callable[[], Any]) -> Callable[[], Any]:
+    loop = asyncio.new_event_loop()
+    return lambda: loop.run_until_complete(factory())
+
+
+@benchmark('substrate.add_dividends_to_all')
+def bench_add_dividends_to_all() -> Callable[[], Any]:
+    entries = [(n, ss58_encode(raw), float(d)) for n, raw, d in synthetic_entries()]
+
+    def build() -> list:
+        results: list[dict] = []
+        for netuid, hotkey, dividend in entries:
+            results = AsyncSubstrateService._add_dividends_to_all(results, netuid, hotkey, dividend)
+        return results
+
+    return build
+
+
+@benchmark('substrate.get_all_dividends')
+def bench_get_all_dividends() -> Callable[[], Any]:
+    records = [
+        ([netuid, [tuple(raw)]], ScaleValue(dividend))
+        for netuid, raw, dividend in synthetic_entries()
+    ]
+    service = AsyncSubstrateService.__new__(AsyncSubstrateService)
+    service.substrate = FakeSubstrate(records)  # type: ignore[assignment]
+    return run_async(service.get_all_dividends)
+
+
+@benchmark('tao_dividends.netuid_hotkeys')
+def bench_netuid_hotkeys() -> Callable[[], Any]:
+    results = all_results()
+    return lambda: netuid_hotkeys(results, SUBNETS - 1)
+
+
+@benchmark('tao_dividends.hotkey_dividends')
+def bench_hotkey_dividends() -> Callable[[], Any]:
+    results = all_results()
+    hotkey = results[-1]['hotkeys'][-1]['hotkey']
+    return lambda: hotkey_dividends(results, hotkey)
+
+
+@benchmark('tao_dividends.pair_dividend')
+def bench_pair_dividend() -> Callable[[], Any]:
+    results = all_results()
+    hotkey = results[-1]['hotkeys'][-1]['hotkey']
+    return lambda: pair_dividend(results, SUBNETS - 1, hotkey)
+
+
+def snapshot_reader() -> DividendSnapshot:
+    path = f'{tempfile.mkdtemp()}/dividends.snapshot'
+    DividendSnapshot(path).write(all_results())
+    return DividendSnapshot(path)
+
+
+@benchmark('dividend_snapshot.write')
+def bench_snapshot_write() -> Callable[[], Any]:
+    writer = DividendSnapshot(f'{tempfile.mkdtemp()}/dividends.snapshot')
+    results = all_results()
+    return lambda: writer.write(results)
+
+
+@benchmark('dividend_snapshot.netuid')
+def bench_snapshot_netuid() -> Callable[[], Any]:
+    reader = snapshot_reader()
+    return lambda: reader.netuid(SUBNETS - 1)
+
+
+@benchmark('dividend_snapshot.hotkey')
+def bench_snapshot_hotkey() -> Callable[[], Any]:
+    reader = snapshot_reader()
+    hotkey = all_results()[-1]['hotkeys'][-1]['hotkey']
+    return lambda: reader.hotkey(hotkey)
+
+
+@benchmark('dividend_snapshot.pair')
+def bench_snapshot_pair() -> Callable[[], Any]:
+    reader = snapshot_reader()
+    hotkey = all_results()[-1]['hotkeys'][-1]['hotkey']
+    return lambda: reader.pair(SUBNETS - 1, hotkey)
+
+
+@benchmark('dividend_snapshot.all_json')
+def bench_snapshot_all_json() -> Callable[[], Any]:
+    reader = snapshot_reader()
+    return reader.all_json
+
+
+@benchmark('chutes.extract_sentiment_score')
+def bench_extract_sentiment_score() -> Callable[[], Any]:
+    def extract_all() -> list[float]:
+        return [ChutesService.extract_sentiment_score(text) for text in LLM_RESPONSES]
+
+    return extract_all
+
+
+def cache_benchmarks() -> None:
+    payloads = {
+        'all': {'results': all_results()},
+        'netuid': {'results': all_results()[0]['hotkeys']},
+        'pair': {'results': 123456789.0},
+    }
+    for size, payload in payloads.items():
+        key = f'dividends:{size}'
+
+        def bench_set(key: str = key, payload: dict = payload) -> Callable[[], Any]:
+            cache = RedisCache('redis://unused')
+            cache.redis = FakeRedis()  # type: ignore[assignment]
+            return run_async(lambda: cache.set(key, payload))
+
+        def bench_get(key: str = key, payload: dict = payload) -> Callable[[], Any]:
+            cache = RedisCache('redis://unused')
+            cache.redis = FakeRedis()  # type: ignore[assignment]
+            asyncio.run(cache.set(key, payload))
+            return run_async(lambda: cache.get(key))
+
+        benchmark(f'redis_cache.set[{size}]')(bench_set)
+        benchmark(f'redis_cache.get[{size}]')(bench_get)
+
+
+cache_benchmarks()
+
+
+def measure(fn: Callable[[], Any], rounds: int, min_time: float) -> float:
+    """
+    Best per-call time in seconds over `rounds` rounds of at least `min_time` each.
+    """
+    timer = timeit.Timer(fn)
+    number, elapsed = timer.autorange()
+    if elapsed < min_time:
+        number = max(1, int(number * min_time / max(elapsed, 1e-9)))
+    return min(timer.repeat(repeat=rounds, number=number)) / number
+
+
+def environment() -> dict:
+    return {
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'machine': platform.machine(),
+        'processor': platform.processor() or platform.machine(),
+        'system': platform.system(),
+    }
+
+
+def format_time(seconds: float) -> str:
+    for unit, scale in (('s', 1.0), ('ms', 1e-3), ('us', 1e-6)):
+        if seconds >= scale:
+            return f'{seconds / scale:8.2f} {unit}'
+    return f'{seconds / 1e-9:8.2f} ns'
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('-k', dest='pattern', default='', help='Only run matching benchmarks')
+    parser.add_argument('--rounds', type=int, default=5)
+    parser.add_argument('--min-time', type=float, default=0.2, help='Seconds per round')
+    parser.add_argument(
+        '--tolerance', type=float, default=0.25, help='Allowed slowdown vs. baseline (0.25 = 25%%)'
+    )
+    parser.add_argument('--baseline', type=Path, default=BASELINE)
+    parser.add_argument('--update-baseline', action='store_true')
+    args = parser.parse_args()
+
+    baseline = json.loads(args.baseline.read_text()) if args.baseline.exists() else {}
+    recorded = baseline.get('results', {})
+    if recorded and baseline.get('environment') != environment():
+        print(
+            f'Baseline was recorded on {baseline.get("environment")}; '
+            'comparisons with this machine are indicative only.'
+        )
+
+    results: dict[str, float] = {}
+    regressions = []
+    print(f'{"benchmark":40} {"time":>11} {"baseline":>11} {"change":>8}')
+    for bench in BENCHMARKS:
+        if args.pattern not in bench.name:
+            continue
+        seconds = measure(bench.setup(), args.rounds, args.min_time)
+        results[bench.name] = seconds
+        line = f'{bench.name:40} {format_time(seconds)}'
+        if bench.name in recorded:
+            change = seconds / recorded[bench.name] - 1
+            line += f' {format_time(recorded[bench.name])} {change:+7.1%}'
+            if change > args.tolerance:
+                regressions.append(bench.name)
+                line += '  REGRESSION'
+        print(line, flush=True)
+
+    if args.update_baseline:
+        recorded.update(results)
+        args.baseline.write_text(
+            json.dumps({'environment': environment(), 'results': recorded}, indent=2) + '\n'
+        )
+        print(f'Baseline written to {args.baseline}')
+        return 0
+    if regressions:
+        print(f'Slower than baseline by more than {args.tolerance:.0%}: {", ".join(regressions)}')
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
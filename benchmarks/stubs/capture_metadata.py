@@ -0,0 +1,64 @@
+import argparse
+import asyncio
+import json
+from pathlib import Path
+
+import websockets
+
+from benchmarks.stubs.substrate import DEFAULT_FIXTURE
+
+"""
+Capture the runtime responses the fake substrate endpoint replays.
+
+Runtime metadata is a large SCALE blob that cannot be synthesized, so it is
+recorded once from a real Subtensor node:
+
+    python -m benchmarks.stubs.capture_metadata --url wss://test.finney.opentensor.ai:443
+"""
+
+PLAIN_METHODS = (
+    'system_chain',
+    'system_name',
+    'system_version',
+    'system_properties',
+    'rpc_methods',
+)
+
+
+async def capture(url: str, output: Path) -> None:
+    async with websockets.connect(url, max_size=2**26) as ws:
+        next_id = 0
+
+        async def call(method: str, params: list):
+            nonlocal next_id
+            next_id += 1
+            await ws.send(
+                json.dumps({'jsonrpc': '2.0', 'id': next_id, 'method': method, 'params': params})
+            )
+            while True:
+                message = json.loads(await ws.recv())
+                if message.get('id') == next_id:
+                    if 'error' in message:
+                        raise RuntimeError(f'{method} failed: {message["error"]}')
+                    return message['result']
+
+        fixture: dict = {method: await call(method, []) for method in PLAIN_METHODS}
+        head = await call('chain_getHead', [])
+        fixture['genesis_hash'] = await call('chain_getBlockHash', [0])
+        fixture['state_getRuntimeVersion'] = await call('state_getRuntimeVersion', [head])
+        fixture['state_getMetadata'] = await call('state_getMetadata', [head])
+        fixture['state_call:Metadata_metadata_at_version'] = await call(
+            'state_call', ['Metadata_metadata_at_version', '0x0f000000', head]
+        )
+
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(fixture))
+    print(f'Metadata fixture written to {output}', flush=True)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Capture substrate metadata for the fake node.')
+    parser.add_argument('--url', default='wss://test.finney.opentensor.ai:443')
+    parser.add_argument('--output', type=Path, default=DEFAULT_FIXTURE)
+    args = parser.parse_args()
+    asyncio.run(capture(args.url, args.output))
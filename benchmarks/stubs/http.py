@@ -0,0 +1,81 @@
+import asyncio
+import itertools
+import random
+import time
+from datetime import datetime, timezone
+
+from fastapi import FastAPI, Request
+
+"""
+HTTP stand-ins for Datura (tweet search) and Chutes (OpenAI-compatible chat completions).
+"""
+
+TWEET_TEMPLATES = (
+    'Subnet {netuid} is looking bullish, great launch 🚀',
+    'Validators on subnet {netuid} report an outage again',
+    'Just staked more TAO on subnet {netuid}, love the team',
+    'Is subnet {netuid} a scam? Emissions are dumping',
+    'Weekly update for subnet {netuid}: new partnership announced',
+    'Meeting notes about subnet {netuid} miners',
+)
+
+
+def create_datura_app(latency: float = 0.0) -> FastAPI:
+    """
+    Build a Datura stub answering `GET /twitter` with fresh synthetic tweets.
+
+    Args:
+        latency (float): Seconds to wait before answering each request.
+    """
+    app = FastAPI()
+    ids = itertools.count(1)
+
+    @app.get('/twitter')
+    async def search(query: str = 'netuid:0', count: int = 10) -> list[dict]:
+        if latency:
+            await asyncio.sleep(latency)
+        netuid = query.split(':')[-1]
+        now = datetime.now(timezone.utc).isoformat()
+        return [
+            {
+                'id': str(next(ids)),
+                'text': random.choice(TWEET_TEMPLATES).format(netuid=netuid),
+                'created_at': now,
+            }
+            for _ in range(count)
+        ]
+
+    return app
+
+
+def create_chutes_app(latency: float = 0.0) -> FastAPI:
+    """
+    Build an OpenAI-compatible Chutes stub answering `POST /v1/chat/completions`
+    with a random sentiment score.
+
+    Args:
+        latency (float): Seconds to wait before answering each request.
+    """
+    app = FastAPI()
+
+    @app.post('/v1/chat/completions')
+    async def completions(request: Request) -> dict:
+        body = await request.json()
+        if latency:
+            await asyncio.sleep(latency)
+        return {
+            'id': f'chatcmpl-{random.getrandbits(48):x}',
+            'object': 'chat.completion',
+            'created': int(time.time()),
+            'model': body.get('model', 'stub'),
+            'choices': [
+                {
+                    'index': 0,
+                    'message': {'role': 'assistant', 'content': f'{random.uniform(-100, 100):.1f}'},
+                    'finish_reason': 'stop',
+                }
+            ],
+            'usage': {'prompt_tokens': 0, 'completion_tokens': 1, 'total_tokens': 1},
+        }
+
+    return app
@@ -0,0 +1,244 @@
+import asyncio
+import bisect
+import hashlib
+import json
+import random
+import time
+from pathlib import Path
+from typing import Any, Optional
+
+import websockets
+import xxhash
+from scalecodec import ss58_encode
+
+"""
+Fake Subtensor JSON-RPC websocket endpoint.
+
+Serves a synthetic `SubtensorModule.TaoDividendsPerSubnet` map with a configurable
+number of subnets and hotkeys, plus the handful of runtime and storage RPCs the
+API and worker issue. Runtime metadata cannot be synthesized, so it is replayed
+from a fixture captured once from a real node (see `capture_metadata.py`).
+"""
+
+DEFAULT_FIXTURE = Path(__file__).resolve().parent.parent / 'fixtures' / 'substrate_metadata.json'
+
+
+def twox_128(data: bytes) -> bytes:
+    return b''.join(xxhash.xxh64(data, seed=seed).digest()[::-1] for seed in (0, 1))
+
+
+def blake2_128_concat(data: bytes) -> bytes:
+    return hashlib.blake2b(data, digest_size=16).digest() + data
+
+
+def storage_prefix(pallet: str, storage: str) -> bytes:
+    return twox_128(pallet.encode()) + twox_128(storage.encode())
+
+
+# Storage layouts as declared by the subtensor pallet.
+DIVIDENDS_PREFIX = storage_prefix('SubtensorModule', 'TaoDividendsPerSubnet')
+UIDS_PREFIX = storage_prefix('SubtensorModule', 'Uids')
+ACCOUNT_PREFIX = storage_prefix('System', 'Account')
+
+
+class FakeChain:
+    """
+    Deterministic chain state: `subnets` subnets with `hotkeys` hotkeys each.
+
+    Hotkeys and dividends are derived from a seed so the load generator can build
+    valid queries without talking to the stub.
+    """
+
+    def __init__(self, subnets: int, hotkeys: int, block_time: float = 12.0, seed: int = 42):
+        self.subnets = subnets
+        self.hotkeys_per_subnet = hotkeys
+        self.block_time = block_time
+        self.started = time.time()
+        self.nonces: dict[str, int] = {}
+        rng = random.Random(seed)
+
+        self.hotkeys: dict[int, list[str]] = {}
+        self.storage: dict[str, str] = {}
+        for netuid in range(1, subnets + 1):
+            self.hotkeys[netuid] = []
+            for index in range(hotkeys):
+                pubkey = hashlib.sha256(f'{seed}:{netuid}:{index}'.encode()).digest()
+                self.hotkeys[netuid].append(ss58_encode(pubkey, 42))
+                key = DIVIDENDS_PREFIX + netuid.to_bytes(2, 'little') + blake2_128_concat(pubkey)
+                dividend = rng.randint(0, 10**12)
+                self.storage['0x' + key.hex()] = '0x' + dividend.to_bytes(8, 'little').hex()
+        self.sorted_keys = sorted(self.storage)
+
+    @property
+    def block_number(self) -> int:
+        return int((time.time() - self.started) / self.block_time) + 1
+
+    @staticmethod
+    def block_hash(number: int) -> str:
+        return '0x' + hashlib.blake2b(number.to_bytes(8, 'little'), digest_size=32).hexdigest()
+
+    def header(self, number: int) -> dict:
+        return {
+            'parentHash': self.block_hash(number - 1),
+            'number': hex(number),
+            'stateRoot': '0x' + '00' * 32,
+            'extrinsicsRoot': '0x' + '00' * 32,
+            'digest': {'logs': []},
+        }
+
+    def get_storage(self, key: str) -> Optional[str]:
+        if key in self.storage:
+            return self.storage[key]
+        raw = bytes.fromhex(key[2:])
+        if raw.startswith(UIDS_PREFIX):
+            # Every hotkey is registered with UID 0.
+            return '0x0000'
+        if raw.startswith(ACCOUNT_PREFIX):
+            # AccountInfo: nonce, consumers, providers, sufficients, then free/reserved/frozen
+            # balances and flags. Every account gets 1000 TAO of free balance.
+            return (
+                '0x'
+                + (
+                    (0).to_bytes(4, 'little') * 2
+                    + (1).to_bytes(4, 'little')
+                    + (0).to_bytes(4, 'little')
+                    + (1000 * 10**9).to_bytes(8, 'little')
+                    + (0).to_bytes(8, 'little') * 2
+                    + (0).to_bytes(16, 'little')
+                ).hex()
+            )
+        return None
+
+    def keys_paged(self, prefix: str, count: int, start_key: Optional[str]) -> list[str]:
+        start = max(
+            bisect.bisect_left(self.sorted_keys, prefix),
+            bisect.bisect_right(self.sorted_keys, start_key) if start_key else 0,
+        )
+        keys = []
+        for key in self.sorted_keys[start : start + count]:
+            if not key.startswith(prefix):
+                break
+            keys.append(key)
+        return keys
+
+
+class FakeSubstrateServer:
+    """
+    JSON-RPC websocket server answering with `FakeChain` state after a fixed latency.
+    """
+
+    def __init__(self, chain: FakeChain, latency: float = 0.0, fixture: Path = DEFAULT_FIXTURE):
+        self.chain = chain
+        self.latency = latency
+        self.fixture: dict[str, Any] = {}
+        if fixture.exists():
+            self.fixture = json.loads(fixture.read_text())
+        else:
+            print(
+                f'[WARN] No metadata fixture at {fixture}; run benchmarks.stubs.capture_metadata '
+                + 'first or runtime initialization will fail.',
+                flush=True,
+            )
+
+    def _replay(self, method: str, params: list) -> Any:
+        if method == 'state_call':
+            return self.fixture.get(f'state_call:{params[0]}')
+        return self.fixture.get(method)
+
+    def handle(self, method: str, params: list) -> tuple[Any, Optional[list]]:
+        """
+        Answer one JSON-RPC call.
+
+        Returns:
+            tuple: The result and, for subscriptions, the notifications to push afterwards.
+        """
+        chain = self.chain
+        head = chain.block_number
+        if method in ('chain_getHead', 'chain_getFinalizedHead'):
+            return chain.block_hash(head), None
+        if method == 'chain_getBlockHash':
+            number = params[0] if params and params[0] is not None else head
+            if number == 0 and 'genesis_hash' in self.fixture:
+                return self.fixture['genesis_hash'], None
+            return chain.block_hash(int(number)), None
+        if method == 'chain_getHeader':
+            return chain.header(head), None
+        if method == 'chain_getBlock':
+            return {
+                'block': {'header': chain.header(head), 'extrinsics': []},
+                'justifications': None,
+            }, None
+        if method == 'state_getKeysPaged':
+            prefix, count = params[0], params[1]
+            start_key = params[2] if len(params) > 2 else None
+            return chain.keys_paged(prefix, count, start_key), None
+        if method == 'state_queryStorageAt':
+            keys = params[0]
+            changes = [[key, chain.get_storage(key)] for key in keys]
+            return [{'block': chain.block_hash(head), 'changes': changes}], None
+        if method in ('state_getStorage', 'state_getStorageAt'):
+            return chain.get_storage(params[0]), None
+        if method == 'account_nextIndex':
+            nonce = chain.nonces.get(params[0], 0)
+            chain.nonces[params[0]] = nonce + 1
+            return nonce, None
+        if method == 'author_submitExtrinsic':
+            return '0x' + hashlib.blake2b(
+                bytes.fromhex(params[0][2:]), digest_size=32
+            ).hexdigest(), None
+        if method == 'author_submitAndWatchExtrinsic':
+            block = chain.block_hash(head + 1)
+            return f'sub-{random.getrandbits(64):x}', [
+                ('author_extrinsicUpdate', 'ready'),
+                ('author_extrinsicUpdate', {'inBlock': block}),
+                ('author_extrinsicUpdate', {'finalized': block}),
+            ]
+        if method in ('chain_subscribeNewHeads', 'chain_subscribeFinalizedHeads'):
+            return f'sub-{random.getrandbits(64):x}', [('chain_newHead', chain.header(head))]
+        replayed = self._replay(method, params)
+        if replayed is not None:
+            return replayed, None
+        raise KeyError(method)
+
+    async def _respond(self, ws, message: dict) -> None:
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        request_id = message.get('id')
+        try:
+            result, notifications = self.handle(message['method'], message.get('params') or [])
+        except KeyError:
+            await ws.send(
+                json.dumps({
+                    'jsonrpc': '2.0',
+                    'id': request_id,
+                    'error': {'code': -32601, 'message': f'Method not found: {message["method"]}'},
+                })
+            )
+            return
+        await ws.send(json.dumps({'jsonrpc': '2.0', 'id': request_id, 'result': result}))
+        for method, payload in notifications or []:
+            await asyncio.sleep(self.chain.block_time / 4 if self.latency else 0)
+            await ws.send(
+                json.dumps({
+                    'jsonrpc': '2.0',
+                    'method': method,
+                    'params': {'subscription': result, 'result': payload},
+                })
+            )
+
+    async def _connection(self, ws) -> None:
+        tasks: set[asyncio.Task] = set()
+        try:
+            async for raw in ws:
+                payload = json.loads(raw)
+                for message in payload if isinstance(payload, list) else [payload]:
+                    task = asyncio.create_task(self._respond(ws, message))
+                    tasks.add(task)
+                    task.add_done_callback(tasks.discard)
+        except websockets.ConnectionClosed:
+            for task in tasks:
+                task.cancel()
+
+    async def serve(self, host: str, port: int) -> None:
+        async with websockets.serve(self._connection, host, port, max_size=2**26):
+            await asyncio.Future()
@@ -0,0 +1,52 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from bittensor import Balance
+
+from app.services.account_state import AccountStateCache
+
+
+def make_cache(head: str = '0x1') -> tuple[AccountStateCache, MagicMock]:
+    subtensor = MagicMock()
+    subtensor.substrate.get_chain_head = AsyncMock(return_value=head)
+    subtensor.get_balance = AsyncMock(return_value=Balance.from_tao(10))
+    subtensor.get_stake = AsyncMock(return_value=Balance.from_tao(2))
+    subtensor.is_hotkey_registered = AsyncMock(return_value=True)
+    return AccountStateCache(subtensor, 'coldkey', block_time=60), subtensor
+
+
+@pytest.mark.asyncio
+async def test_concurrent_trades_share_one_fetch_per_block():
+    cache, subtensor = make_cache()
+
+    results = await asyncio.gather(*(cache.get(18, 'hotkey') for _ in range(10)))
+
+    assert results[0] == (Balance.from_tao(10), Balance.from_tao(2), True)
+    subtensor.substrate.get_chain_head.assert_awaited_once()
+    subtensor.get_balance.assert_awaited_once_with('coldkey', block_hash='0x1')
+    subtensor.get_stake.assert_awaited_once()
+    subtensor.is_hotkey_registered.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_new_block_drops_cached_state():
+    cache, subtensor = make_cache()
+    await cache.get(18, 'hotkey')
+
+    cache.block_time = 0
+    subtensor.substrate.get_chain_head.return_value = '0x2'
+    await cache.get(18, 'hotkey')
+
+    assert subtensor.get_balance.await_count == 2
+    assert cache.block_hash == '0x2'
+
+
+@pytest.mark.asyncio
+async def test_apply_updates_state_optimistically():
+    cache, _ = make_cache()
+    await cache.get(18, 'hotkey')
+
+    cache.apply(18, 'hotkey', Balance.from_tao(1), staked=True)
+
+    assert await cache.get(18, 'hotkey') == (Balance.from_tao(9), Balance.from_tao(3), True)
@@ -0,0 +1,128 @@
+import time
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+from app.cache.backpressure import TradeBackpressure
+from app.core.config import settings
+from app.main import app
+
+
+def make_backpressure(
+    depths: list, in_flight: dict, **kwargs
+) -> tuple[TradeBackpressure, MagicMock]:
+    cache = MagicMock()
+    pipe = MagicMock()
+    seen = dict.fromkeys(in_flight, str(time.time()))
+    pipe.execute = AsyncMock(return_value=[*depths, in_flight, seen])
+    cache.redis.pipeline.return_value.__aenter__ = AsyncMock(return_value=pipe)
+    cache.redis.pipeline.return_value.__aexit__ = AsyncMock(return_value=None)
+    options = {
+        'max_queue_depth': 100,
+        'max_in_flight': 0,
+        'sample_interval': 60,
+        'retry_after': 7,
+        **kwargs,
+    }
+    return TradeBackpressure(cache, ['fetch', 'score'], **options), pipe
+
+
+@pytest.mark.asyncio
+async def test_sample_reads_queue_depths_and_in_flight():
+    backpressure, pipe = make_backpressure([3, 4], {'a:1': '2', 'b:2': '5'})
+
+    assert await backpressure.sample() == {
+        'queue_depth': {'fetch': 3, 'score': 4},
+        'in_flight': 7,
+    }
+    assert [call.args for call in pipe.llen.call_args_list] == [('fetch',), ('score',)]
+    pipe.hdel.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_sample_drops_workers_without_a_recent_heartbeat():
+    backpressure, pipe = make_backpressure([0, 0], {'a:1': '2', 'b:2': '5'})
+    depths_and_counts = pipe.execute.return_value[:3]
+    pipe.execute.return_value = [*depths_and_counts, {'a:1': str(time.time()), 'b:2': '0'}]
+
+    assert (await backpressure.sample())['in_flight'] == 2
+    assert [call.args for call in pipe.hdel.call_args_list] == [
+        ('worker:in_flight', 'b:2'),
+        ('worker:in_flight:seen', 'b:2'),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_retry_after_over_queue_depth():
+    backpressure, _ = make_backpressure([60, 40], {})
+    assert await backpressure.retry_after() == 7
+
+    backpressure, _ = make_backpressure([60, 39], {})
+    assert await backpressure.retry_after() is None
+
+
+@pytest.mark.asyncio
+async def test_retry_after_over_in_flight():
+    backpressure, _ = make_backpressure([0, 0], {'a:1': '16'}, max_in_flight=16)
+    assert await backpressure.retry_after() == 7
+
+
+@pytest.mark.asyncio
+async def test_sample_is_cached():
+    backpressure, pipe = make_backpressure([0, 0], {})
+
+    await backpressure.retry_after()
+    await backpressure.retry_after()
+
+    pipe.execute.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_fails_open():
+    without_redis = TradeBackpressure(MagicMock(spec=[]), ['celery'], 1, 1, 1.0, 7)
+    assert await without_redis.retry_after() is None
+
+    broken, pipe = make_backpressure([0, 0], {})
+    pipe.execute.side_effect = ConnectionError('down')
+    assert await broken.retry_after() is None
+
+
+@pytest.mark.asyncio
+@patch('app.cache.singleton.redis_cache.get', new_callable=AsyncMock)
+@patch('app.cache.singleton.redis_cache.set', new_callable=AsyncMock)
+@patch(
+    'app.services.singleton.substrate_service.get_dividends_for_netuid_hotkey',
+    new_callable=AsyncMock,
+)
+@patch('app.cache.singleton.trade_dedup.release', new_callable=AsyncMock)
+@patch('app.cache.singleton.trade_dedup.claim', new_callable=AsyncMock)
+@patch('app.cache.singleton.trade_backpressure.retry_after', new_callable=AsyncMock)
+@patch('app.api.v1.tao_dividends.analyze_and_stake.apply_async')
+async def test_trade_shed_with_retry_after(
+    mock_apply_async, mock_retry_after, mock_claim, mock_release, mock_dividends, _, mock_cache_get
+):
+    mock_cache_get.return_value = None
+    mock_dividends.return_value = 80.0
+    mock_claim.return_value = ('task-id', False)
+    mock_retry_after.return_value = 7
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url='http://test') as client:
+        shed = await client.get(
+            '/api/v1/tao_dividends?netuid=18&hotkey=5FFApaS75bv5pJHfAp2FVLBj9ZaXuFDjEypsaBNc1wCfe52v&trade=true',
+            headers={'Authorization': settings.auth_token},
+        )
+        read = await client.get(
+            '/api/v1/tao_dividends?netuid=18&hotkey=5FFApaS75bv5pJHfAp2FVLBj9ZaXuFDjEypsaBNc1wCfe52v',
+            headers={'Authorization': settings.auth_token},
+        )
+
+    assert shed.status_code == 429
+    assert shed.headers['Retry-After'] == '7'
+    mock_release.assert_awaited_once_with(
+        18, '5FFApaS75bv5pJHfAp2FVLBj9ZaXuFDjEypsaBNc1wCfe52v', 'task-id', None
+    )
+    mock_apply_async.assert_not_called()
+    assert read.status_code == 200
+    assert read.json()['dividend'] == 80.0
@@ -0,0 +1,98 @@
+from unittest.mock import AsyncMock, MagicMock
+
+import httpx
+import pytest
+
+from app.cache.circuit_breaker import CircuitBreaker, CircuitOpenError, is_http_outage
+
+
+def make_breaker(eval_results) -> tuple[CircuitBreaker, MagicMock]:
+    cache = MagicMock()
+    cache.redis.eval = AsyncMock(side_effect=eval_results)
+    return CircuitBreaker(cache, 'datura', failure_threshold=3, recovery_timeout=10), cache
+
+
+def http_error(status: int) -> httpx.HTTPStatusError:
+    request = httpx.Request('GET', 'https://example.com')
+    return httpx.HTTPStatusError(
+        'error', request=request, response=httpx.Response(status, request=request)
+    )
+
+
+@pytest.mark.asyncio
+async def test_open_circuit_fails_fast():
+    breaker, _ = make_breaker([[0, '7.5']])
+
+    with pytest.raises(CircuitOpenError):
+        async with breaker.protect():
+            pytest.fail('Upstream must not be called while the circuit is open')
+
+
+@pytest.mark.asyncio
+async def test_success_closes_circuit():
+    breaker, cache = make_breaker([[2, '0'], 0])
+
+    async with breaker.protect():
+        pass
+
+    scripts = [call.args[0] for call in cache.redis.eval.await_args_list]
+    assert scripts == [CircuitBreaker.ALLOW_SCRIPT, CircuitBreaker.SUCCESS_SCRIPT]
+
+
+@pytest.mark.asyncio
+async def test_outage_records_failure():
+    breaker, cache = make_breaker([[1, '0'], 1])
+
+    with pytest.raises(httpx.HTTPStatusError):
+        async with breaker.protect(is_http_outage):
+            raise http_error(503)
+
+    last_call = cache.redis.eval.await_args_list[-1]
+    assert last_call.args[0] == CircuitBreaker.FAILURE_SCRIPT
+    assert last_call.args[-1] == 3
+
+
+@pytest.mark.asyncio
+async def test_client_error_is_not_a_failure():
+    breaker, cache = make_breaker([[1, '0']])
+
+    with pytest.raises(httpx.HTTPStatusError):
+        async with breaker.protect(is_http_outage):
+            raise http_error(404)
+
+    scripts = [call.args[0] for call in cache.redis.eval.await_args_list]
+    assert scripts == [CircuitBreaker.ALLOW_SCRIPT]
+
+
+@pytest.mark.asyncio
+async def test_throttled_probe_gives_the_slot_back_without_closing():
+    breaker, cache = make_breaker([[2, '0'], 0])
+
+    with pytest.raises(httpx.HTTPStatusError):
+        async with breaker.protect(is_http_outage):
+            raise http_error(429)
+
+    scripts = [call.args[0] for call in cache.redis.eval.await_args_list]
+    assert scripts == [CircuitBreaker.ALLOW_SCRIPT, CircuitBreaker.RELEASE_PROBE_SCRIPT]
+
+
+@pytest.mark.asyncio
+async def test_fails_open_without_redis():
+    breaker = CircuitBreaker(MagicMock(spec=[]), 'chutes')
+
+    async with breaker.protect():
+        pass
+
+
+@pytest.mark.parametrize(
+    'exc,expected',
+    [
+        (httpx.ConnectError('refused'), True),
+        (http_error(500), True),
+        (http_error(429), False),
+        (http_error(400), False),
+        (KeyError('choices'), False),
+    ],
+)
+def test_is_http_outage(exc, expected):
+    assert is_http_outage(exc) is expected
@@ -1,3 +1,6 @@
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, patch
+
 import httpx
 import pytest
 import respx
@@ -63,3 +66,85 @@ async def test_search_tweets_retry_then_success():
 
     assert result == ['Retry succeeded!']
     assert call_count == 2
+
+
+@respx.mock
+@pytest.mark.asyncio
+async def test_fetch_tweets_since_cursor():
+    route = respx.get(DaturaService.API_URL).mock(
+        return_value=Response(200, json=[{'id': '1', 'text': 'New tweet'}, {'id': '2'}])
+    )
+    since = datetime(2025, 4, 20, 12, 0, tzinfo=timezone.utc)
+
+    result = await DaturaService.fetch_tweets(18, since)
+
+    assert result == [{'id': '1', 'text': 'New tweet'}]
+    params = route.calls.last.request.url.params
+    assert params['start_date'] == '2025-04-20'
+    assert params['sort'] == 'Latest'
+
+
+@pytest.mark.asyncio
+@patch('app.services.datura_service.redis_cache.ensure_connection', new_callable=AsyncMock)
+@patch('app.services.datura_service.tweet_store')
+@patch('app.services.datura_service.DaturaService.fetch_tweets', new_callable=AsyncMock)
+async def test_get_recent_tweets_fetches_once_when_stale(mock_fetch, mock_store, _):
+    mock_store.is_fresh = AsyncMock(return_value=False)
+    mock_store.acquire_fetch = AsyncMock(return_value='token')
+    mock_store.cursor = AsyncMock(return_value=None)
+    mock_store.add = AsyncMock(return_value=1)
+    mock_store.mark_fresh = AsyncMock()
+    mock_store.release_fetch = AsyncMock()
+    mock_store.window = AsyncMock(return_value=['Stored tweet'])
+    mock_fetch.return_value = [{'id': '1', 'text': 'Stored tweet'}]
+
+    result = await DaturaService.get_recent_tweets(18)
+
+    assert result == ['Stored tweet']
+    mock_fetch.assert_awaited_once_with(18, None)
+    mock_store.add.assert_awaited_once_with(18, mock_fetch.return_value)
+    mock_store.release_fetch.assert_awaited_once_with(18, 'token')
+
+
+@pytest.mark.asyncio
+@patch('app.services.datura_service.redis_cache.ensure_connection', new_callable=AsyncMock)
+@patch('app.services.datura_service.tweet_store')
+@patch('app.services.datura_service.DaturaService.fetch_tweets', new_callable=AsyncMock)
+async def test_get_recent_tweets_skips_fetch_when_fresh(mock_fetch, mock_store, _):
+    mock_store.is_fresh = AsyncMock(return_value=True)
+    mock_store.window = AsyncMock(return_value=['Stored tweet'])
+
+    result = await DaturaService.get_recent_tweets(18)
+
+    assert result == ['Stored tweet']
+    mock_fetch.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+@patch('app.services.datura_service.redis_cache.ensure_connection', new_callable=AsyncMock)
+@patch('app.services.datura_service.tweet_store')
+@patch('app.services.datura_service.DaturaService.search_tweets', new_callable=AsyncMock)
+async def test_get_recent_tweets_falls_back_without_store(mock_search, mock_store, _):
+    mock_store.is_fresh = AsyncMock(side_effect=ConnectionError('Redis down'))
+    mock_search.return_value = ['Direct tweet']
+
+    result = await DaturaService.get_recent_tweets(18)
+
+    assert result == ['Direct tweet']
+
+
+@respx.mock
+@pytest.mark.asyncio
+@patch('app.services.datura_service.datura_limiter.penalize', new_callable=AsyncMock)
+async def test_search_tweets_429_penalizes_bucket(mock_penalize):
+    respx.get(DaturaService.API_URL).mock(
+        side_effect=[
+            Response(429, headers={'Retry-After': '3'}),
+            Response(200, json=[{'text': 'After throttle'}]),
+        ]
+    )
+
+    result = await DaturaService.search_tweets(18)
+
+    assert result == ['After throttle']
+    mock_penalize.assert_awaited_once_with(3.0)
@@ -0,0 +1,165 @@
+import os
+import time
+from unittest.mock import AsyncMock, patch
+
+import orjson
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+from app.cache.dividend_snapshot import DividendSnapshot
+from app.core.config import settings
+from app.main import app
+
+HOTKEY_A = '5FFApaS75bv5pJHfAp2FVLBj9ZaXuFDjEypsaBNc1wCfe52v'
+HOTKEY_B = '5GrwvaEF5zXb26Fz9rcQpDWS57CtERHpNehXCPcNoHGKutQY'
+
+RESULTS = [
+    {'netuid': 1, 'hotkeys': [{'hotkey': HOTKEY_B, 'dividends': 5.0}]},
+    {
+        'netuid': 18,
+        'hotkeys': [
+            {'hotkey': HOTKEY_B, 'dividends': 7.5},
+            {'hotkey': HOTKEY_A, 'dividends': 42.0},
+        ],
+    },
+]
+
+
+@pytest.fixture
+def paths(tmp_path):
+    path = str(tmp_path / 'dividends.snapshot')
+    writer = DividendSnapshot(path, capacity=4096)
+    reader = DividendSnapshot(path)
+    yield writer, reader
+    writer.close()
+    reader.close()
+
+
+def test_lookups_read_the_published_snapshot(paths):
+    writer, reader = paths
+    assert reader.netuid(18) is None
+
+    assert writer.write(RESULTS) == 1
+
+    assert reader.netuid(18) == RESULTS[1]['hotkeys']
+    assert reader.netuid(2) is None
+    assert reader.hotkey(HOTKEY_B) == [
+        {'netuid': 1, 'dividend': 5.0},
+        {'netuid': 18, 'dividend': 7.5},
+    ]
+    assert reader.hotkey(HOTKEY_A.replace('5F', '5G', 1)) == []
+    assert reader.pair(18, HOTKEY_A) == 42.0
+    assert reader.pair(1, HOTKEY_A) is None
+    assert orjson.loads(reader.all_json()) == RESULTS
+    assert reader.status()['entries'] == 3
+
+
+def test_new_generations_replace_the_old_one(paths):
+    writer, reader = paths
+    writer.write(RESULTS)
+    assert reader.pair(18, HOTKEY_A) == 42.0
+
+    updated = [{'netuid': 18, 'hotkeys': [{'hotkey': HOTKEY_A, 'dividends': 43.0}]}]
+    assert writer.write(updated) == 2
+    assert reader.pair(18, HOTKEY_A) == 43.0
+    assert reader.netuid(1) is None
+    assert reader.status()['generation'] == 2
+
+
+def test_reader_retries_when_its_slot_is_overwritten(paths):
+    writer, reader = paths
+    writer.write(RESULTS)
+    attempts = []
+
+    def read(mapped, base, generation):
+        attempts.append(generation)
+        if len(attempts) == 1:
+            # Two publishes during the read reuse the slot being read.
+            writer.write([{'netuid': 3, 'hotkeys': []}])
+            writer.write([{'netuid': 4, 'hotkeys': []}])
+        return generation
+
+    assert reader._read(read) == 3
+    assert attempts == [1, 3]
+
+
+def test_growing_snapshot_moves_readers_to_a_new_file(paths):
+    writer, reader = paths
+    writer.write(RESULTS)
+    assert reader.pair(18, HOTKEY_A) == 42.0
+
+    large = [
+        {'netuid': netuid, 'hotkeys': [{'hotkey': HOTKEY_A, 'dividends': float(netuid)}]}
+        for netuid in range(200)
+    ]
+    assert writer.write(large) == 2
+    assert reader.pair(150, HOTKEY_A) == 150.0
+    assert len(reader.hotkey(HOTKEY_A)) == 200
+
+
+def test_reader_remaps_a_recreated_file(paths):
+    writer, reader = paths
+    writer.write(RESULTS)
+    assert reader.pair(18, HOTKEY_A) == 42.0
+    assert reader.netuid(1) == RESULTS[0]['hotkeys']
+
+    # A fresh refresher starts over after the file was deleted.
+    writer.close()
+    os.remove(writer.path)
+    fresh = DividendSnapshot(writer.path)
+    fresh.write([
+        {'netuid': 1, 'hotkeys': []},
+        {'netuid': 18, 'hotkeys': [{'hotkey': HOTKEY_A, 'dividends': 7.0}]},
+    ])
+
+    assert reader.pair(18, HOTKEY_A) == 42.0
+    with patch('app.cache.dividend_snapshot.STAT_INTERVAL', 0):
+        assert reader.pair(18, HOTKEY_A) == 7.0
+        assert reader.status()['generation'] == 1
+        # Same generation number as the old file, but its own netuid table.
+        assert reader.netuid(18) == [{'hotkey': HOTKEY_A, 'dividends': 7.0}]
+    fresh.close()
+
+
+def test_stale_snapshot_is_ignored(paths):
+    writer, _ = paths
+    writer.write(RESULTS)
+    reader = DividendSnapshot(writer.path, max_age=60)
+    assert reader.pair(18, HOTKEY_A) == 42.0
+
+    with patch('app.cache.dividend_snapshot.time.time', return_value=time.time() + 120):
+        assert reader.pair(18, HOTKEY_A) is None
+    reader.close()
+
+
+@pytest.mark.asyncio
+@patch('app.cache.singleton.redis_cache.get', new_callable=AsyncMock)
+async def test_tao_dividends_is_served_from_the_snapshot(mock_get, tmp_path):
+    writer = DividendSnapshot(str(tmp_path / 'dividends.snapshot'))
+    writer.write(RESULTS)
+    reader = DividendSnapshot(writer.path)
+    mock_get.return_value = None
+
+    transport = ASGITransport(app=app)
+    with (
+        patch.object(settings, 'dividend_snapshot', True),
+        patch('app.api.v1.tao_dividends.dividend_snapshot', reader),
+    ):
+        async with AsyncClient(transport=transport, base_url='http://test') as client:
+            headers = {'Authorization': settings.auth_token}
+            pair = await client.get(
+                f'/api/v1/tao_dividends?netuid=18&hotkey={HOTKEY_A}', headers=headers
+            )
+            everything = await client.get('/api/v1/tao_dividends', headers=headers)
+
+    assert pair.json() == {
+        'netuid': 18,
+        'hotkey': HOTKEY_A,
+        'dividend': 42.0,
+        'cached': True,
+        'stake_tx_triggered': False,
+    }
+    assert everything.json() == {'results': RESULTS, 'cached': True}
+    assert not any(call.args[0].startswith('dividends:') for call in mock_get.await_args_list)
+    writer.close()
+    reader.close()
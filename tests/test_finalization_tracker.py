@@ -0,0 +1,80 @@
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.services.finalization_tracker import FinalizationTracker
+
+
+def extrinsic(hash_hex: str) -> MagicMock:
+    return MagicMock(extrinsic_hash=bytes.fromhex(hash_hex))
+
+
+def system_event(index: int, name: str, attributes: dict | None = None) -> dict:
+    return {
+        'extrinsic_idx': index,
+        'event': {'module_id': 'System', 'event_id': name, 'attributes': attributes or {}},
+    }
+
+
+def test_block_outcomes_matches_events_to_extrinsics():
+    extrinsics = [MagicMock(extrinsic_hash=None), extrinsic('aa'), extrinsic('bb')]
+    events = [
+        system_event(0, 'ExtrinsicSuccess'),
+        system_event(1, 'ExtrinsicSuccess'),
+        {'extrinsic_idx': 2, 'event': {'module_id': 'Balances', 'event_id': 'Withdraw'}},
+        system_event(2, 'ExtrinsicFailed', {'dispatch_error': {'Module': 'NotEnoughStake'}}),
+    ]
+
+    outcomes = FinalizationTracker.block_outcomes(extrinsics, events)
+
+    assert outcomes == {
+        '0xaa': ('success', None),
+        '0xbb': ('failed', "{'Module': 'NotEnoughStake'}"),
+    }
+
+
+def test_recent_outcomes_are_bounded():
+    tracker = FinalizationTracker(MagicMock(), MagicMock(spec=[]), recent_size=2)
+
+    tracker._remember({'0x1': ('success', None), '0x2': ('success', None)})
+    tracker._remember({'0x3': ('success', None)})
+
+    assert list(tracker.recent) == ['0x2', '0x3']
+
+
+@pytest.mark.asyncio
+async def test_finalized_head_processes_skipped_blocks():
+    tracker = FinalizationTracker(MagicMock(), MagicMock(spec=[]))
+    tracker.process_block = AsyncMock()
+    tracker.settle = AsyncMock(return_value=0)
+    tracker.last_block = 100
+
+    await tracker.on_finalized_head({'header': {'number': 103}}, 1, 'sub')
+
+    assert [c.args[0] for c in tracker.process_block.await_args_list] == [101, 102, 103]
+    assert tracker.last_block == 103
+    tracker.settle.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_restart_backfills_from_the_saved_block_before_expiring():
+    cache = MagicMock()
+    cache.redis.get = AsyncMock(return_value='1000')
+    cache.redis.set = AsyncMock()
+    tracker = FinalizationTracker(MagicMock(), cache)
+    tracker.BACKFILL_SETTLE_EVERY = 100
+    tracker.process_block = AsyncMock()
+    tracker.settle = AsyncMock(return_value=0)
+
+    await tracker.load_last_block()
+    await tracker.on_finalized_head({'header': {'number': 1200}}, 1, 'sub')
+
+    processed = [c.args[0] for c in tracker.process_block.await_args_list]
+    assert processed == list(range(1000 - tracker.RESCAN_BLOCKS + 1, 1201))
+    # Matching runs during the backfill; expiry only once caught up.
+    assert [c.kwargs for c in tracker.settle.await_args_list] == [
+        {'expire': False},
+        {'expire': False},
+        {},
+    ]
+    assert cache.redis.set.await_args.args == (FinalizationTracker.LAST_BLOCK_KEY, 1200)
@@ -0,0 +1,128 @@
+import io
+import logging
+from unittest.mock import patch
+
+import orjson
+import pytest
+
+from app.core.config import settings
+from app.core.logging import (
+    AsyncLogHandler,
+    JsonFormatter,
+    Throttle,
+    configure_logging,
+    parse_levels,
+)
+from app.core.tracing import extract, tracer
+
+TRACEPARENT = '00-0af7651916cd43dd8448eb211c80319c-b7ad6b7169203331-01'
+
+
+def make_logger(
+    name: str, maxsize: int = 100
+) -> tuple[logging.Logger, AsyncLogHandler, io.StringIO]:
+    output = io.StringIO()
+    stream = logging.StreamHandler(output)
+    stream.setFormatter(JsonFormatter('test'))
+    handler = AsyncLogHandler(stream, maxsize)
+    logger = logging.getLogger(name)
+    logger.handlers = [handler]
+    logger.propagate = False
+    logger.setLevel(logging.DEBUG)
+    return logger, handler, output
+
+
+def lines(output: io.StringIO) -> list[dict]:
+    return [orjson.loads(line) for line in output.getvalue().splitlines()]
+
+
+def test_records_are_written_as_json_by_the_listener():
+    logger, handler, output = make_logger('test.json')
+
+    with tracer.span('request', extract(TRACEPARENT)):
+        logger.info('Submitted %s: %s', 'add_stake', '0xabc', extra={'netuid': 18})
+    try:
+        raise ValueError('boom')
+    except ValueError:
+        logger.exception('Failed')
+    handler.flush()
+
+    submitted, failed = lines(output)
+    assert submitted['message'] == 'Submitted add_stake: 0xabc'
+    assert submitted['level'] == 'INFO'
+    assert submitted['logger'] == 'test.json'
+    assert submitted['service'] == 'test'
+    assert submitted['netuid'] == 18
+    assert submitted['trace_id'] == '0af7651916cd43dd8448eb211c80319c'
+    assert 'ValueError: boom' in failed['exception']
+
+
+def test_full_queue_drops_instead_of_blocking():
+    logger, handler, output = make_logger('test.full', maxsize=1)
+
+    with patch('app.core.logging.QueueListener.start'):
+        for i in range(3):
+            logger.info('Message %s', i)
+    handler._listener = None
+
+    assert handler.dropped == 2
+    assert handler.queue.qsize() == 1
+
+
+def test_throttle_limits_repeated_warnings():
+    logger, handler, output = make_logger('test.throttle')
+    throttle = Throttle(interval=60, burst=2)
+    handler.addFilter(throttle)
+
+    for key in range(5):
+        logger.warning('Error decoding key %s', key)
+    logger.info('Not throttled')
+    logger.info('Not throttled')
+    for window in throttle._windows.values():
+        window[0] -= 60
+    logger.warning('Error decoding key %s', 99)
+    handler.flush()
+
+    messages = lines(output)
+    assert [m['message'] for m in messages] == [
+        'Error decoding key 0',
+        'Error decoding key 1',
+        'Not throttled',
+        'Not throttled',
+        'Error decoding key 99',
+    ]
+    assert messages[-1]['suppressed'] == 3
+
+
+def test_parse_levels():
+    assert parse_levels('sqlalchemy.engine=info, app.tasks=DEBUG') == {
+        'sqlalchemy.engine': 'INFO',
+        'app.tasks': 'DEBUG',
+    }
+    assert parse_levels('') == {}
+    with pytest.raises(ValueError):
+        parse_levels('app.tasks')
+    with pytest.raises(ValueError):
+        parse_levels('app.tasks=LOUD')
+
+
+def test_configure_logging_applies_module_levels():
+    root = logging.getLogger()
+    handlers, level = list(root.handlers), root.level
+    try:
+        with (
+            patch.object(settings, 'log_levels', 'app.services=DEBUG'),
+            patch.object(settings, 'database_echo', True),
+        ):
+            configure_logging('test')
+        assert logging.getLogger('app.services').level == logging.DEBUG
+        assert logging.getLogger('sqlalchemy.engine').level == logging.INFO
+        assert any(isinstance(handler, AsyncLogHandler) for handler in root.handlers)
+    finally:
+        for handler in root.handlers:
+            if isinstance(handler, AsyncLogHandler):
+                handler.flush()
+        root.handlers = handlers
+        root.setLevel(level)
+        logging.getLogger('app.services').setLevel(logging.NOTSET)
+        logging.getLogger('sqlalchemy.engine').setLevel(logging.NOTSET)
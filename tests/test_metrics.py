@@ -0,0 +1,112 @@
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import httpx
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+from app.cache.circuit_breaker import CircuitBreaker
+from app.core.config import settings
+from app.core.metrics import (
+    Registry,
+    cache_requests,
+    key_family,
+    start_metrics_server,
+    tao_dividends_duration,
+    upstream_duration,
+    upstream_errors,
+)
+from app.main import app
+
+
+def test_render_counter_and_histogram():
+    registry = Registry()
+    requests = registry.counter('requests_total', 'Requests.', ('route',))
+    latency = registry.histogram('latency_seconds', 'Latency.', ('route',), buckets=(0.1, 1.0))
+
+    requests.inc(route='/a')
+    requests.inc(2, route='/a')
+    latency.observe(0.05, route='/a')
+    latency.observe(0.5, route='/a')
+    latency.observe(5.0, route='/a')
+
+    text = registry.render()
+    assert '# TYPE requests_total counter\nrequests_total{route="/a"} 3.0\n' in text
+    assert 'latency_seconds_bucket{route="/a",le="0.1"} 1\n' in text
+    assert 'latency_seconds_bucket{route="/a",le="1.0"} 2\n' in text
+    assert 'latency_seconds_bucket{route="/a",le="+Inf"} 3\n' in text
+    assert 'latency_seconds_sum{route="/a"} 5.55\n' in text
+    assert 'latency_seconds_count{route="/a"} 3\n' in text
+
+
+def test_labels_must_match():
+    registry = Registry()
+    requests = registry.counter('requests_total', 'Requests.', ('route',))
+
+    with pytest.raises(ValueError):
+        requests.inc(path='/a')
+    with pytest.raises(ValueError):
+        registry.counter('requests_total', 'Again.')
+
+
+def test_key_family_drops_variable_parts():
+    hotkey = '5FFApaS75bv5pJHfAp2FVLBj9ZaXuFDjEypsaBNc1wCfe52v'
+    assert key_family(f'dividends:18:netuid:{hotkey}:hotkey') == 'dividends:netuid:hotkey'
+    assert key_family('dividends:all') == 'dividends:all'
+    assert key_family('sentiment:18:llm') == 'sentiment:llm'
+
+
+@pytest.mark.asyncio
+async def test_circuit_breaker_records_upstream_metrics():
+    breaker = CircuitBreaker(MagicMock(spec=[]), 'metrics-test')
+
+    async with breaker.protect():
+        pass
+    with pytest.raises(TimeoutError):
+        async with breaker.protect():
+            raise TimeoutError()
+
+    assert upstream_duration.count(upstream='metrics-test', outcome='ok') == 1
+    assert upstream_duration.count(upstream='metrics-test', outcome='error') == 1
+    assert upstream_errors.value(upstream='metrics-test', error='TimeoutError') == 1
+
+
+@pytest.mark.asyncio
+@patch('app.cache.singleton.redis_cache.redis', create=True)
+@patch(
+    'app.services.singleton.substrate_service.get_dividends_for_netuid_hotkey',
+    new_callable=AsyncMock,
+)
+async def test_metrics_endpoint_exposes_request_metrics(mock_dividends, mock_redis):
+    mock_redis.get = AsyncMock(return_value=None)
+    mock_redis.set = AsyncMock()
+    mock_redis.zincrby = AsyncMock()
+    mock_dividends.return_value = 42.0
+    misses = cache_requests.value(family='dividends:netuid:hotkey', result='miss')
+    pairs = tao_dividends_duration.count(mode='pair', trade='false')
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url='http://test') as client:
+        await client.get(
+            '/api/v1/tao_dividends?netuid=18&hotkey=5FFApaS75bv5pJHfAp2FVLBj9ZaXuFDjEypsaBNc1wCfe52v',
+            headers={'Authorization': settings.auth_token},
+        )
+        response = await client.get('/metrics')
+
+    assert response.status_code == 200
+    assert response.headers['content-type'].startswith('text/plain')
+    assert tao_dividends_duration.count(mode='pair', trade='false') == pairs + 1
+    assert cache_requests.value(family='dividends:netuid:hotkey', result='miss') == misses + 1
+    assert 'http_request_duration_seconds_count{route="/api/v1/tao_dividends"' in response.text
+
+
+def test_worker_metrics_server():
+    registry = Registry()
+    registry.counter('jobs_total', 'Jobs.').inc()
+    server = start_metrics_server(0, registry)
+    try:
+        response = httpx.get(f'http://127.0.0.1:{server.server_address[1]}/metrics')
+    finally:
+        server.shutdown()
+
+    assert response.status_code == 200
+    assert 'jobs_total 1.0' in response.text
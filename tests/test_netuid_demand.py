@@ -0,0 +1,22 @@
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.cache.netuid_demand import NetuidDemand
+
+
+@pytest.mark.asyncio
+async def test_rank_orders_by_demand():
+    cache = MagicMock()
+    cache.redis.zmscore = AsyncMock(return_value=[None, 5.0, 2.0])
+    demand = NetuidDemand(cache)
+
+    assert await demand.rank([1, 18, 3]) == [18, 3, 1]
+
+
+@pytest.mark.asyncio
+async def test_demand_fails_open_without_redis():
+    demand = NetuidDemand(MagicMock(spec=[]))
+
+    await demand.record(18)
+    assert await demand.rank([3, 1]) == [3, 1]
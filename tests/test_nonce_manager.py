@@ -0,0 +1,89 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.cache.nonce_manager import NonceManager, is_nonce_error
+
+
+class FakeRedis:
+    """
+    Minimal stand-in for the Redis calls the nonce manager makes.
+    """
+
+    def __init__(self):
+        self.values: dict[str, int] = {}
+
+    async def eval(self, script, numkeys, key, *args):
+        if script == NonceManager.ROLLBACK_SCRIPT:
+            if self.values.get(key) != int(args[0]) + 1:
+                return 0
+            self.values[key] = int(args[0])
+            return 1
+        if key not in self.values:
+            return None
+        self.values[key] += 1
+        return self.values[key] - 1
+
+    async def set(self, key, value, nx=False, ex=None):
+        if nx and key in self.values:
+            return None
+        self.values[key] = int(value)
+        return True
+
+
+@pytest.mark.asyncio
+async def test_allocate_fetches_once_and_hands_out_sequential_nonces():
+    cache = MagicMock()
+    cache.redis = FakeRedis()
+    manager = NonceManager(cache)
+    fetch = AsyncMock(return_value=40)
+
+    nonces = await asyncio.gather(*(manager.allocate('5Addr', fetch) for _ in range(5)))
+
+    assert sorted(nonces) == [40, 41, 42, 43, 44]
+    fetch.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_resync_resets_counter_to_chain_nonce():
+    cache = MagicMock()
+    cache.redis = FakeRedis()
+    manager = NonceManager(cache)
+
+    await manager.allocate('5Addr', AsyncMock(return_value=10))
+    await manager.resync('5Addr', AsyncMock(return_value=3))
+
+    assert await manager.allocate('5Addr', AsyncMock()) == 3
+
+
+@pytest.mark.asyncio
+async def test_allocate_falls_back_to_local_counter():
+    manager = NonceManager(MagicMock(spec=[]))
+    fetch = AsyncMock(return_value=5)
+
+    assert [await manager.allocate('5Addr', fetch) for _ in range(3)] == [5, 6, 7]
+    fetch.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_release_rolls_back_or_resyncs():
+    cache = MagicMock()
+    cache.redis = FakeRedis()
+    manager = NonceManager(cache)
+    fetch = AsyncMock(return_value=10)
+
+    nonce = await manager.allocate('5Addr', fetch)
+    await manager.release('5Addr', nonce, AsyncMock())
+    assert await manager.allocate('5Addr', fetch) == 10
+
+    # A later nonce is in use: resync from the chain instead.
+    await manager.allocate('5Addr', fetch)
+    await manager.release('5Addr', 10, AsyncMock(return_value=10))
+    assert await manager.allocate('5Addr', fetch) == 10
+
+
+def test_is_nonce_error():
+    assert is_nonce_error(Exception("{'code': 1010, 'data': 'Transaction is outdated'}"))
+    assert is_nonce_error(Exception('Transaction will be valid in the future'))
+    assert not is_nonce_error(Exception('Insufficient balance'))
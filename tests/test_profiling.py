@@ -0,0 +1,92 @@
+import marshal
+from unittest.mock import patch
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+from app.core.config import settings
+from app.core.profiling import RequestProfiler, profile_requested, profiler
+from app.main import app
+
+
+def busy() -> int:
+    return sum(i * i for i in range(1000))
+
+
+def test_trigger():
+    assert RequestProfiler(5, 0.0, 10).trigger(True, True) == 'request'
+    assert RequestProfiler(5, 0.0, 10).trigger(True, False) is None
+    assert RequestProfiler(5, 1.0, 10).trigger(False, False) == 'sample'
+    assert profile_requested('1', None)
+    assert profile_requested(None, 'true')
+    assert not profile_requested(None, None)
+    assert not profile_requested('0', None)
+
+
+def test_ring_buffer_keeps_the_latest_captures():
+    local = RequestProfiler(2, 0.0, 10)
+    ids = []
+    for path in ('/a', '/b', '/c'):
+        with local.profile() as profile:
+            busy()
+        ids.append(local.record(profile, path=path))
+
+    assert [capture['path'] for capture in local.list()] == ['/c', '/b']
+    assert local.get(ids[0]) is None
+    capture = local.get(ids[2])
+    assert 'busy' in capture['report']
+    assert capture['calls'] > 0
+    assert any(func[2] == 'busy' for func in marshal.loads(capture['pstats']))
+
+
+def test_one_capture_at_a_time():
+    local = RequestProfiler(2, 0.0, 10)
+    with local.profile() as outer:
+        with local.profile() as inner:
+            assert inner is None
+    assert outer is not None
+
+
+@pytest.mark.asyncio
+async def test_profile_header_requires_token():
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url='http://test') as client:
+        anonymous = await client.get('/health', headers={'X-Profile': '1'})
+        profiled = await client.get(
+            '/health?profile=1', headers={'Authorization': settings.auth_token}
+        )
+        profile_id = profiled.headers['X-Profile-Id']
+        listed = await client.get(
+            '/api/v1/admin/profiles', headers={'Authorization': settings.auth_token}
+        )
+        detail = await client.get(
+            f'/api/v1/admin/profiles/{profile_id}', headers={'Authorization': settings.auth_token}
+        )
+        raw = await client.get(
+            f'/api/v1/admin/profiles/{profile_id}?format=pstats',
+            headers={'Authorization': settings.auth_token},
+        )
+        missing = await client.get(
+            '/api/v1/admin/profiles/unknown', headers={'Authorization': settings.auth_token}
+        )
+        unauthorized = await client.get('/api/v1/admin/profiles')
+
+    assert 'X-Profile-Id' not in anonymous.headers
+    assert listed.json()[0]['id'] == profile_id
+    assert detail.json()['path'] == '/health'
+    assert detail.json()['status'] == 200
+    assert detail.json()['trigger'] == 'request'
+    assert 'cumulative' in detail.json()['report']
+    assert marshal.loads(raw.content)
+    assert missing.status_code == 404
+    assert unauthorized.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_sampled_requests_are_profiled():
+    transport = ASGITransport(app=app)
+    with patch.object(profiler, 'sample_rate', 1.0):
+        async with AsyncClient(transport=transport, base_url='http://test') as client:
+            response = await client.get('/health')
+
+    assert profiler.get(response.headers['X-Profile-Id'])['trigger'] == 'sample'
@@ -0,0 +1,92 @@
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.cache.rate_limiter import RateLimitTimeout, TokenBucket, retry_after_seconds
+
+
+def make_bucket(eval_results) -> tuple[TokenBucket, MagicMock]:
+    cache = MagicMock()
+    cache.redis.eval = AsyncMock(side_effect=eval_results)
+    return TokenBucket(cache, 'datura:abc', rate=10.0, capacity=5), cache
+
+
+@pytest.mark.asyncio
+async def test_acquire_granted_immediately():
+    bucket, cache = make_bucket([[1, '4', '0']])
+
+    waited = await bucket.acquire()
+
+    assert waited < 0.05
+    assert bucket.acquired == 1
+    cache.redis.eval.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_acquire_waits_for_refill():
+    bucket, cache = make_bucket([[0, '0', '0.01'], [1, '0', '0']])
+
+    waited = await bucket.acquire()
+
+    assert waited >= 0.01
+    assert cache.redis.eval.await_count == 2
+    assert bucket.last_wait == waited
+
+
+@pytest.mark.asyncio
+async def test_acquire_deadline_exceeded():
+    bucket, _ = make_bucket([[0, '0', '5']])
+
+    with pytest.raises(RateLimitTimeout):
+        await bucket.acquire(timeout=1)
+
+    assert bucket.timeouts == 1
+
+
+@pytest.mark.asyncio
+async def test_acquire_fails_open_without_redis():
+    bucket = TokenBucket(MagicMock(spec=[]), 'chutes:abc', rate=1.0, capacity=1)
+
+    assert await bucket.acquire() == pytest.approx(0.0, abs=0.05)
+
+
+@pytest.mark.asyncio
+async def test_acquire_fails_open_on_redis_error():
+    bucket, _ = make_bucket(ConnectionError('Redis down'))
+
+    assert await bucket.acquire() == pytest.approx(0.0, abs=0.05)
+
+
+@pytest.mark.asyncio
+async def test_no_tokens_accrue_while_penalized():
+    bucket, cache = make_bucket([])
+    pipe = MagicMock()
+    pipe.execute = AsyncMock()
+    cache.redis.pipeline.return_value.__aenter__ = AsyncMock(return_value=pipe)
+    cache.redis.pipeline.return_value.__aexit__ = AsyncMock(return_value=False)
+    cache.redis.time = AsyncMock(return_value=(1000, 0))
+
+    await bucket.penalize(retry_after=30)
+    state = pipe.hset.call_args.kwargs['mapping']
+    assert state == {'tokens': 0, 'blocked_until': 1030.0}
+
+    # Last refilled before the block; 0.2s after it ends only 0.2 * rate is back.
+    cache.redis.hmget = AsyncMock(return_value=['0', '1000', str(state['blocked_until'])])
+    cache.redis.time = AsyncMock(return_value=(1030, 200_000))
+    status = await bucket.status()
+    assert status['remaining'] == pytest.approx(0.2 * bucket.rate)
+    assert status['blocked_for'] == 0.0
+    # The Lua script refills from the same point.
+    assert 'math.max(ts, blocked_until)' in TokenBucket.SCRIPT
+
+
+def test_key_for_hides_api_key():
+    name = TokenBucket.key_for('datura', 'dt_secret')
+
+    assert name.startswith('datura:')
+    assert 'dt_secret' not in name
+
+
+@pytest.mark.parametrize('value,expected', [('3', 3.0), (None, 1.0), ('soon', 1.0), ('-2', 0.0)])
+def test_retry_after_seconds(value, expected):
+    assert retry_after_seconds(value) == expected
@@ -0,0 +1,92 @@
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import orjson
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+from app.cache.sentiment_history import SentimentHistory
+from app.core.config import settings
+from app.main import app
+from app.services.bittensor_substrate_service import AsyncSubstrateService
+
+STATE = {'ema': '12.5', 'variance': '4.0', 'last': '20.0', 'count': '3', 'updated_at': '1.0'}
+
+
+def make_history() -> tuple[SentimentHistory, MagicMock]:
+    cache = MagicMock()
+    cache.redis.eval = AsyncMock(return_value=['12.5', '9.0', 3])
+    cache.redis.hgetall = AsyncMock(return_value=STATE)
+    cache.redis.lrange = AsyncMock(return_value=[orjson.dumps({'timestamp': 1.0, 'score': 20.0})])
+    return SentimentHistory(cache, alpha=0.2, max_points=100), cache
+
+
+@pytest.mark.asyncio
+async def test_record_updates_signal_and_history_in_one_script():
+    history, cache = make_history()
+
+    assert await history.record(18, 20.0) == {'ema': 12.5, 'volatility': 3.0, 'count': 3}
+    args = cache.redis.eval.await_args.args
+    assert args[1:4] == (2, 'sentiment:signal:18', 'sentiment:history:18')
+    assert args[4] == 0.2
+    assert args[5] == '20.0'
+    assert orjson.loads(args[7])['score'] == 20.0
+    assert args[8] == 100
+
+
+@pytest.mark.asyncio
+async def test_signal_and_history():
+    history, _ = make_history()
+
+    signal = await history.signal(18)
+    assert signal['ema'] == 12.5
+    assert signal['volatility'] == 2.0
+    assert signal['count'] == 3
+    assert await history.history(18, 10) == [{'timestamp': 1.0, 'score': 20.0}]
+
+
+@pytest.mark.asyncio
+async def test_fails_open():
+    without_redis = SentimentHistory(MagicMock(spec=[]), alpha=0.2, max_points=100)
+    assert await without_redis.record(18, 20.0) is None
+    assert await without_redis.smoothed(18, 7.0) == 7.0
+
+    broken, cache = make_history()
+    cache.redis.eval.side_effect = ConnectionError('down')
+    cache.redis.hgetall.side_effect = ConnectionError('down')
+    assert await broken.record(18, 20.0) is None
+    assert await broken.smoothed(18, 7.0) == 7.0
+
+
+@pytest.mark.asyncio
+@patch('app.cache.singleton.sentiment_history.smoothed', new_callable=AsyncMock)
+async def test_trading_signal_uses_ema_when_configured(mock_smoothed):
+    mock_smoothed.return_value = 12.5
+
+    with patch.object(settings, 'trade_sizing', 'raw'):
+        assert await AsyncSubstrateService.trading_signal(18, 40.0) == 40.0
+    with patch.object(settings, 'trade_sizing', 'ema'):
+        assert await AsyncSubstrateService.trading_signal(18, 40.0) == 12.5
+    mock_smoothed.assert_awaited_once_with(18, 40.0)
+
+
+@pytest.mark.asyncio
+@patch('app.cache.singleton.sentiment_history.history', new_callable=AsyncMock)
+@patch('app.cache.singleton.sentiment_history.signal', new_callable=AsyncMock)
+async def test_get_sentiment(mock_signal, mock_history):
+    mock_signal.side_effect = [{'ema': 12.5, 'volatility': 2.0}, None]
+    mock_history.return_value = [{'timestamp': 1.0, 'score': 20.0}]
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url='http://test') as client:
+        found = await client.get(
+            '/api/v1/sentiment/18?limit=5', headers={'Authorization': settings.auth_token}
+        )
+        missing = await client.get(
+            '/api/v1/sentiment/99', headers={'Authorization': settings.auth_token}
+        )
+
+    assert found.status_code == 200
+    assert found.json()['signal']['ema'] == 12.5
+    assert found.json()['history'][0]['score'] == 20.0
+    mock_history.assert_awaited_once_with(18, 5)
+    assert missing.status_code == 404
@@ -0,0 +1,96 @@
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from app.services.lexicon_service import LexiconService
+from app.services.sentiment_service import SentimentService
+
+
+@pytest.mark.parametrize(
+    'tweets,sign',
+    [
+        (['Bittensor subnet 18 is so bullish 🚀'], 1),
+        (['Huge partnership announced, great growth ahead'], 1),
+        (['This subnet is a scam, total rug'], -1),
+        (['Validators hacked, price crash'], -1),
+        (['Not bullish at all on this one'], -1),
+        (['Meeting notes from today'], 0),
+    ],
+)
+def test_lexicon_polarity(tweets, sign):
+    score, _ = LexiconService.score_with_confidence(tweets)
+    if sign == 0:
+        assert score == 0.0
+    else:
+        assert score * sign > 0
+    assert -100.0 <= score <= 100.0
+
+
+def test_lexicon_confidence_reflects_agreement():
+    _, agreeing = LexiconService.score_with_confidence([
+        'bullish on tao 🚀',
+        'amazing launch, love it',
+    ])
+    _, mixed = LexiconService.score_with_confidence([
+        'bullish on tao 🚀',
+        'total scam, rekt',
+    ])
+    assert agreeing > mixed
+
+
+def test_lexicon_empty_batch():
+    assert LexiconService.score_with_confidence([]) == (0.0, 0.0)
+
+
+@pytest.mark.asyncio
+@patch('app.services.chutes_service.ChutesService.get_sentiment_score', new_callable=AsyncMock)
+async def test_lexicon_engine_skips_llm(mock_chutes):
+    result = await SentimentService.get_sentiment_score(['bullish 🚀'], engine='lexicon')
+
+    assert result > 0
+    mock_chutes.assert_not_called()
+
+
+@pytest.mark.asyncio
+@patch('app.services.chutes_service.ChutesService.get_sentiment_score', new_callable=AsyncMock)
+async def test_llm_engine_falls_back_on_error(mock_chutes):
+    mock_chutes.side_effect = Exception('Chutes down')
+
+    result = await SentimentService.get_sentiment_score(['bullish 🚀'], engine='llm')
+
+    assert result == LexiconService.score_with_confidence(['bullish 🚀'])[0]
+
+
+@pytest.mark.asyncio
+@patch('app.services.sentiment_service.settings.sentiment_llm_timeout', 0.01)
+@patch('app.services.chutes_service.ChutesService.get_sentiment_score', new_callable=AsyncMock)
+async def test_llm_engine_falls_back_on_latency_budget(mock_chutes):
+    async def slow(*_, **__):
+        await asyncio.sleep(1)
+        return 90.0
+
+    mock_chutes.side_effect = slow
+
+    result = await SentimentService.get_sentiment_score(['total scam'], engine='llm')
+
+    assert result < 0
+
+
+@pytest.mark.asyncio
+@patch('app.services.chutes_service.ChutesService.get_sentiment_score', new_callable=AsyncMock)
+async def test_auto_engine_uses_llm_when_not_confident(mock_chutes):
+    mock_chutes.return_value = 12.0
+
+    confident = await SentimentService.get_sentiment_score(['bullish 🚀'], engine='auto')
+    unsure = await SentimentService.get_sentiment_score(['Meeting notes'], engine='auto')
+
+    assert confident > 0 and confident != 12.0
+    assert unsure == 12.0
+    mock_chutes.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_unknown_engine():
+    with pytest.raises(ValueError):
+        await SentimentService.get_sentiment_score(['tweet'], engine='magic')
@@ -0,0 +1,112 @@
+import asyncio
+from unittest.mock import AsyncMock
+
+import orjson
+import pytest
+
+from app.db.stake_action_writer import StakeActionWriter
+
+ACTION = {
+    'netuid': 18,
+    'hotkey': 'hotkey',
+    'sentiment': 50.0,
+    'stake_type': 'stake',
+    'tao_amount': 0.5,
+    'status': 'success',
+}
+
+
+def make_writer(tmp_path, max_batch: int = 100, flush_interval: float = 60) -> StakeActionWriter:
+    writer = StakeActionWriter(max_batch, flush_interval, str(tmp_path / 'spill.jsonl'))
+    writer._insert = AsyncMock()
+    return writer
+
+
+@pytest.mark.asyncio
+async def test_rows_are_written_in_one_batch_on_close(tmp_path):
+    writer = make_writer(tmp_path)
+
+    for _ in range(3):
+        writer.add(**ACTION)
+    writer._insert.assert_not_awaited()
+    await writer.close()
+
+    writer._insert.assert_awaited_once()
+    rows = writer._insert.await_args.args[0]
+    assert len(rows) == 3
+    assert rows[0]['netuid'] == 18
+    assert rows[0]['timestamp'] is not None
+    assert 'id' not in rows[0]
+
+
+@pytest.mark.asyncio
+async def test_full_buffer_flushes_immediately(tmp_path):
+    writer = make_writer(tmp_path, max_batch=2)
+
+    writer.add(**ACTION)
+    writer.add(**ACTION)
+    await asyncio.sleep(0)
+
+    writer._insert.assert_awaited_once()
+    assert len(writer._insert.await_args.args[0]) == 2
+    await writer.close()
+
+
+@pytest.mark.asyncio
+async def test_buffer_flushes_on_interval(tmp_path):
+    writer = make_writer(tmp_path, flush_interval=0.01)
+
+    writer.add(**ACTION)
+    await asyncio.sleep(0.05)
+
+    writer._insert.assert_awaited_once()
+    await writer.close()
+
+
+@pytest.mark.asyncio
+async def test_failed_flush_spills_and_is_replayed(tmp_path):
+    writer = make_writer(tmp_path)
+    writer._insert.side_effect = ConnectionError('database down')
+
+    writer.add(**ACTION, error_message='Insufficient balance')
+    assert await writer.flush() == 0
+    spilled = [orjson.loads(line) for line in (tmp_path / 'spill.jsonl').read_bytes().splitlines()]
+    assert spilled[0]['error_message'] == 'Insufficient balance'
+
+    writer._insert.side_effect = None
+    assert await writer.replay() == 1
+    replayed = writer._insert.await_args.args[0]
+    assert replayed[0]['hotkey'] == 'hotkey'
+    assert not list(tmp_path.iterdir())
+
+
+@pytest.mark.asyncio
+async def test_successful_flush_replays_earlier_spill(tmp_path):
+    writer = make_writer(tmp_path)
+    writer._insert.side_effect = ConnectionError('database down')
+    writer.add(**ACTION)
+    assert await writer.flush() == 0
+
+    writer._insert.side_effect = None
+    writer.add(**{**ACTION, 'status': 'failed'})
+    assert await writer.flush() == 2
+
+    assert writer._insert.await_count == 3
+    assert not list(tmp_path.iterdir())
+    await writer.close()
+
+
+@pytest.mark.asyncio
+async def test_unreadable_spilled_lines_are_quarantined(tmp_path):
+    writer = make_writer(tmp_path)
+    writer._insert.side_effect = ConnectionError('database down')
+    writer.add(**ACTION)
+    await writer.flush()
+    with open(tmp_path / 'spill.jsonl', 'ab') as spill:
+        spill.write(b'{"netuid": 18, "hotk')
+
+    writer._insert.side_effect = None
+    assert await writer.replay() == 1
+    assert (tmp_path / 'spill.jsonl.bad').read_bytes() == b'{"netuid": 18, "hotk\n'
+    assert sorted(path.name for path in tmp_path.iterdir()) == ['spill.jsonl.bad']
+    await writer.close()
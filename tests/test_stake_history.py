@@ -0,0 +1,107 @@
+from datetime import datetime, timedelta
+from unittest.mock import AsyncMock, patch
+
+import pytest
+import pytest_asyncio
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlmodel import SQLModel
+
+from app.core.config import settings
+from app.main import app
+from app.models.stake_action import StakeAction
+from app.services.stake_history_service import StakeHistoryService
+
+START = datetime(2025, 6, 1, 12, 0, 0)
+
+
+@pytest_asyncio.fixture
+async def session():
+    engine = create_async_engine('sqlite+aiosqlite://')
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+    async with async_sessionmaker(engine, class_=AsyncSession)() as session:
+        for i in range(7):
+            session.add(
+                StakeAction(
+                    # Two actions share every timestamp to exercise the id tie-break.
+                    timestamp=START + timedelta(minutes=i // 2),
+                    netuid=18 if i % 3 else 1,
+                    hotkey='hotkey',
+                    sentiment=10.0,
+                    stake_type='stake' if i % 2 else 'unstake',
+                    tao_amount=0.1,
+                    status='success' if i < 5 else 'failed',
+                )
+            )
+        await session.commit()
+        yield session
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_pages_cover_every_action_once_newest_first(session):
+    seen = []
+    cursor = None
+    while True:
+        page, cursor = await StakeHistoryService.list_actions(session, cursor=cursor, limit=2)
+        seen.extend(page)
+        if cursor is None:
+            break
+
+    assert len(seen) == 7
+    assert len({action.id for action in seen}) == 7
+    keys = [(action.timestamp, action.id) for action in seen]
+    assert keys == sorted(keys, reverse=True)
+
+
+@pytest.mark.asyncio
+async def test_filters(session):
+    by_netuid, _ = await StakeHistoryService.list_actions(session, netuid=1)
+    assert {action.netuid for action in by_netuid} == {1}
+    assert len(by_netuid) == 3
+
+    failed, _ = await StakeHistoryService.list_actions(session, status='failed', stake_type='stake')
+    assert [action.id for action in failed] == [6]
+
+    window, _ = await StakeHistoryService.list_actions(
+        session, since=START + timedelta(minutes=1), until=START + timedelta(minutes=2)
+    )
+    assert len(window) == 2
+
+
+def test_invalid_cursor():
+    with pytest.raises(ValueError):
+        StakeHistoryService.decode_cursor('not-a-cursor')
+
+
+@pytest.mark.asyncio
+@patch(
+    'app.services.stake_history_service.StakeHistoryService.list_actions', new_callable=AsyncMock
+)
+async def test_get_stake_actions(mock_list):
+    action = StakeAction(
+        id=3,
+        timestamp=START,
+        netuid=18,
+        hotkey='hotkey',
+        sentiment=10.0,
+        stake_type='stake',
+        tao_amount=0.1,
+        status='success',
+    )
+    mock_list.return_value = ([action], 'next')
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url='http://test') as client:
+        response = await client.get(
+            '/api/v1/stake_actions?netuid=18&status=success&limit=1',
+            headers={'Authorization': settings.auth_token},
+        )
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data['next_cursor'] == 'next'
+    assert data['items'][0]['id'] == 3
+    assert mock_list.await_args.kwargs['netuid'] == 18
+    assert mock_list.await_args.kwargs['limit'] == 1
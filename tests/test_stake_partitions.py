@@ -0,0 +1,181 @@
+from datetime import datetime, timedelta
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from sqlalchemy import event, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlmodel import SQLModel
+
+from app.db.partitions import (
+    add_months,
+    create_partitions,
+    expired_partitions,
+    month_start,
+    partition_month,
+    partition_name,
+)
+from app.models.stake_action import StakeAction
+from app.models.stake_action_hourly import StakeActionHourly
+from app.services.stake_stats_service import StakeStatsService
+
+
+def test_month_arithmetic():
+    month = month_start(datetime(2025, 11, 17, 8, 30))
+
+    assert month == datetime(2025, 11, 1)
+    assert add_months(month, 2) == datetime(2026, 1, 1)
+    assert add_months(month, -11) == datetime(2024, 12, 1)
+
+
+def test_partition_names_round_trip():
+    assert partition_name(datetime(2025, 6, 1)) == 'stakeaction_y2025m06'
+    assert partition_month('stakeaction_y2025m06') == datetime(2025, 6, 1)
+    assert partition_month('stakeaction_default') is None
+
+
+def test_expired_partitions_keep_retention_window():
+    names = [
+        'stakeaction_default',
+        'stakeaction_y2024m12',
+        'stakeaction_y2025m01',
+        'stakeaction_y2025m02',
+        'stakeaction_y2025m03',
+    ]
+
+    expired = expired_partitions(names, datetime(2025, 3, 15), retention_months=2)
+
+    assert expired == ['stakeaction_y2024m12']
+
+
+def partition_conn(exists: set[str], stray: bool) -> tuple[MagicMock, list[str]]:
+    executed = []
+
+    async def execute(statement, params=None):
+        sql = str(statement)
+        executed.append(sql)
+        result = MagicMock()
+        if sql.startswith('SELECT relkind'):
+            result.scalar.return_value = 'r' if params['name'] in exists else None
+        else:
+            result.scalar.return_value = stray
+        return result
+
+    conn = MagicMock()
+    conn.execute = AsyncMock(side_effect=execute)
+    return conn, executed
+
+
+@pytest.mark.asyncio
+async def test_create_partitions_skips_existing_months():
+    conn, executed = partition_conn({'stakeaction_y2025m06'}, stray=False)
+
+    await create_partitions(conn, datetime(2025, 6, 10), datetime(2025, 7, 1))
+
+    created = [sql for sql in executed if sql.startswith('CREATE')]
+    assert created == [
+        'CREATE TABLE IF NOT EXISTS stakeaction_y2025m07 PARTITION OF stakeaction '
+        "FOR VALUES FROM ('2025-07-01T00:00:00') TO ('2025-08-01T00:00:00')"
+    ]
+    assert not any('DETACH' in sql for sql in executed)
+
+
+@pytest.mark.asyncio
+async def test_create_partitions_moves_rows_out_of_the_default_partition():
+    conn, executed = partition_conn(set(), stray=True)
+
+    await create_partitions(conn, datetime(2025, 7, 1), datetime(2025, 7, 1))
+
+    steps = [sql.split(' (')[0] for sql in executed[2:]]
+    assert steps == [
+        'ALTER TABLE stakeaction DETACH PARTITION stakeaction_default',
+        'CREATE TABLE stakeaction_y2025m07 PARTITION OF stakeaction FOR VALUES FROM',
+        'INSERT INTO stakeaction_y2025m07',
+        "DELETE FROM stakeaction_default WHERE timestamp >= '2025-07-01T00:00:00' "
+        "AND timestamp < '2025-08-01T00:00:00'",
+        'ALTER TABLE stakeaction ATTACH PARTITION stakeaction_default DEFAULT',
+    ]
+    assert 'FROM stakeaction_default WHERE' in executed[4]
+
+
+@pytest.mark.asyncio
+async def test_rollup_recomputes_hours_whose_actions_changed():
+    engine = create_async_engine('sqlite+aiosqlite://')
+
+    @event.listens_for(engine.sync_engine, 'connect')
+    def register_date_trunc(dbapi_conn, _):
+        # SQLite stand-in for PostgreSQL's date_trunc('hour', ...).
+        dbapi_conn.create_function('date_trunc', 2, lambda _, value: value[:13] + ':00:00.000000')
+
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+    async with async_sessionmaker(engine, class_=AsyncSession)() as session:
+        for minute, stake_type, amount, status in [
+            (5, 'stake', 1.0, 'success'),
+            (50, 'unstake', 0.5, 'success'),
+            (70, 'stake', 2.0, 'pending'),
+        ]:
+            session.add(
+                StakeAction(
+                    timestamp=datetime(2025, 6, 1, 10) + timedelta(minutes=minute),
+                    netuid=18,
+                    hotkey='hotkey',
+                    sentiment=20.0,
+                    stake_type=stake_type,
+                    tao_amount=amount,
+                    status=status,
+                )
+            )
+        await session.commit()
+
+        start = await StakeStatsService.rollup(session, timedelta(hours=1))
+        first = await StakeStatsService.stats(session)
+
+        await session.execute(
+            update(StakeAction).where(StakeAction.status == 'pending').values(status='success')
+        )
+        await session.commit()
+        await StakeStatsService.rollup(session, timedelta(hours=1))
+        second = await StakeStatsService.stats(session)
+    await engine.dispose()
+
+    assert start == datetime(2025, 6, 1, 10)
+    assert [(r['status'], r['actions']) for r in first] == [('pending', 1), ('success', 2)]
+    assert first[1]['staked_tao'] == 1.0
+    assert first[1]['unstaked_tao'] == 0.5
+    assert [(r['status'], r['actions']) for r in second] == [('success', 3)]
+    assert second[0]['staked_tao'] == 3.0
+
+
+@pytest.mark.asyncio
+async def test_stats_aggregate_hourly_rollups():
+    engine = create_async_engine('sqlite+aiosqlite://')
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+    async with async_sessionmaker(engine, class_=AsyncSession)() as session:
+        for hour, netuid, status, actions in [
+            (datetime(2025, 6, 1, 10), 18, 'success', 3),
+            (datetime(2025, 6, 1, 11), 18, 'success', 1),
+            (datetime(2025, 6, 1, 11), 18, 'failed', 2),
+            (datetime(2025, 6, 1, 11), 1, 'success', 5),
+        ]:
+            session.add(
+                StakeActionHourly(
+                    hour=hour,
+                    netuid=netuid,
+                    status=status,
+                    actions=actions,
+                    staked_tao=0.1 * actions,
+                    unstaked_tao=0.0,
+                    sentiment_sum=10.0 * actions,
+                )
+            )
+        await session.commit()
+
+        results = await StakeStatsService.stats(session, netuid=18)
+        recent = await StakeStatsService.stats(session, since=datetime(2025, 6, 1, 11))
+    await engine.dispose()
+
+    assert [(r['status'], r['actions']) for r in results] == [('failed', 2), ('success', 4)]
+    assert results[1]['avg_sentiment'] == 10.0
+    assert results[1]['staked_tao'] == pytest.approx(0.4)
+    assert sum(r['actions'] for r in recent) == 8
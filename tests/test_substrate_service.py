@@ -2,6 +2,7 @@ from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
+from app.services.account_state import AccountStateCache
 from app.services.bittensor_substrate_service import AsyncSubstrateService
 
 
@@ -121,3 +122,197 @@ async def test_get_all_dividends_failure_returns_empty(mock_substrate_class):
     result = await service.get_all_dividends()
 
     assert result == []
+
+
+def test_net_intents_cancels_opposing_intents():
+    intents = [
+        {'netuid': 18, 'hotkey': 'a', 'sentiment': 50.0},
+        {'netuid': 18, 'hotkey': 'a', 'sentiment': -50.0},
+        {'netuid': 18, 'hotkey': 'b', 'sentiment': -20.0},
+        {'netuid': 18, 'hotkey': 'b', 'sentiment': -10.0},
+    ]
+
+    netted = AsyncSubstrateService.net_intents(intents)
+
+    assert netted[(18, 'a')][0] == pytest.approx(0.0)
+    assert netted[(18, 'b')][0] == pytest.approx(-0.3)
+    assert len(netted[(18, 'b')][1]) == 2
+
+
+@pytest.mark.asyncio
+@patch('app.services.bittensor_substrate_service.AsyncSubstrateInterface')
+async def test_batched_intents_are_sized_from_the_signal(_):
+    service = AsyncSubstrateService()
+    service._record_stake_action = AsyncMock()
+    intents = [
+        {'netuid': 18, 'hotkey': 'a', 'sentiment': 60.0, 'signal': 20.0},
+        {'netuid': 18, 'hotkey': 'a', 'sentiment': 0.0, 'signal': -20.0},
+    ]
+
+    assert AsyncSubstrateService.net_intents(intents)[(18, 'a')][0] == pytest.approx(0.0)
+
+    await service._record_intents(intents, 'netted')
+    records = [c.kwargs for c in service._record_stake_action.await_args_list]
+    assert [r['sentiment'] for r in records] == [60.0, 0.0]
+    assert [r['stake_type'] for r in records] == ['stake', 'unstake']
+    assert [r['tao_amount'] for r in records] == [pytest.approx(0.2), pytest.approx(0.2)]
+
+
+@pytest.mark.asyncio
+@patch('app.services.bittensor_substrate_service.AsyncSubstrateInterface')
+async def test_submit_stake_batch_records_shared_hash(_):
+    from bittensor import Balance
+
+    service = AsyncSubstrateService()
+    service.subtensor = MagicMock()
+    service.subtensor.get_balance = AsyncMock(return_value=Balance.from_tao(100))
+    service.subtensor.get_stake = AsyncMock(return_value=Balance.from_tao(100))
+    service.subtensor.is_hotkey_registered = AsyncMock(return_value=True)
+    substrate = service.subtensor.substrate
+    substrate.compose_call = AsyncMock(side_effect=lambda **kwargs: kwargs)
+    substrate.create_signed_extrinsic = AsyncMock()
+    substrate.get_account_next_index = AsyncMock(return_value=7)
+    receipt = MagicMock(extrinsic_hash='0xabc')
+
+    async def success():
+        return True
+
+    type(receipt).is_success = property(lambda _: success())
+    substrate.submit_extrinsic = AsyncMock(return_value=receipt)
+    substrate.get_chain_head = AsyncMock(return_value='0xhead')
+    service.account_state = AccountStateCache(service.subtensor, 'coldkey')
+    service._record_stake_action = AsyncMock()
+
+    extrinsic_hash = await service.submit_stake_batch([
+        {'netuid': 18, 'hotkey': 'a', 'sentiment': 50.0},
+        {'netuid': 18, 'hotkey': 'a', 'sentiment': -50.0},
+        {'netuid': 18, 'hotkey': 'b', 'sentiment': 30.0},
+        {'netuid': 19, 'hotkey': 'c', 'sentiment': -20.0},
+    ])
+
+    assert extrinsic_hash == '0xabc'
+    batch = substrate.compose_call.await_args_list[-1].kwargs
+    assert batch['call_module'] == 'Utility'
+    assert [call['call_function'] for call in batch['call_params']['calls']] == [
+        'add_stake',
+        'remove_stake',
+    ]
+    records = [c.kwargs for c in service._record_stake_action.await_args_list]
+    assert [r['status'] for r in records] == ['netted', 'netted', 'success', 'success']
+    assert {r['extrinsic_hash'] for r in records[2:]} == {'0xabc'}
+    assert await service.account_state.balance() == Balance.from_tao(99.9)
+
+
+@pytest.mark.asyncio
+@patch('app.services.bittensor_substrate_service.AsyncSubstrateInterface')
+async def test_submit_pending_records_hash_without_waiting(_):
+    service = AsyncSubstrateService()
+    service.subtensor = MagicMock()
+    substrate = service.subtensor.substrate
+    substrate.compose_call = AsyncMock()
+    substrate.create_signed_extrinsic = AsyncMock()
+    substrate.get_account_next_index = AsyncMock(return_value=7)
+    substrate.submit_extrinsic = AsyncMock(return_value=MagicMock(extrinsic_hash='0xdef'))
+    service._record_stake_action = AsyncMock()
+
+    outcome = await service._submit_pending(18, 'a', -40.0, -20.0, 'remove_stake', {})
+    assert outcome is service._record_stake_action.return_value
+
+    assert substrate.submit_extrinsic.await_args.kwargs == {
+        'wait_for_inclusion': False,
+        'wait_for_finalization': False,
+    }
+    record = service._record_stake_action.await_args.kwargs
+    assert record['status'] == 'pending'
+    assert record['stake_type'] == 'unstake'
+    assert record['sentiment'] == -40.0
+    assert record['tao_amount'] == pytest.approx(0.2)
+    assert record['extrinsic_hash'] == '0xdef'
+
+
+@pytest.mark.asyncio
+@patch('app.services.bittensor_substrate_service.AsyncSubstrateInterface')
+async def test_trade_is_sized_from_the_signal_but_records_the_sentiment(_):
+    from bittensor import Balance
+
+    service = AsyncSubstrateService()
+    service.wallet = MagicMock()
+    service.account_state = MagicMock()
+    service.account_state.get = AsyncMock(
+        return_value=(Balance.from_tao(0.1), Balance.from_tao(0), True)
+    )
+    service._record_stake_action = AsyncMock()
+
+    with patch.object(service, 'trading_signal', AsyncMock(return_value=20.0)):
+        await service.submit_stake_adjustment(18, 'a', 60.0)
+    record = service._record_stake_action.await_args.kwargs
+    assert record['error_message'] == 'Insufficient balance'
+    assert record['sentiment'] == 60.0
+    assert record['tao_amount'] == pytest.approx(0.2)
+
+    with patch.object(service, 'trading_signal', AsyncMock(return_value=0.0)):
+        outcome = await service.submit_stake_adjustment(18, 'a', 5.0)
+    assert outcome['status'] == 'skipped'
+    assert outcome['sentiment'] == 5.0
+
+
+@pytest.mark.asyncio
+@patch('app.services.bittensor_substrate_service.AsyncSubstrateInterface')
+async def test_stake_path_reports_outcome_to_the_breaker(_):
+    from async_substrate_interface.errors import SubstrateRequestException
+
+    from app.cache.singleton import substrate_breaker
+
+    service = AsyncSubstrateService()
+    service.subtensor = MagicMock()
+    substrate = service.subtensor.substrate
+    substrate.create_signed_extrinsic = AsyncMock()
+    substrate.get_account_next_index = AsyncMock(return_value=7)
+    substrate.submit_extrinsic = AsyncMock(return_value=MagicMock(extrinsic_hash='0xdef'))
+
+    with (
+        patch.object(substrate_breaker, 'before_call', AsyncMock(return_value=True)),
+        patch.object(substrate_breaker, 'record_success', AsyncMock()) as success,
+        patch.object(substrate_breaker, 'record_failure', AsyncMock()) as failure,
+        patch.object(substrate_breaker, 'release_probe', AsyncMock()) as release,
+    ):
+        await service._sign_and_submit('call', wait=False)
+        success.assert_awaited_once()
+
+        substrate.submit_extrinsic.side_effect = SubstrateRequestException('Invalid call')
+        with pytest.raises(SubstrateRequestException):
+            await service._sign_and_submit('call', wait=False)
+        failure.assert_not_awaited()
+        release.assert_awaited_once()
+
+        substrate.submit_extrinsic.side_effect = ConnectionError('socket closed')
+        with pytest.raises(ConnectionError):
+            await service._sign_and_submit('call', wait=False)
+        failure.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+@patch('app.services.bittensor_substrate_service.AsyncSubstrateInterface')
+async def test_rejected_extrinsic_hands_its_nonce_back(_):
+    from async_substrate_interface.errors import SubstrateRequestException
+
+    from app.cache.singleton import nonce_manager
+
+    service = AsyncSubstrateService()
+    service.subtensor = MagicMock()
+    service.wallet = MagicMock()
+    service.wallet.coldkeypub.ss58_address = '5Rejected'
+    substrate = service.subtensor.substrate
+    substrate.create_signed_extrinsic = AsyncMock()
+    substrate.get_account_next_index = AsyncMock(return_value=7)
+    substrate.submit_extrinsic = AsyncMock(
+        side_effect=[SubstrateRequestException('Inability to pay some fees'), MagicMock()]
+    )
+
+    with pytest.raises(SubstrateRequestException):
+        await service._sign_and_submit('call', wait=False)
+    await service._sign_and_submit('call', wait=False)
+
+    nonces = [c.kwargs['nonce'] for c in substrate.create_signed_extrinsic.await_args_list]
+    assert nonces == [7, 7]
+    nonce_manager._local.pop('5Rejected')
@@ -39,9 +39,9 @@ async def test_get_tao_dividends(mock_dividends, _, mock_get):
     'app.services.singleton.substrate_service.get_dividends_for_netuid_hotkey',
     new_callable=AsyncMock,
 )
-@patch('app.api.v1.tao_dividends.analyze_and_stake.delay')
+@patch('app.api.v1.tao_dividends.analyze_and_stake.apply_async')
 async def test_get_tao_dividends_trade_true(
-    mock_delay,
+    mock_apply_async,
     mock_get_dividends_for_netuid_hotkey,
     mock_submit,
     mock_cache_set,
@@ -55,7 +55,7 @@ async def test_get_tao_dividends_trade_true(
 
     mock_task = MagicMock()
     mock_task.get.return_value = 42.0
-    mock_delay.return_value = mock_task
+    mock_apply_async.return_value = mock_task
 
     transport = ASGITransport(app=app)
 
@@ -69,6 +69,45 @@ async def test_get_tao_dividends_trade_true(
     data = response.json()
     assert data['dividend'] == 80.0
     assert data['stake_tx_triggered'] is True
+    assert data['deduplicated'] is False
+    mock_apply_async.assert_called_once()
+    assert mock_apply_async.call_args.kwargs['task_id'] == data['task_id']
+
+
+@pytest.mark.asyncio
+@patch('app.cache.singleton.redis_cache.get', new_callable=AsyncMock)
+@patch('app.cache.singleton.redis_cache.set', new_callable=AsyncMock)
+@patch(
+    'app.services.singleton.substrate_service.get_dividends_for_netuid_hotkey',
+    new_callable=AsyncMock,
+)
+@patch('app.cache.singleton.trade_dedup.claim', new_callable=AsyncMock)
+@patch('app.api.v1.tao_dividends.analyze_and_stake.apply_async')
+async def test_get_tao_dividends_trade_deduplicated(
+    mock_apply_async,
+    mock_claim,
+    mock_get_dividends_for_netuid_hotkey,
+    _,
+    mock_cache_get,
+):
+    mock_cache_get.return_value = None
+    mock_get_dividends_for_netuid_hotkey.return_value = 80.0
+    mock_claim.return_value = ('pending-task-id', True)
+
+    transport = ASGITransport(app=app)
+
+    async with AsyncClient(transport=transport, base_url='http://test') as client:
+        response = await client.get(
+            '/api/v1/tao_dividends?netuid=18&hotkey=5FFApaS75bv5pJHfAp2FVLBj9ZaXuFDjEypsaBNc1wCfe52v&trade=true',
+            headers={'Authorization': settings.auth_token},
+        )
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data['task_id'] == 'pending-task-id'
+    assert data['deduplicated'] is True
+    assert data['stake_tx_triggered'] is True
+    mock_apply_async.assert_not_called()
 
 
 @pytest.mark.asyncio
@@ -150,3 +189,36 @@ async def test_get_tao_dividends_cached(mock_get_dividends, mock_cache_get):
     data = response.json()
     assert data['cached'] is True
     assert data['dividend'] == 77.7
+
+
+@pytest.mark.asyncio
+@patch('app.cache.singleton.redis_cache.get', new_callable=AsyncMock)
+async def test_get_tao_dividends_pair_from_all_cache(mock_cache_get):
+    hotkey = '5FFApaS75bv5pJHfAp2FVLBj9ZaXuFDjEypsaBNc1wCfe52v'
+    all_results = [
+        {'netuid': 1, 'hotkeys': [{'hotkey': hotkey, 'dividends': 1.0}]},
+        {'netuid': 18, 'hotkeys': [{'hotkey': hotkey, 'dividends': 7.5}]},
+    ]
+    mock_cache_get.side_effect = lambda key: (
+        {'results': all_results} if key == 'dividends:all' else None
+    )
+
+    transport = ASGITransport(app=app)
+
+    async with AsyncClient(transport=transport, base_url='http://test') as client:
+        pair = await client.get(
+            f'/api/v1/tao_dividends?netuid=18&hotkey={hotkey}',
+            headers={'Authorization': settings.auth_token},
+        )
+        by_hotkey = await client.get(
+            f'/api/v1/tao_dividends?hotkey={hotkey}',
+            headers={'Authorization': settings.auth_token},
+        )
+
+    assert pair.status_code == 200
+    assert pair.json()['dividend'] == 7.5
+    assert pair.json()['cached'] is True
+    assert by_hotkey.json()['netuids'] == [
+        {'netuid': 1, 'dividend': 1.0},
+        {'netuid': 18, 'dividend': 7.5},
+    ]
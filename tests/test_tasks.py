@@ -1,5 +1,7 @@
 from unittest.mock import AsyncMock, patch
 
+import pytest
+
 
 @patch('app.services.chutes_service.ChutesService.get_sentiment_score', new_callable=AsyncMock)
 @patch('app.services.datura_service.DaturaService.search_tweets', new_callable=AsyncMock)
@@ -10,7 +12,8 @@ def test_analyze_and_stake(mock_search, mock_sentiment):
     from app.tasks import analyze_and_stake
 
     result = analyze_and_stake.run(18, 'FFApaS75bv5pJHfAp2FVLBj9ZaXuFDjEypsaBNc1wCfe52v')
-    assert result == 80.0
+    assert result['sentiment'] == 80.0
+    assert result['stake_type'] == 'stake'
 
 
 @patch('app.services.datura_service.DaturaService.search_tweets', new_callable=AsyncMock)
@@ -22,7 +25,8 @@ def test_analyze_and_stake_no_tweets(mock_sentiment, mock_search):
     from app.tasks import analyze_and_stake
 
     result = analyze_and_stake.run(18, 'FFApaS75bv5pJHfAp2FVLBj9ZaXuFDjEypsaBNc1wCfe52v')
-    assert result == 0.0
+    assert result['sentiment'] == 0.0
+    assert result['status'] == 'skipped'
 
 
 @patch('app.services.datura_service.DaturaService.search_tweets', new_callable=AsyncMock)
@@ -33,5 +37,206 @@ def test_analyze_and_stake_raises_exception(mock_sentiment, mock_search):
 
     from app.tasks import analyze_and_stake
 
-    result = analyze_and_stake.run(18, 'FFApaS75bv5pJHfAp2FVLBj9ZaXuFDjEypsaBNc1wCfe52v')
-    assert result == 0.0
+    with pytest.raises(Exception, match='API error'):
+        analyze_and_stake.run(18, 'FFApaS75bv5pJHfAp2FVLBj9ZaXuFDjEypsaBNc1wCfe52v')
+
+
+def test_trade_pipeline_routes_stages_to_queues():
+    from app.tasks import celery_app, trade_pipeline
+
+    pipeline = trade_pipeline(18, 'hotkey', 'lexicon')
+
+    assert [task.task for task in pipeline.tasks] == [
+        'fetch_tweets',
+        'score_sentiment',
+        'submit_stake',
+    ]
+    assert pipeline.tasks[0].args == (18, 'lexicon')
+    assert pipeline.tasks[1].args == (18, 'lexicon')
+    routes = celery_app.conf.task_routes
+    assert routes['fetch_tweets'] == {'queue': 'fetch'}
+    assert routes['submit_stake'] == {'queue': 'stake'}
+
+
+@patch(
+    'app.services.sentiment_service.SentimentService.get_sentiment_score', new_callable=AsyncMock
+)
+@patch('app.cache.singleton.redis_cache.set', new_callable=AsyncMock)
+@patch('app.cache.singleton.redis_cache.get', new_callable=AsyncMock)
+@patch('app.cache.singleton.redis_cache.ensure_connection', new_callable=AsyncMock)
+def test_score_sentiment_reuses_cached_score(_, mock_get, mock_set, mock_sentiment):
+    from app.core.metrics import cache_requests, key_family
+    from app.tasks import celery_app, celery_task
+
+    family = key_family('sentiment:18:lexicon')
+    before = {
+        result: cache_requests.value(family=family, result=result)
+        for result in ('hit', 'stale', 'miss')
+    }
+    score_sentiment = celery_app.tasks['score_sentiment']
+    mock_get.return_value = {'score': 12.5, 'digest': celery_task._tweets_digest(['Tweet'])}
+
+    assert score_sentiment.run(['Tweet'], 18, 'lexicon') == 12.5
+    mock_sentiment.assert_not_awaited()
+
+    mock_get.return_value = {'score': 12.5, 'digest': 'stale'}
+    mock_sentiment.return_value = 40.0
+
+    assert score_sentiment.run(['Tweet'], 18, 'lexicon') == 40.0
+    assert mock_set.await_args.args[0] == 'sentiment:18:lexicon'
+    # Each lookup is counted once: the stale entry is not also counted as a hit.
+    assert mock_get.await_args.kwargs == {'track': False}
+    assert {
+        result: cache_requests.value(family=family, result=result) - count
+        for result, count in before.items()
+    } == {'hit': 1, 'stale': 1, 'miss': 0}
+
+
+@patch(
+    'app.services.sentiment_service.SentimentService.get_sentiment_score', new_callable=AsyncMock
+)
+@patch('app.services.datura_service.DaturaService.get_recent_tweets', new_callable=AsyncMock)
+@patch('app.cache.singleton.netuid_demand.decay', new_callable=AsyncMock)
+@patch('app.cache.singleton.netuid_demand.rank', new_callable=AsyncMock)
+@patch('app.cache.singleton.redis_cache.set', new_callable=AsyncMock)
+@patch('app.cache.singleton.redis_cache.get', new_callable=AsyncMock)
+@patch('app.cache.singleton.redis_cache.ensure_connection', new_callable=AsyncMock)
+def test_sweep_sentiment_refreshes_snapshot_netuids_by_demand(
+    _, mock_get, mock_set, mock_rank, mock_decay, mock_tweets, mock_sentiment
+):
+    from app.tasks import celery_app
+
+    mock_get.side_effect = lambda key: (
+        {'results': [{'netuid': 1, 'hotkeys': []}, {'netuid': 18, 'hotkeys': []}]}
+        if key == 'dividends:all'
+        else None
+    )
+    mock_rank.side_effect = lambda netuids: list(reversed(netuids))
+    mock_tweets.return_value = ['Tweet']
+    mock_sentiment.return_value = 25.0
+
+    assert celery_app.tasks['sweep_sentiment'].run() == 2
+
+    mock_rank.assert_awaited_once_with([1, 18])
+    assert [c.args[0] for c in mock_tweets.await_args_list] == [18, 1]
+    assert {c.args[0] for c in mock_set.await_args_list} == {
+        'sentiment:1:llm',
+        'sentiment:18:llm',
+    }
+    mock_decay.assert_awaited_once()
+
+
+@patch('app.cache.singleton.redis_cache.ensure_connection', new_callable=AsyncMock)
+def test_submit_stake_returns_the_stake_outcome(_):
+    from app.core.config import settings
+    from app.tasks import celery_app, celery_task
+
+    outcome = {
+        'netuid': 18,
+        'hotkey': 'hotkey',
+        'sentiment': 40.0,
+        'stake_type': 'stake',
+        'tao_amount': 0.4,
+        'status': 'success',
+        'error_message': None,
+        'extrinsic_hash': '0xabc',
+    }
+    with (
+        patch.object(settings, 'stake_batch_window', 0),
+        patch.object(
+            celery_task.substrate_service,
+            'submit_stake_adjustment',
+            AsyncMock(return_value=outcome),
+        ),
+    ):
+        assert celery_app.tasks['submit_stake'].run(40.0, 18, 'hotkey') == outcome
+
+
+@patch('app.cache.singleton.redis_cache.ensure_connection', new_callable=AsyncMock)
+def test_analyze_and_stake_failure_fails_the_task(_):
+    from app.core.config import settings
+    from app.tasks import analyze_and_stake, celery_task
+
+    with (
+        patch.object(settings, 'stake_batch_window', 0),
+        patch.object(celery_task, '_cached_sentiment', AsyncMock(return_value=40.0)),
+        patch.object(
+            celery_task.substrate_service,
+            'submit_stake_adjustment',
+            AsyncMock(side_effect=ConnectionError('Node unreachable')),
+        ),
+        pytest.raises(ConnectionError),
+    ):
+        analyze_and_stake.run(18, 'hotkey')
+
+
+@patch('app.cache.singleton.redis_cache.ensure_connection', new_callable=AsyncMock)
+def test_batched_outcome_is_sized_from_the_ema(_):
+    from app.cache.singleton import sentiment_history, stake_intents
+    from app.core.config import settings
+    from app.tasks import celery_app, celery_task
+
+    submit = AsyncMock()
+    with (
+        patch.object(settings, 'stake_batch_window', 5),
+        patch.object(settings, 'trade_sizing', 'ema'),
+        patch.object(sentiment_history, 'smoothed', AsyncMock(return_value=-20.0)),
+        patch.object(stake_intents, 'push', AsyncMock(return_value=False)) as push,
+        patch.object(celery_task.substrate_service, 'submit_stake_adjustment', submit),
+    ):
+        # A neutral raw score still trades on the EMA, through the batch.
+        outcome = celery_app.tasks['submit_stake'].run(0.0, 18, 'hotkey')
+
+    submit.assert_not_awaited()
+    assert push.await_args.args == (18, 'hotkey', 0.0, -20.0, 5)
+    assert outcome['status'] == 'queued'
+    assert outcome['sentiment'] == 0.0
+    assert outcome['stake_type'] == 'unstake'
+    assert outcome['tao_amount'] == 0.2
+
+
+def test_finished_trade_releases_its_claim():
+    from app.tasks import celery_app, celery_task
+
+    submitted = []
+    with (
+        patch('app.tasks.trade_dedup.release', new_callable=AsyncMock) as release,
+        patch.object(celery_task.loop, 'submit', side_effect=submitted.append),
+        patch.object(celery_task, '_report_in_flight'),
+    ):
+        celery_task._task_finished(
+            task_id='t1', task=celery_app.tasks['analyze_and_stake'], args=(18, 'hotkey')
+        )
+        celery_task._task_finished(
+            task_id='t2',
+            task=celery_app.tasks['submit_stake'],
+            args=(40.0, 18, 'hotkey', 'lexicon'),
+        )
+        celery_task._task_finished(task_id='t3', task=celery_app.tasks['fetch_tweets'], args=(18,))
+
+    assert len(submitted) == 2
+    assert [c.args for c in release.call_args_list] == [
+        (18, 'hotkey', 't1', None),
+        (18, 'hotkey', 't2', 'lexicon'),
+    ]
+    for coro in submitted:
+        coro.close()
+
+
+@patch('app.services.datura_service.DaturaService.get_recent_tweets', new_callable=AsyncMock)
+def test_pipeline_stages_pass_a_cached_score_through(mock_tweets):
+    from app.tasks import celery_app, celery_task
+
+    with patch.object(celery_task, '_cached_sentiment', AsyncMock(return_value=12.5)) as cached:
+        fetched = celery_app.tasks['fetch_tweets'].run(18, 'lexicon')
+    cached.assert_awaited_once_with(18, 'lexicon')
+    mock_tweets.assert_not_awaited()
+    assert fetched == 12.5
+
+    with patch.object(celery_task, '_score_cached', AsyncMock()) as score:
+        assert celery_app.tasks['score_sentiment'].run(fetched, 18, 'lexicon') == 12.5
+    score.assert_not_awaited()
+
+    mock_tweets.return_value = ['Tweet']
+    with patch.object(celery_task, '_cached_sentiment', AsyncMock(return_value=None)):
+        assert celery_app.tasks['fetch_tweets'].run(18, 'lexicon') == ['Tweet']
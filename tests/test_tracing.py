@@ -0,0 +1,187 @@
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import httpx
+import orjson
+import pytest
+import redis
+import respx
+from httpx import ASGITransport, AsyncClient
+
+from app.core.http import TracingTransport
+from app.core.loop import WorkerEventLoop
+from app.core.tracing import (
+    NON_RECORDING,
+    Tracer,
+    current_span,
+    extract,
+    inject,
+    tracer,
+)
+from app.main import app
+
+TRACEPARENT = '00-0af7651916cd43dd8448eb211c80319c-b7ad6b7169203331-01'
+
+
+def read_spans(path) -> list[dict]:
+    return [orjson.loads(line) for line in path.read_bytes().splitlines()]
+
+
+def test_extract_and_inject():
+    parent = extract(TRACEPARENT)
+    assert parent.trace_id == '0af7651916cd43dd8448eb211c80319c'
+    assert parent.span_id == 'b7ad6b7169203331'
+    assert parent.sampled
+    assert extract('00-xyz-b7ad6b7169203331-01') is None
+    assert extract('garbage') is None
+    assert extract(None) is None
+
+    headers = {}
+    inject(headers)
+    assert headers == {}
+
+
+def test_nested_spans_are_exported_to_file(tmp_path):
+    local = Tracer()
+    local.configure('test', 'file', str(tmp_path / 'traces.jsonl'), '', 1.0)
+
+    with patch.object(local, '_ensure_thread'):
+        with local.span('outer', extract(TRACEPARENT), kind='test') as outer:
+            with local.span('inner') as inner:
+                inner.set_attribute('rows', 3)
+            with pytest.raises(ValueError):
+                with local.span('failing'):
+                    raise ValueError('boom')
+    local.flush()
+
+    spans = {span['name']: span for span in read_spans(tmp_path / 'traces.jsonl')}
+    assert spans['outer']['trace_id'] == '0af7651916cd43dd8448eb211c80319c'
+    assert spans['outer']['parent_id'] == 'b7ad6b7169203331'
+    assert spans['inner']['parent_id'] == outer.span_id
+    assert spans['inner']['attributes'] == {'rows': 3}
+    assert spans['failing']['error'] == 'ValueError: boom'
+    assert spans['outer']['service'] == 'test'
+
+
+def test_disabled_tracer_records_nothing_but_passes_context_on():
+    local = Tracer()
+    parent = extract(TRACEPARENT)
+
+    with local.span('request', parent) as span:
+        assert span is NON_RECORDING
+        assert current_span() is parent
+    assert current_span() is None
+
+
+def test_unsampled_trace_is_not_exported(tmp_path):
+    local = Tracer()
+    local.configure('test', 'file', str(tmp_path / 'traces.jsonl'), '', 0.0)
+
+    with local.span('dropped') as span:
+        assert not span.sampled
+        headers = {}
+        inject(headers)
+    local.flush()
+
+    assert headers['traceparent'].endswith('-00')
+    assert not (tmp_path / 'traces.jsonl').exists()
+
+
+def test_worker_loop_keeps_the_callers_span():
+    loop = WorkerEventLoop(max_in_flight=2)
+    parent = extract(TRACEPARENT)
+
+    async def probe():
+        return current_span()
+
+    with tracer.span('task', parent):
+        seen = loop.run(probe(), timeout=5)
+    loop.stop()
+
+    assert seen is parent
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_http_transport_propagates_traceparent():
+    route = respx.get('https://upstream.test/search').mock(return_value=httpx.Response(200))
+
+    with patch.object(tracer, 'exporter', MagicMock()), patch.object(tracer, '_finish'):
+        async with httpx.AsyncClient(
+            transport=TracingTransport(httpx.AsyncHTTPTransport())
+        ) as client:
+            with tracer.span('parent', extract(TRACEPARENT)):
+                await client.get('https://upstream.test/search?q=secret')
+
+    sent = extract(route.calls.last.request.headers['traceparent'])
+    assert sent.trace_id == '0af7651916cd43dd8448eb211c80319c'
+    assert sent.span_id != 'b7ad6b7169203331'
+
+
+@pytest.mark.asyncio
+async def test_api_request_continues_incoming_trace():
+    finished = []
+
+    with (
+        patch.object(tracer, 'exporter', MagicMock()),
+        patch.object(tracer, '_finish', side_effect=finished.append),
+    ):
+        transport = ASGITransport(app=app)
+        async with AsyncClient(transport=transport, base_url='http://test') as client:
+            response = await client.get('/health', headers={'traceparent': TRACEPARENT})
+
+    assert response.status_code == 200
+    (span,) = finished
+    assert span.name == 'GET /health'
+    assert span.trace_id == '0af7651916cd43dd8448eb211c80319c'
+    assert span.parent_id == 'b7ad6b7169203331'
+    assert span.attributes['http.route'] == '/health'
+    assert span.attributes['http.status_code'] == 200
+
+
+def test_celery_headers_carry_the_trace():
+    from app.tasks import celery_task
+
+    headers = {}
+    with tracer.span('publisher', extract(TRACEPARENT)):
+        celery_task._inject_trace(headers=headers)
+    assert headers['traceparent'] == TRACEPARENT
+
+    finished = []
+    task = SimpleNamespace(name='score_sentiment', request=SimpleNamespace(traceparent=TRACEPARENT))
+    with (
+        patch.object(tracer, 'exporter', MagicMock()),
+        patch.object(tracer, '_finish', side_effect=finished.append),
+        patch.object(celery_task, '_report_in_flight'),
+    ):
+        celery_task._task_started(task_id='t1', task=task)
+        assert current_span().trace_id == '0af7651916cd43dd8448eb211c80319c'
+        celery_task._task_finished(task_id='t1', task=task, state='SUCCESS')
+
+    assert current_span() is None
+    (span,) = finished
+    assert span.name == 'task score_sentiment'
+    assert span.parent_id == 'b7ad6b7169203331'
+    assert span.attributes['celery.state'] == 'SUCCESS'
+
+
+def test_redis_client_is_traced():
+    from app.cache.redis import TracedRedis
+
+    async def main():
+        client = TracedRedis.from_url('redis://localhost:1')
+        finished = []
+        with (
+            patch.object(tracer, 'exporter', MagicMock()),
+            patch.object(tracer, '_finish', side_effect=finished.append),
+        ):
+            with pytest.raises(redis.exceptions.ConnectionError):
+                await client.get('dividends:18:netuid')
+        await client.aclose()
+        return finished
+
+    (span,) = asyncio.run(main())
+    assert span.name == 'redis GET'
+    assert span.attributes['db.key_family'] == 'dividends:netuid'
+    assert span.error
@@ -0,0 +1,51 @@
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.cache.trade_dedup import TradeDeduplicator
+from app.core.config import settings
+
+
+def make_dedup(eval_result) -> tuple[TradeDeduplicator, MagicMock]:
+    cache = MagicMock()
+    cache.redis.eval = AsyncMock(return_value=eval_result)
+    return TradeDeduplicator(cache, window=60), cache
+
+
+@pytest.mark.asyncio
+async def test_claim_first_request_owns_the_task():
+    dedup, cache = make_dedup([1, 'new-id'])
+
+    assert await dedup.claim(18, 'hotkey', 'new-id') == ('new-id', False)
+    args = cache.redis.eval.await_args.args
+    assert args[2:] == (f'trade:18:hotkey:{settings.sentiment_engine}', 'new-id', 60)
+
+
+@pytest.mark.asyncio
+async def test_claims_are_per_engine_and_released_by_their_task():
+    dedup, cache = make_dedup([1, 'new-id'])
+
+    await dedup.claim(18, 'hotkey', 'new-id', 'lexicon')
+    assert cache.redis.eval.await_args.args[2] == 'trade:18:hotkey:lexicon'
+
+    await dedup.release(18, 'hotkey', 'new-id', 'lexicon')
+    args = cache.redis.eval.await_args.args
+    assert args[0] == TradeDeduplicator.RELEASE_SCRIPT
+    assert args[2:] == ('trade:18:hotkey:lexicon', 'new-id')
+
+
+@pytest.mark.asyncio
+async def test_claim_attaches_to_pending_task():
+    dedup, _ = make_dedup([0, 'pending-id'])
+
+    assert await dedup.claim(18, 'hotkey', 'new-id') == ('pending-id', True)
+
+
+@pytest.mark.asyncio
+async def test_claim_fails_open():
+    without_redis = TradeDeduplicator(MagicMock(spec=[]), window=60)
+    assert await without_redis.claim(18, 'hotkey', 'new-id') == ('new-id', False)
+
+    broken, cache = make_dedup(None)
+    cache.redis.eval.side_effect = ConnectionError('down')
+    assert await broken.claim(18, 'hotkey', 'new-id') == ('new-id', False)
@@ -0,0 +1,140 @@
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import orjson
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+from app.cache.task_results import TaskResults
+from app.core.config import settings
+from app.main import app
+
+SUCCESS = {'status': 'SUCCESS', 'result': 42.5, 'date_done': '2025-06-01T12:00:00'}
+
+
+class FakePubSub:
+    def __init__(self, messages: list):
+        self.messages = messages
+        self.subscribe = AsyncMock()
+        self.unsubscribe = AsyncMock()
+        self.aclose = AsyncMock()
+
+    async def get_message(self, ignore_subscribe_messages: bool, timeout: float):
+        if self.messages:
+            return {'type': 'message', 'data': orjson.dumps(self.messages.pop(0))}
+        return None
+
+
+def make_results(stored: dict | None, published: list) -> tuple[TaskResults, FakePubSub]:
+    cache = MagicMock()
+    cache.get = AsyncMock(return_value=stored)
+    pubsub = FakePubSub(published)
+    cache.redis.pubsub.return_value = pubsub
+    return TaskResults(cache), pubsub
+
+
+def test_describe_states():
+    assert TaskResults.describe('id', None) == {
+        'task_id': 'id',
+        'status': 'PENDING',
+        'ready': False,
+        'result': None,
+        'error': None,
+        'date_done': None,
+    }
+    assert TaskResults.describe('id', SUCCESS)['result'] == 42.5
+
+    failure = TaskResults.describe(
+        'id',
+        {'status': 'FAILURE', 'result': {'exc_type': 'ValueError', 'exc_message': ['boom']}},
+    )
+    assert failure['ready'] is True
+    assert failure['result'] is None
+    assert failure['error'] == "ValueError: ['boom']"
+
+
+@pytest.mark.asyncio
+async def test_wait_returns_stored_result_without_subscribing():
+    results, pubsub = make_results(SUCCESS, [])
+
+    status = await results.wait('id', 10)
+
+    assert status['status'] == 'SUCCESS'
+    pubsub.subscribe.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_wait_returns_published_result():
+    results, pubsub = make_results(None, [{'status': 'STARTED'}, SUCCESS])
+
+    status = await results.wait('id', 10)
+
+    assert status['status'] == 'SUCCESS'
+    assert status['result'] == 42.5
+    pubsub.subscribe.assert_awaited_once_with('celery-task-meta-id')
+    pubsub.aclose.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_wait_times_out_with_latest_status():
+    results, _ = make_results(None, [])
+
+    status = await results.wait('id', 0.05)
+
+    assert status['status'] == 'PENDING'
+    assert status['ready'] is False
+
+
+@pytest.mark.asyncio
+@patch('app.cache.singleton.task_results.wait', new_callable=AsyncMock)
+async def test_get_trade_long_poll(mock_wait):
+    mock_wait.return_value = TaskResults.describe('task-1', SUCCESS)
+
+    transport = ASGITransport(app=app)
+    with patch('app.cache.singleton.redis_cache.redis', MagicMock(), create=True):
+        async with AsyncClient(transport=transport, base_url='http://test') as client:
+            response = await client.get(
+                '/api/v1/trades/task-1?wait=5',
+                headers={'Authorization': settings.auth_token},
+            )
+
+    assert response.status_code == 200
+    assert response.json()['result'] == 42.5
+    mock_wait.assert_awaited_once_with('task-1', 5)
+
+
+@pytest.mark.asyncio
+async def test_get_trade_wait_is_bounded():
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url='http://test') as client:
+        response = await client.get(
+            f'/api/v1/trades/task-1?wait={settings.trade_status_max_wait + 1}',
+            headers={'Authorization': settings.auth_token},
+        )
+
+    assert response.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_stream_trade_events():
+    async def updates(task_id, timeout, idle=None):
+        yield TaskResults.describe(task_id, None)
+        yield None
+        yield TaskResults.describe(task_id, SUCCESS)
+
+    transport = ASGITransport(app=app)
+    with (
+        patch('app.cache.singleton.redis_cache.redis', MagicMock(), create=True),
+        patch('app.cache.singleton.task_results.updates', updates),
+    ):
+        async with AsyncClient(transport=transport, base_url='http://test') as client:
+            response = await client.get(
+                '/api/v1/trades/task-1/events',
+                headers={'Authorization': settings.auth_token},
+            )
+
+    assert response.status_code == 200
+    assert response.headers['content-type'].startswith('text/event-stream')
+    events = response.text.split('\n\n')
+    assert events[0].startswith('event: status\ndata: ')
+    assert events[1] == ': keep-alive'
+    assert orjson.loads(events[2].split('data: ', 1)[1])['status'] == 'SUCCESS'
@@ -0,0 +1,55 @@
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.cache.tweet_store import TweetStore
+
+
+def make_store() -> tuple[TweetStore, MagicMock]:
+    cache = MagicMock()
+    pipe = MagicMock()
+    pipe.execute = AsyncMock(return_value=[1])
+    cache.redis.pipeline.return_value.__aenter__ = AsyncMock(return_value=pipe)
+    cache.redis.pipeline.return_value.__aexit__ = AsyncMock(return_value=False)
+    cache.redis.get = AsyncMock(return_value=None)
+    cache.redis.set = AsyncMock(return_value=True)
+    cache.redis.zrangebyscore = AsyncMock(return_value=[])
+    cache.redis.eval = AsyncMock(return_value=1)
+    return TweetStore(cache), cache
+
+
+@pytest.mark.asyncio
+async def test_add_skips_tweets_without_a_parsable_date():
+    store, cache = make_store()
+    pipe = await cache.redis.pipeline.return_value.__aenter__()
+
+    added = await store.add(
+        18,
+        [
+            {'id': '1', 'text': 'Dated', 'created_at': '2025-04-20T12:00:00Z'},
+            {'id': '2', 'text': 'Undated', 'created_at': 'yesterday'},
+        ],
+    )
+
+    assert added == 1
+    entries = pipe.zadd.call_args.args[1]
+    assert list(entries) == ['1']
+    cursor = cache.redis.set.await_args.args[1]
+    assert cursor == entries['1']
+
+
+@pytest.mark.asyncio
+async def test_fetch_lock_is_released_only_by_its_holder():
+    store, cache = make_store()
+
+    token = await store.acquire_fetch(18)
+    assert token is not None
+    assert cache.redis.set.await_args.args == ('tweets:18:lock', token)
+
+    cache.redis.set.return_value = None
+    assert await store.acquire_fetch(18) is None
+
+    await store.release_fetch(18, token)
+    args = cache.redis.eval.await_args.args
+    assert args[0] == TweetStore.RELEASE_SCRIPT
+    assert args[1:] == (1, 'tweets:18:lock', token)
@@ -0,0 +1,71 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from app.core.http import close_http_client, get_http_client
+from app.core.loop import WorkerEventLoop
+
+
+def test_run_returns_result_from_background_loop():
+    loop = WorkerEventLoop(max_in_flight=4)
+
+    async def work() -> str:
+        return threading.current_thread().name
+
+    try:
+        assert loop.run(work(), timeout=5) == 'worker-event-loop'
+        first = loop.loop
+        loop.run(work(), timeout=5)
+        assert loop.loop is first
+    finally:
+        loop.stop()
+
+
+def test_in_flight_limit_caps_concurrent_coroutines():
+    loop = WorkerEventLoop(max_in_flight=2)
+    running = 0
+    peak = 0
+
+    async def work() -> None:
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.05)
+        running -= 1
+
+    try:
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            list(pool.map(lambda _: loop.run(work(), timeout=5), range(8)))
+        assert peak == 2
+    finally:
+        loop.stop()
+
+
+def test_stop_runs_shutdown_hooks_on_the_loop():
+    loop = WorkerEventLoop(max_in_flight=1)
+    closed = []
+
+    async def hook() -> None:
+        closed.append(threading.current_thread().name)
+
+    loop.on_shutdown(hook)
+
+    async def noop() -> None:
+        return None
+
+    loop.run(noop(), timeout=5)
+    loop.stop()
+    assert closed == ['worker-event-loop']
+    assert loop.loop is None
+
+
+@pytest.mark.asyncio
+async def test_http_client_is_shared_per_loop():
+    client = get_http_client()
+    assert get_http_client() is client
+    await close_http_client()
+    assert client.is_closed
+    assert get_http_client() is not client
+    await close_http_client()